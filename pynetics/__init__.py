@@ -1,11 +1,17 @@
+import contextlib
+import math
 import operator
 import random
+import time
 from abc import ABCMeta, abstractmethod
 from collections import abc
 
 import collections
 
-from pynetics.utils import take_chances, clone_empty
+from pynetics import checkpoint
+from pynetics.listeners import Listener, Throttled, Background
+from pynetics.profiling import Profiler
+from pynetics.utils import take_chances, clone_empty, RandomGenerator
 from .exceptions import WrongValueForInterval, NotAProbabilityError, \
     PyneticsError, InvalidSize
 
@@ -17,40 +23,240 @@ class GeneticAlgorithm(metaclass=ABCMeta):
 
     More than one algorithm may exist so a base class is created for specify the
     contract required by the other classes to work properly.
+
+    Each algorithm owns a random number generator. The operators (spawning
+    pools, selections, recombinations, mutations...) have an attribute "rng",
+    the random module by default, which the algorithm replaces by its own
+    generator before running.
     """
     ALGORITHM_START = 'ALGORITHM_START'
     ALGORITHM_END = 'ALGORITHM_END'
     STEP_START = 'STEP_START'
     STEP_END = 'STEP_END'
 
-    def __init__(self, stop_condition):
+    def __init__(self, stop_condition, rng=None):
+        """ Initializes the algorithm.
+
+        :param stop_condition: The condition to be met in order to stop the
+            genetic algorithm.
+        :param rng: The random number generator to be used by the algorithm
+            and all its operators (e.g. a RandomGenerator with a fixed seed to
+            make the run reproducible). If None, a new RandomGenerator is
+            created. Defaults to None.
+        """
         self.stop_condition = stop_condition
+        self.rng = rng if rng is not None else RandomGenerator()
         self.listeners = collections.defaultdict(list)
         self.generation = 0
-
-    def run(self):
+        self.evaluations = 0
+        self.evaluations_avoided = 0
+        self.partial_evaluations = 0
+        self.phase_times = {}
+        self.start_time = None
+        self.profiler = None
+
+    def run(self, profile=None):
         """ Runs the simulation.
 
         The process is as follows: initialize populations and, while the stop
         condition is not met, do a new evolve step. This process relies in the
         abstract method "step".
+
+        :param profile: If True, the run is profiled and a report is written
+            in the file "pynetics-profile.txt". It can also be the path of the
+            report or a Profiler instance to configure the profile. Defaults
+            to None (the run is not profiled).
+        """
+        if profile:
+            if profile is True:
+                profile = Profiler()
+            elif not isinstance(profile, Profiler):
+                profile = Profiler(profile)
+            with profile.profile(self):
+                self.run()
+        else:
+            self.share_rng()
+            with self.phase('initialization'):
+                self.initialize()
+            self.__evolve()
+
+    def resume(self, path):
+        """ Restores the state saved in a checkpoint and continues the run.
+
+        The algorithm should be configured exactly as the one which saved the
+        checkpoint (but its stop condition, that can be a different one). As
+        with "checkpoint", it's expected the algorithm to manage a single
+        population. The state not saved in the checkpoint is rebuilt from the
+        restored one (see "restore").
+
+        :param path: The path of the checkpoint file.
         """
-        self.initialize()
-        self.call_listeners(GeneticAlgorithm.ALGORITHM_START)
-        while self.best() is None or not self.stop_condition(self):
-            self.call_listeners(GeneticAlgorithm.STEP_START)
-            self.step()
-            self.generation += 1
-            self.call_listeners(GeneticAlgorithm.STEP_END)
-        self.call_listeners(GeneticAlgorithm.ALGORITHM_END)
+        state = checkpoint.load(path)
+        self.rng.setstate(state.random_state)
+        self.share_rng()
+        population_factory = getattr(self, 'population_factory', Population)
+        self.population = population_factory(
+            size=len(state.population),
+            spawning_pool=self.spawning_pool,
+            individuals=state.population,
+        )
+        for individual, saved in zip(self.population, state.population):
+            individual.fitness_method = self.fitness
+            individual.fitness_cached = saved.fitness_cached
+        for individual in state.best_individuals:
+            individual.fitness_method = self.fitness
+        self.best_individuals[:] = state.best_individuals
+        self.generation = state.generation
+        self.evaluations = state.evaluations
+        self.restore()
+        self.__evolve()
+
+    def checkpoint(self, path):
+        """ Saves the current state of the algorithm in a file.
+
+        The genes of the population and best individuals are stored packed in
+        binary blocks together with their cached fitnesses, the generation, the
+        number of evaluations and the state of the random number generator.
+        The write is atomic, so it's safe to call it every few generations
+        (e.g. from a listener). It's expected the algorithm to manage a single
+        population in the attribute "population" and its best individuals in
+        "best_individuals".
+
+        :param path: The path of the checkpoint file.
+        """
+        checkpoint.save(
+            path,
+            generation=self.generation,
+            population=self.population,
+            best_individuals=self.best_individuals,
+            random_state=self.rng.getstate(),
+            evaluations=self.evaluations,
+        )
+
+    def __evolve(self):
+        """ Evolves the population until the stop condition is met. """
+        self.start_time = time.perf_counter()
+        try:
+            self.call_listeners(GeneticAlgorithm.ALGORITHM_START)
+            while self.best() is None or not self.stop_condition(self):
+                self.call_listeners(GeneticAlgorithm.STEP_START)
+                self.phase_times.clear()
+                self.step()
+                self.generation += 1
+                self.call_listeners(GeneticAlgorithm.STEP_END)
+            self.call_listeners(GeneticAlgorithm.ALGORITHM_END)
+        except BaseException:
+            # The error of the run prevails over those of the listeners
+            try:
+                self.close_listeners()
+            except Exception:
+                pass
+            raise
+        self.close_listeners()
         self.finish()
 
     def call_listeners(self, message):
-        [f(self) for f in self.listeners[message]]
+        for f in self.listeners[message]:
+            f(self)
+
+    def close_listeners(self):
+        """ Closes the listeners wrapped to be throttled or run in background.
+
+        It waits for the background listeners to process all their pending
+        snapshots. All the listeners are closed even if closing any of them
+        fails.
+
+        :raises Exception: The first error raised when closing the listeners.
+        """
+        errors = []
+        for listeners in self.listeners.values():
+            for f in listeners:
+                if isinstance(f, Listener):
+                    try:
+                        f.close()
+                    except Exception as e:
+                        errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def add_listener(
+            self,
+            message,
+            f,
+            every=None,
+            every_seconds=None,
+            background=False,
+    ):
+        """ Registers a functor to be called when an event happens.
+
+        :param message: The event (e.g. GeneticAlgorithm.STEP_END).
+        :param f: The functor to be called. It must accept a GeneticAlgorithm
+            instance as a parameter (or a snapshot if background is True).
+        :param every: If given, the functor is called only in the generations
+            multiple of this value. Defaults to None.
+        :param every_seconds: If given, the functor is called only when at
+            least this number of seconds have passed since the last call.
+            Defaults to None.
+        :param background: If True, the functor is called in a background
+            thread with a snapshot of the algorithm (see listeners.snapshot)
+            instead of the algorithm itself. Defaults to False.
+        :return: This genetic algorithm.
+        """
+        if background:
+            f = Background(f)
+        if every is not None or every_seconds is not None:
+            f = Throttled(f, every=every, every_seconds=every_seconds)
+        self.listeners[message].append(f)
+        return self
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """ Times a phase of the current step (or of the initialization).
+
+        The elapsed time is added to the entry of the phase in the attribute
+        "phase_times", which is cleared before each step.
+
+        If the algorithm is being profiled, the phase is profiled apart from
+        the others.
+
+        :param name: The name of the phase (e.g. "selection").
+        """
+        profiler = self.profiler
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enter(name)
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.exit(name)
+            elapsed = time.perf_counter() - start
+            self.phase_times[name] = self.phase_times.get(name, 0.) + elapsed
+
+    def share_rng(self):
+        """ Makes the operators of the algorithm use its random generator.
+
+        It's called before initializing the algorithm. Subclasses should
+        override it to bind the random generator to their operators. As the
+        operators themselves are bound (see utils.bind_rng), algorithms must
+        not share operators to have independent streams.
+        """
+        pass
 
     def initialize(self):
         """ Called when starting the genetic algorithm to initialize it. """
         self.generation = 0
+        self.evaluations = 0
+        self.evaluations_avoided = 0
+        self.partial_evaluations = 0
+
+    def restore(self):
+        """ Called when resuming the algorithm after restoring a checkpoint.
+
+        Subclasses should override it to rebuild the state built by
+        "initialize" that is not saved in checkpoints (e.g. trained models).
+        """
+        pass
 
     def finish(self):
         """ Called one the algorithm has finished. """
@@ -70,7 +276,7 @@ class GeneticAlgorithm(metaclass=ABCMeta):
         :return: The best individual generated in the specified generation.
         """
 
-    def on_start(self, f):
+    def on_start(self, f, **kwargs):
         """ Specifies a functor to be called when the algorithm starts.
 
         This function will be called AFTER initialization but BEFORE the first
@@ -78,11 +284,12 @@ class GeneticAlgorithm(metaclass=ABCMeta):
 
         :param f: The functor to be called. It must accept a GeneticAlgorithm
             instance as a parameter.
+        :param kwargs: The options to throttle the calls or to make them in
+            background (see "add_listener").
         """
-        self.listeners[GeneticAlgorithm.ALGORITHM_START].append(f)
-        return self
+        return self.add_listener(GeneticAlgorithm.ALGORITHM_START, f, **kwargs)
 
-    def on_end(self, f):
+    def on_end(self, f, **kwargs):
         """ Specifies a functor to be called when the algorithm ends.
 
         Particularly, this method will be called AFTER the stop condition
@@ -90,11 +297,12 @@ class GeneticAlgorithm(metaclass=ABCMeta):
 
         :param f: The functor to be called. It must accept a GeneticAlgorithm
             instance as a parameter.
+        :param kwargs: The options to throttle the calls or to make them in
+            background (see "add_listener").
         """
-        self.listeners[GeneticAlgorithm.ALGORITHM_END].append(f)
-        return self
+        return self.add_listener(GeneticAlgorithm.ALGORITHM_END, f, **kwargs)
 
-    def on_step_start(self, f):
+    def on_step_start(self, f, **kwargs):
         """ Specifies a functor to be called when an iteration step starts.
 
         This method will be called AFTER the stop condition has been checked
@@ -102,11 +310,12 @@ class GeneticAlgorithm(metaclass=ABCMeta):
 
         :param f: The functor to be called. It must accept a GeneticAlgorithm
             instance as a parameter.
+        :param kwargs: The options to throttle the calls or to make them in
+            background (see "add_listener").
         """
-        self.listeners[GeneticAlgorithm.STEP_START].append(f)
-        return self
+        return self.add_listener(GeneticAlgorithm.STEP_START, f, **kwargs)
 
-    def on_step_end(self, f):
+    def on_step_end(self, f, **kwargs):
         """ Specifies a functor to be called when an iteration ends.
 
         This method will be called AFTER an step of the algorithm has been
@@ -115,9 +324,10 @@ class GeneticAlgorithm(metaclass=ABCMeta):
 
         :param f: The functor to be called. It must accept a GeneticAlgorithm
             instance as a parameter.
+        :param kwargs: The options to throttle the calls or to make them in
+            background (see "add_listener").
         """
-        self.listeners[GeneticAlgorithm.STEP_END].append(f)
-        return self
+        return self.add_listener(GeneticAlgorithm.STEP_END, f, **kwargs)
 
 
 class StopCondition(metaclass=ABCMeta):
@@ -144,6 +354,8 @@ class Individual(metaclass=ABCMeta):
     In a genetic algorithm, an individual is a tentative solution of a problem,
     i.e. the environment where populations of individuals evolve.
     """
+    # Whether the individual raced against a threshold (see "beats")
+    raced = False
 
     def __init__(self):
         """ Initializes the individual.
@@ -151,18 +363,102 @@ class Individual(metaclass=ABCMeta):
         An individual contains a cache for the fitness method that prevents to
         compute it over and over again. However, as well as it is possible to
         clear this cache, also it is possible to disable it.
+
+        When the operators that created the individual recorded the genes they
+        changed (see "record_changes"), the individual also keeps the fitness
+        of the individual it derives from and a dict with the changed loci and
+        their previous genes, so its fitness can be computed incrementally.
         """
         self.population = None
         self.fitness_method = None
+        self.fitness_cached = None
+        self.parent_fitness = None
+        self.changed_loci = None
 
     def fitness(self):
         """ Computes the fitness of this individual.
 
-        It will use the fitness method defined on its spawning pool.
+        It will use the fitness method defined on its spawning pool. The value
+        is cached, so the fitness method will be called only the first time.
+
+        If the changes from an evaluated individual were recorded and the
+        fitness method has a "delta" method, the fitness is computed by calling
+        it with the fitness of that individual, this individual and the changed
+        loci. If it returns None, the fitness method is called as usual. Once
+        the fitness is computed, the recorded changes are discarded.
 
         :return: A float value.
         """
-        return self.fitness_method(self)
+        if self.fitness_cached is None:
+            delta = getattr(self.fitness_method, 'delta', None)
+            if delta is not None and self.changed_loci is not None:
+                self.fitness_cached = delta(
+                    self.parent_fitness,
+                    self,
+                    self.changed_loci,
+                )
+            if self.fitness_cached is None:
+                self.fitness_cached = self.fitness_method(self)
+            self.parent_fitness = self.changed_loci = None
+        return self.fitness_cached
+
+    def discard_fitness(self):
+        """ Discards the cached fitness because the genes are being changed.
+
+        If the fitness was cached, the changes being made were not recorded
+        (recording them discards the fitness, see "record_changes"), so the
+        changes recorded before, if any, are discarded too and the fitness will
+        be computed from scratch.
+        """
+        # Unpickled lists are filled before their attributes are restored
+        if getattr(self, 'fitness_cached', None) is not None:
+            self.parent_fitness = self.changed_loci = None
+        self.fitness_cached = None
+
+    def record_changes(self, parent, loci):
+        """ Records that the genes of this individual in loci come from parent.
+
+        It must be called before changing the genes in loci. It discards the
+        cached fitness of this individual, as the changes made while it's cached
+        are not considered recorded (see "discard_fitness"). The changes are
+        recorded only if the fitness of parent is known (or it was derived by
+        recorded changes from an individual whose fitness is known). Otherwise,
+        this individual will be evaluated from scratch.
+
+        :param parent: The individual whose genes are the same as those of this
+            individual but in the loci.
+        :param loci: An iterable with the positions of the genes that change.
+        """
+        if parent.fitness_cached is not None:
+            parent_fitness, changed_loci = parent.fitness_cached, {}
+        elif parent.changed_loci is not None:
+            parent_fitness = parent.parent_fitness
+            changed_loci = dict(parent.changed_loci)
+        else:
+            parent_fitness, changed_loci = None, None
+        if changed_loci is not None:
+            for i in loci:
+                changed_loci.setdefault(i, parent[i])
+        self.fitness_cached = None
+        self.parent_fitness = parent_fitness
+        self.changed_loci = changed_loci
+
+    def beats(self, threshold):
+        """ Checks if the fitness of this individual is greater than threshold.
+
+        If the fitness is not cached and the fitness method is able to discard
+        individuals before evaluating them completely (see CaseBasedFitness),
+        the individual will be evaluated only as much as needed, and it will be
+        marked as raced (see the attribute "raced").
+
+        :param threshold: The value to beat.
+        :return: True if the fitness is greater than threshold, False otherwise.
+        """
+        racing = hasattr(self.fitness_method, 'beats')
+        if self.fitness_cached is None and racing:
+            self.raced = True
+            return self.fitness_method.beats(self, threshold)
+        return self.fitness() > threshold
 
     @abstractmethod
     def phenotype(self):
@@ -177,13 +473,17 @@ class Individual(metaclass=ABCMeta):
 
         If the implementing subclass has internal attributes to be cloned, the
         attributes copy should be implemented in an overriden version of this
-        method.
+        method. The fitness cache is not copied, as clones are expected to be
+        modified right after being created (e.g. by mutations).
 
         :return: A brand new individual like this one.
         """
         individual = clone_empty(self)
         individual.population = self.population
         individual.fitness_method = self.fitness_method
+        individual.fitness_cached = None
+        individual.parent_fitness = None
+        individual.changed_loci = None
         return individual
 
 
@@ -205,6 +505,7 @@ class Diversity:
 
 class SpawningPool(metaclass=ABCMeta):
     """ Defines the methods for creating individuals required by population. """
+    rng = random
 
     def __init__(self):
         """ Initializes this spawning pool. """
@@ -223,6 +524,20 @@ class SpawningPool(metaclass=ABCMeta):
         individual.population = self.population
         return individual
 
+    def spawn_many(self, n):
+        """ Returns n new random individuals.
+
+        Like "spawn", but it uses the method "create_many" so implementations
+        can create all the individuals at once.
+
+        :param n: The number of individuals to create.
+        :return: A list of n Individual instances.
+        """
+        individuals = self.create_many(n)
+        for individual in individuals:
+            individual.population = self.population
+        return individuals
+
     @abstractmethod
     def create(self):
         """ Creates a new individual randomly.
@@ -230,6 +545,17 @@ class SpawningPool(metaclass=ABCMeta):
         :return: A new Individual object.
         """
 
+    def create_many(self, n):
+        """ Creates n new individuals randomly.
+
+        By default it calls "create" n times, but subclasses may override it
+        when creating many individuals at once is cheaper.
+
+        :param n: The number of individuals to create.
+        :return: A list of n new Individual objects.
+        """
+        return [self.create() for _ in range(n)]
+
 
 class Population(abc.MutableSequence):
     """ Manages a population of individuals.
@@ -265,9 +591,13 @@ class Population(abc.MutableSequence):
         else:
             self.individuals = []
         while len(self.individuals) > self.size:
-            self.individuals.remove(random.choice(self.individuals))
-        while len(self.individuals) < self.size:
-            self.individuals.append(self.spawning_pool.spawn())
+            self.individuals.remove(
+                self.spawning_pool.rng.choice(self.individuals)
+            )
+        if len(self.individuals) < self.size:
+            self.individuals.extend(self.spawning_pool.spawn_many(
+                self.size - len(self.individuals)
+            ))
 
         self.__sorted = False
         self.__diversity = None
@@ -357,7 +687,14 @@ class Population(abc.MutableSequence):
 
 
 class Fitness(metaclass=ABCMeta):
-    """ Method to estimate how adapted is the individual to the environment. """
+    """ Method to estimate how adapted is the individual to the environment.
+
+    Subclasses may also implement the optional method "delta(parent_fitness,
+    individual, changed_loci)" to compute the fitness of an individual from
+    the fitness of the individual it derives from and the dict of changed loci
+    (each one mapped to its previous gene). It may return None to fall back on
+    a full evaluation (e.g. when too many genes changed).
+    """
 
     @abstractmethod
     def __call__(self, individual):
@@ -370,9 +707,115 @@ class Fitness(metaclass=ABCMeta):
         :return: A float value pointing the adation to the environment.
         """
 
+    def evaluate_many(self, individuals):
+        """ Estimates how adapted are many individuals at once.
+
+        By default it evaluates the individuals one by one, but subclasses may
+        override it when evaluating a batch is cheaper (e.g. when evaluation is
+        delegated to remote workers).
+
+        :param individuals: A sequence of individuals to evaluate.
+        :return: A list with the fitness of each individual, in order.
+        """
+        return [self(individual) for individual in individuals]
+
+
+class CaseBasedFitness(Fitness):
+    """ Fitness computed as the mean of the scores of a set of cases.
+
+    The individuals are usually evaluated over all the cases, but they can also
+    race against a threshold: the cases are evaluated one by one (in random
+    order) and the evaluation stops as soon as the individual can't beat the
+    threshold. An individual can't beat it when, even scoring the upper bound in
+    all the remaining cases, its mean would not be greater than the threshold
+    or, if a confidence is given, when the Hoeffding bound of its mean with that
+    confidence is not greater than the threshold.
+
+    The number of cases evaluated so far is kept in the attribute
+    "case_evaluations".
+    """
+    rng = random
+
+    def __init__(self, cases, lower=0., upper=1., confidence=.95):
+        """ Initializes this fitness.
+
+        :param cases: The sequence of cases in which to evaluate individuals.
+        :param lower: The lowest score an individual may get in a case.
+            Defaults to 0.
+        :param upper: The highest score an individual may get in a case.
+            Defaults to 1.
+        :param confidence: The confidence required to discard an individual
+            before knowing for sure that it can't beat the threshold. If None,
+            individuals are discarded only when it's certain. Defaults to 0.95.
+        """
+        self.cases = cases
+        self.lower = lower
+        self.upper = upper
+        self.confidence = confidence
+        self.case_evaluations = 0
+
+    @abstractmethod
+    def score(self, individual, case):
+        """ Computes the score of an individual in a case.
+
+        :param individual: The individual to evaluate.
+        :param case: The case in which to evaluate the individual.
+        :return: A float value between the lower and upper bounds of this
+            fitness.
+        """
+
+    def __call__(self, individual):
+        """ Computes the mean score of the individual over all the cases.
+
+        :param individual: The individual to evaluate.
+        :return: The mean score.
+        """
+        self.case_evaluations += len(self.cases)
+        return math.fsum(
+            self.score(individual, case) for case in self.cases
+        ) / len(self.cases)
+
+    def beats(self, individual, threshold):
+        """ Checks if the individual's mean score is greater than threshold.
+
+        When all the cases are evaluated, the fitness is stored in the cache of
+        the individual.
+
+        :param individual: The individual to evaluate.
+        :param threshold: The value to beat.
+        :return: True if the fitness is greater than threshold, False otherwise.
+        """
+        n = len(self.cases)
+        deviation = None
+        if self.confidence is not None:
+            deviation = (self.upper - self.lower) * math.sqrt(
+                math.log(1 / (1 - self.confidence)) / 2
+            )
+        scores = []
+        total = 0.
+        for i in self.rng.sample(range(n), n):
+            score = self.score(individual, self.cases[i])
+            self.case_evaluations += 1
+            scores.append(score)
+            total += score
+            evaluated = len(scores)
+            if evaluated < n:
+                bound = (total + (n - evaluated) * self.upper) / n
+                if deviation is not None:
+                    bound = min(
+                        bound,
+                        total / evaluated + deviation / math.sqrt(evaluated)
+                    )
+                if bound <= threshold:
+                    return False
+
+        individual.fitness_cached = math.fsum(scores) / n
+        return individual.fitness_cached > threshold
+
 
 class Mutation(metaclass=ABCMeta):
     """ Defines the behaviour of a genetic algorithm mutation operator. """
+    rng = random
 
     @abstractmethod
     def __call__(self, individual, p):
@@ -397,6 +840,7 @@ class Recombination(metaclass=ABCMeta):
     generates a different set of individuals (i.e. offspring) normally with
     aspects derived from their parents.
     """
+    rng = random
 
     @abstractmethod
     def __call__(self, *args):
@@ -407,9 +851,22 @@ class Recombination(metaclass=ABCMeta):
         :return: A sequence of individuals with characteristics of the parents.
         """
 
+    def recombine_many(self, parents_groups):
+        """ Recombines many groups of parents at once.
+
+        By default each group is recombined with a call to this operator, but
+        subclasses may override it when recombining a whole generation at once
+        is cheaper.
+
+        :param parents_groups: A sequence of groups of parents.
+        :return: A list with the progeny of each group, in order.
+        """
+        return [self(*parents) for parents in parents_groups]
+
 
 class Replacement(metaclass=ABCMeta):
     """ Replacement of individuals of the population. """
+    rng = random
 
     @abstractmethod
     def __call__(self, population, individuals):
@@ -428,6 +885,7 @@ class Selection(metaclass=ABCMeta):
     of individuals, and returns a sample of individuals of that size from the
     given population.
     """
+    rng = random
 
     def __call__(self, population, n):
         """ Makes some checks to the configuration before delegating selection.
@@ -465,6 +923,7 @@ class Catastrophe(metaclass=ABCMeta):
     since it will be called every step of the algorithm after replacement
     operation.
     """
+    rng = random
 
     @abstractmethod
     def __call__(self, population):
@@ -1,9 +1,10 @@
 import inspect
 import math
-import random
 
 from pynetics import Population, GeneticAlgorithm, take_chances, PyneticsError, \
-    NoMutation
+    NoMutation, Fitness, WrongValueForInterval
+from pynetics.surrogates import rank_correlation
+from pynetics.utils import bind_rng
 
 
 class SimpleGA(GeneticAlgorithm):
@@ -27,6 +28,12 @@ class SimpleGA(GeneticAlgorithm):
             p_recombination=0.9,
             p_mutation=0.1,
             replacement_rate=1.0,
+            lazy_evaluation=False,
+            surrogate=None,
+            screening_ratio=0.5,
+            retrain_every=1,
+            rng=None,
+            population_factory=Population,
     ):
         """ Initializes this instance.
 
@@ -66,6 +73,37 @@ class SimpleGA(GeneticAlgorithm):
             performed).
         :param replacement_rate: The rate of individuals to be replaced in each
             step of the algorithm. Must be a float value in the (0, 1] interval.
+        :param lazy_evaluation: If False, all the offspring is evaluated right
+            after being generated. If True, the fitness of an individual is
+            computed only when the replacement (or the selection) needs it, so
+            the offspring discarded without being fully evaluated (e.g. when it
+            loses the race of a racing replacement, see LowElitism and
+            HighElitism) never is. Replacements which sort the offspring (e.g.
+            LowElitism and HighElitism without racing) need the fitness of all
+            of it, so they avoid nothing. In the last step, the number of
+            offspring never evaluated is stored in the attribute
+            "evaluations_avoided", and the number of offspring discarded after
+            being evaluated in part (racing) in "partial_evaluations". Defaults
+            to False.
+        :param surrogate: A model to predict the fitness of the offspring (see
+            module surrogates). If given, each step breeds more offspring than
+            needed and only the most promising ones according to the surrogate
+            are kept and evaluated. The rank correlation between the predicted
+            and the real fitness of the kept offspring is stored in the
+            attribute "surrogate_correlation". Defaults to None (no screening).
+        :param screening_ratio: The fraction of the bred offspring that is
+            kept when screening. Must be a value in the (0, 1] interval.
+            Defaults to 0.5, i.e. twice the offspring needed is bred.
+        :param retrain_every: The number of generations between each update of
+            the surrogate with the evaluated offspring. Defaults to 1.
+        :param rng: The random number generator for the algorithm and all its
+            operators. If None, a new one is created. Defaults to None.
+        :param population_factory: The callable that creates the population,
+            called with the same arguments as the class Population (size,
+            spawning_pool and individuals). It can be used to store the
+            population elsewhere, e.g. with storage.MappedPopulation (or a
+            functools.partial of it to choose its file). Defaults to
+            Population.
         :raises WrongValueForIntervalError: If any of the bounded values fall
             out of their respective intervals.
         :raises NotAProbabilityError: If a value was expected to be a
@@ -74,7 +112,7 @@ class SimpleGA(GeneticAlgorithm):
             follow the contract required (i.e. doesn't inherit from a predefined
             class).
         """
-        super().__init__(stop_condition=stop_condition)
+        super().__init__(stop_condition=stop_condition, rng=rng)
 
         self.population_size = population_size
         self.spawning_pool = spawning_pool
@@ -88,55 +126,229 @@ class SimpleGA(GeneticAlgorithm):
         self.replacement_rate = replacement_rate
         self.p_recombination = p_recombination
         self.p_mutation = p_mutation
+        self.lazy_evaluation = lazy_evaluation
+        if not 0 < screening_ratio <= 1:
+            raise WrongValueForInterval(
+                'screening_ratio', 0, 1, screening_ratio, inc_lower=False
+            )
+        self.surrogate = surrogate
+        self.screening_ratio = screening_ratio
+        self.retrain_every = retrain_every
+        self.surrogate_correlation = math.nan
+        self.__training = []
 
         self.selection_size = len(
             inspect.signature(recombination.__call__).parameters
         )
+        self.population_factory = population_factory
         self.population = None
         self.best_individuals = []
 
+    def share_rng(self):
+        for operator in (
+                self.spawning_pool,
+                self.selection,
+                self.recombination,
+                self.mutation,
+                self.replacement,
+                self.fitness,
+        ):
+            bind_rng(operator, self.rng)
+
     def initialize(self):
         super().initialize()
         # Generate a new population
-        self.population = Population(
+        self.population = self.population_factory(
             size=self.population_size,
             spawning_pool=self.spawning_pool,
         )
-        for individual in self.population:
-            individual.fitness_method = self.fitness
+        if hasattr(self.population, 'evaluate'):
+            # Populations which evaluate themselves (e.g. MappedPopulation)
+            # do it in chunks, without holding all their individuals at once
+            self.population.fitness_method = self.fitness
+            self.evaluations += self.population.evaluate(self.fitness)
+        else:
+            for individual in self.population:
+                individual.fitness_method = self.fitness
+            self.evaluate(self.population)
+        self.restore()
         # Clear the best individuals historical cache
         self.best_individuals.clear()
 
+    def restore(self):
+        """ Trains the surrogate, if any, with the current population.
+
+        It's called after initializing the population too. When resuming a
+        run, the surrogate only learns from the restored population, so its
+        predictions (and thus the screened offspring) may differ from those of
+        the original run.
+        """
+        if self.surrogate is not None:
+            self.surrogate.update(self.population)
+        self.surrogate_correlation = math.nan
+        self.__training = []
+
     def step(self):
+        offspring_size = self.offspring_size
+        if self.surrogate is not None:
+            offspring_size = int(
+                math.ceil(self.offspring_size / self.screening_ratio)
+            )
         offspring = []
-        while len(offspring) < self.offspring_size:
+        while len(offspring) < offspring_size:
+            groups = int(math.ceil(
+                (offspring_size - len(offspring)) / self.selection_size
+            ))
             # Selection
-            parents = self.selection(self.population, self.selection_size)
+            with self.phase('selection'):
+                parents_groups = [
+                    self.selection(self.population, self.selection_size)
+                    for _ in range(groups)
+                ]
             # Recombination
-            if take_chances(self.p_recombination):
-                progeny = self.recombination(*parents)
-            else:
-                progeny = [i.clone() for i in parents]
+            with self.phase('recombination'):
+                progenies = self.recombine(parents_groups)
             # Mutation
-            individuals_who_fit = min(
-                len(progeny),
-                self.offspring_size - len(offspring)
-            )
-            progeny = [
-                self.mutation(individual, self.p_mutation)
-                for individual in random.sample(progeny, individuals_who_fit)
-                ]
-            # Add progeny to the offspring
-            offspring.extend(progeny)
+            with self.phase('mutation'):
+                for progeny in progenies:
+                    individuals_who_fit = min(
+                        len(progeny),
+                        offspring_size - len(offspring)
+                    )
+                    offspring.extend(
+                        self.mutation(individual, self.p_mutation)
+                        for individual in self.rng.sample(
+                            progeny,
+                            individuals_who_fit,
+                        )
+                    )
+
+        # Only the most promising offspring is kept (if screening)
+        if self.surrogate is not None:
+            with self.phase('screening'):
+                offspring = self.screen(offspring)
+
+        # The offspring is evaluated at once before being used (if not lazy)
+        if not self.lazy_evaluation:
+            with self.phase('evaluation'):
+                self.evaluate(offspring)
+
+        # Offspring not evaluated yet may be evaluated lazily from now on
+        pending = [i for i in offspring if i.fitness_cached is None]
 
         # Once offspring is generated, a replace step is performed
-        self.replacement(self.population, offspring)
+        with self.phase('replacement'):
+            self.replacement(self.population, offspring)
 
         # We store the best individual for further information
+        with self.phase('best'):
+            self.store_best(self.population.best())
+
+        if self.lazy_evaluation:
+            unevaluated = [i for i in pending if i.fitness_cached is None]
+            self.evaluations += len(pending) - len(unevaluated)
+            self.partial_evaluations = sum(1 for i in unevaluated if i.raced)
+            self.evaluations_avoided = \
+                len(unevaluated) - self.partial_evaluations
+
+    def recombine(self, parents_groups):
+        """ Recombines the groups of parents with probability p_recombination.
+
+        The groups to recombine are passed at once to the "recombine_many"
+        method of the recombination, and the rest are just cloned (recording
+        that no gene changed, so their fitness can be computed incrementally).
+
+        :param parents_groups: A sequence of groups of parents.
+        :return: A list with the progeny of each group, in order.
+        """
+        recombined = [
+            take_chances(self.p_recombination, self.rng)
+            for _ in parents_groups
+        ]
+        progenies = iter(self.recombination.recombine_many([
+            parents
+            for parents, recombine in zip(parents_groups, recombined)
+            if recombine
+        ]))
+        return [
+            next(progenies) if recombine else [
+                self.__clone(individual) for individual in parents
+            ]
+            for parents, recombine in zip(parents_groups, recombined)
+        ]
+
+    @staticmethod
+    def __clone(individual):
+        clone = individual.clone()
+        clone.record_changes(individual, ())
+        return clone
+
+    def screen(self, offspring):
+        """ Keeps the offspring with the best predicted fitness.
+
+        The kept offspring is evaluated (even with lazy evaluation) to measure
+        the rank correlation of the surrogate and to retrain it when due.
+
+        :param offspring: The bred offspring.
+        :return: The offspring to use in the replacement.
+        """
+        predictions = [self.surrogate.predict(i) for i in offspring]
+        kept = sorted(
+            range(len(offspring)),
+            key=predictions.__getitem__,
+            reverse=True,
+        )[:self.offspring_size]
+        offspring = [offspring[i] for i in kept]
+
+        self.evaluate(offspring)
+        self.surrogate_correlation = rank_correlation(
+            [predictions[i] for i in kept],
+            [individual.fitness() for individual in offspring],
+        )
+        self.__training.extend(offspring)
+        if (self.generation + 1) % self.retrain_every == 0:
+            self.surrogate.update(self.__training)
+            self.__training = []
+        return offspring
+
+    def store_best(self, individual):
+        """ Stores the individual as the best one of the current generation.
+
+        :param individual: The best individual of the current generation.
+        """
         if self.generation < len(self.best_individuals):
-            self.best_individuals[self.generation] = self.population.best()
+            self.best_individuals[self.generation] = individual
         else:
-            self.best_individuals.append(self.population.best())
+            self.best_individuals.append(individual)
+
+    def evaluate(self, individuals):
+        """ Computes the fitness of the individuals not evaluated yet.
+
+        If the fitness of the algorithm is a Fitness instance, all the pending
+        individuals are evaluated with a single call to its "evaluate_many"
+        method, so implementations can evaluate them in batches (e.g. in remote
+        workers). The computed values are stored in the individuals' cache and
+        counted in the attribute "evaluations".
+
+        If the fitness has a "delta" method (see Fitness), the individuals with
+        recorded changes are evaluated incrementally one by one instead.
+
+        :param individuals: The individuals to evaluate.
+        """
+        pending = [i for i in individuals if i.fitness_cached is None]
+        self.evaluations += len(pending)
+        if hasattr(self.fitness, 'delta'):
+            for individual in pending:
+                if individual.changed_loci is not None:
+                    individual.fitness()
+            pending = [i for i in pending if i.fitness_cached is None]
+        if pending:
+            if isinstance(self.fitness, Fitness):
+                values = self.fitness.evaluate_many(pending)
+            else:
+                values = [self.fitness(individual) for individual in pending]
+            for individual, value in zip(pending, values):
+                individual.fitness_cached = value
 
     def best(self, generation=None):
         if self.best_individuals:
@@ -147,3 +359,167 @@ class SimpleGA(GeneticAlgorithm):
                 return self.best_individuals[generation]
         else:
             return None
+
+
+class CellularGA(SimpleGA):
+    """ Genetic algorithm whose population lives on a toroidal grid.
+
+    Each cell of the grid holds an individual which mates only with the
+    individuals in its neighbourhood. The selection of the mates and the
+    replacement of the cells are computed for the whole grid at once from the
+    array of fitness values, so the population never needs to be sorted.
+    """
+    VON_NEUMANN = 'von_neumann'
+    MOORE = 'moore'
+
+    def __init__(
+            self,
+            stop_condition,
+            rows,
+            columns,
+            spawning_pool,
+            fitness,
+            recombination,
+            mutation=None,
+            diversity=None,
+            neighbourhood=VON_NEUMANN,
+            tournament_size=2,
+            p_recombination=0.9,
+            p_mutation=0.1,
+            elitism=True,
+            rng=None,
+            population_factory=Population,
+    ):
+        """ Initializes this instance.
+
+        :param stop_condition: The condition to be met in order to stop the
+            genetic algorithm.
+        :param rows: The number of rows of the grid.
+        :param columns: The number of columns of the grid.
+        :param spawning_pool: The object that generates individuals.
+        :param fitness: The method to evaluate individuals.
+        :param recombination: The method to recombine the individual of a cell
+            with its mates.
+        :param mutation: The method to mutate an individual. If not provided,
+            no mutation is performed.
+        :param diversity: The method to compute the diversity of a sequence of
+            individuals.
+        :param neighbourhood: The cells each cell can mate with. It can be
+            CellularGA.VON_NEUMANN (the 4 adjacent cells) or CellularGA.MOORE
+            (the 8 surrounding cells). Defaults to VON_NEUMANN.
+        :param tournament_size: Each mate is the best of a random sample of
+            this size taken from the neighbourhood. Defaults to 2.
+        :param p_recombination: The odds for recombination method to be
+            performed. If not performed, progeny will be the parents.
+        :param p_mutation: The odds for mutation method to be performed over a
+            progeny.
+        :param elitism: If True, a cell is replaced by its offspring only if
+            the offspring is at least as fit. If False, it's always replaced.
+            Defaults to True.
+        :param rng: The random number generator for the algorithm and all its
+            operators. If None, a new one is created. Defaults to None.
+        :param population_factory: The callable that creates the population
+            (see SimpleGA). The cells are accessed by their position, so the
+            population must keep its order. Defaults to Population.
+        :raises ValueError: If the neighbourhood is not a valid one.
+        """
+        super().__init__(
+            stop_condition=stop_condition,
+            population_size=rows * columns,
+            spawning_pool=spawning_pool,
+            fitness=fitness,
+            selection=None,
+            recombination=recombination,
+            replacement=None,
+            mutation=mutation,
+            diversity=diversity,
+            p_recombination=p_recombination,
+            p_mutation=p_mutation,
+            rng=rng,
+            population_factory=population_factory,
+        )
+        self.rows = rows
+        self.columns = columns
+        self.neighbourhood = neighbourhood
+        self.tournament_size = tournament_size
+        self.elitism = elitism
+        self.neighbours = self.__neighbours_table(rows, columns, neighbourhood)
+
+    @staticmethod
+    def __neighbours_table(rows, columns, neighbourhood):
+        """ Computes the neighbours of each cell of the grid.
+
+        :return: A list where the ith element is a tuple with the indices of the
+            neighbours of the ith cell (cells are stored row by row).
+        """
+        if neighbourhood == CellularGA.VON_NEUMANN:
+            offsets = ((-1, 0), (1, 0), (0, -1), (0, 1))
+        elif neighbourhood == CellularGA.MOORE:
+            offsets = tuple(
+                (i, j) for i in (-1, 0, 1) for j in (-1, 0, 1) if i or j
+            )
+        else:
+            raise ValueError('Unknown neighbourhood: ' + str(neighbourhood))
+
+        table = []
+        for row in range(rows):
+            for column in range(columns):
+                cell = row * columns + column
+                neighbours = {
+                    (row + i) % rows * columns + (column + j) % columns
+                    for i, j in offsets
+                }
+                neighbours.discard(cell)
+                table.append(tuple(sorted(neighbours)) or (cell,))
+        return table
+
+    def step(self):
+        population = self.population
+        fitnesses = [individual.fitness() for individual in population]
+
+        # Selection of the mates of all the cells
+        with self.phase('selection'):
+            mates = [
+                [
+                    max(
+                        self.rng.sample(
+                            neighbours,
+                            min(self.tournament_size, len(neighbours)),
+                        ),
+                        key=fitnesses.__getitem__,
+                    )
+                    for _ in range(self.selection_size - 1)
+                ]
+                for neighbours in self.neighbours
+            ]
+
+        # Recombination of each cell with its mates
+        with self.phase('recombination'):
+            progenies = self.recombine([
+                [population[cell]] + [population[m] for m in cell_mates]
+                for cell, cell_mates in enumerate(mates)
+            ])
+            children = [self.rng.choice(progeny) for progeny in progenies]
+
+        with self.phase('mutation'):
+            offspring = [
+                self.mutation(child, self.p_mutation) for child in children
+            ]
+
+        with self.phase('evaluation'):
+            self.evaluate(offspring)
+
+        # Replacement of all the cells
+        with self.phase('replacement'):
+            for cell, child in enumerate(offspring):
+                if not self.elitism or child.fitness() >= fitnesses[cell]:
+                    self.population[cell] = child
+                    fitnesses[cell] = child.fitness()
+
+        with self.phase('best'):
+            best = max(range(len(population)), key=fitnesses.__getitem__)
+            # The population may return views of its cells (e.g. those of a
+            # MappedPopulation), which change with them, so a copy is stored
+            individual = population[best].clone()
+            individual.fitness_cached = fitnesses[best]
+            self.store_best(individual)
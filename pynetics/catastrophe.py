@@ -20,7 +20,7 @@ class ProbabilityBasedCatastrophe(Catastrophe, metaclass=abc.ABCMeta):
         self.__probability = probability
 
     def __call__(self, population):
-        if take_chances(self.__probability):
+        if take_chances(self.__probability, self.rng):
             self.perform(population)
 
     @abc.abstractmethod
@@ -41,10 +41,15 @@ class PackingByProbability(ProbabilityBasedCatastrophe):
         :param population: The population where apply the catastrophe.
         """
         visited_individuals = []
+        repeated = []
         for i in range(len(population)):
             if population[i] in visited_individuals:
-                population[i] = population.spawning_pool.spawn()
-            visited_individuals.append(population[i])
+                repeated.append(i)
+            else:
+                visited_individuals.append(population[i])
+        spawned = population.spawning_pool.spawn_many(len(repeated))
+        for i, individual in zip(repeated, spawned):
+            population[i] = individual
 
 
 class DoomsdayByProbability(ProbabilityBasedCatastrophe):
@@ -55,5 +60,6 @@ class DoomsdayByProbability(ProbabilityBasedCatastrophe):
 
         :param population: The population where apply the catastrophe.
         """
-        for i in range(1, len(population)):
-            population[i] = population.spawning_pool.spawn()
+        spawned = population.spawning_pool.spawn_many(len(population) - 1)
+        for i, individual in enumerate(spawned, start=1):
+            population[i] = individual
@@ -0,0 +1,277 @@
+""" Compact binary checkpoints of the state of a genetic algorithm.
+
+A checkpoint file has a small pickled header followed by blocks of packed
+binary data. Each sequence of individuals (the population and the historical
+of best individuals) is stored as three arrays: the offsets of each genome in
+the genes block, the cached fitness of each individual (NaN if not computed)
+and the genes of all the individuals one after the other.
+
+When the genes are not numeric they can't be packed, so they are pickled in the
+header instead.
+"""
+import collections
+import math
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from array import array
+
+from pynetics.utils import detach
+
+MAGIC = b'PYNCKPT1'
+
+Checkpoint = collections.namedtuple(
+    'Checkpoint',
+    (
+        'generation',
+        'population',
+        'best_individuals',
+        'random_state',
+        'evaluations',
+    ),
+    defaults=(0,),
+)
+
+_SIZE = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+
+def save(
+        path,
+        generation,
+        population,
+        best_individuals,
+        random_state,
+        evaluations=0,
+):
+    """ Writes atomically a checkpoint.
+
+    The data is written in a temporary file in the same directory, which then
+    replaces the file in path. This way, a crash while writing never leaves a
+    corrupt checkpoint.
+
+    :param path: The path of the checkpoint file.
+    :param generation: The generation of the genetic algorithm.
+    :param population: The sequence of individuals of the population.
+    :param best_individuals: The sequence of best individuals found.
+    :param random_state: The state of the random number generator.
+    :param evaluations: The number of evaluations done so far. Defaults to 0.
+    """
+    typecode = _typecode(population[0]) if population else None
+    try:
+        blocks = [
+            _pack(population, typecode),
+            _pack(best_individuals, typecode),
+        ]
+    except (TypeError, OverflowError):
+        typecode = None
+        blocks = [_pack(population, None), _pack(best_individuals, None)]
+
+    prototype = None
+    if population:
+        prototype = detach(population[0])
+        prototype.fitness_cached = None
+        if hasattr(prototype, 'genes'):
+            prototype.genes = prototype.genes[:0]
+        else:
+            del prototype[:]
+
+    header = pickle.dumps({
+        'generation': generation,
+        'random_state': random_state,
+        'evaluations': evaluations,
+        'prototype': prototype,
+        'typecode': typecode,
+        'blocks': [
+            (len(offsets) - 1, None if typecode else genes)
+            for offsets, _, genes in blocks
+        ],
+    }, protocol=pickle.HIGHEST_PROTOCOL)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.checkpoint-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(_SIZE.pack(len(header)))
+            f.write(header)
+            _pad(f)
+            for offsets, fitnesses, genes in blocks:
+                f.write(offsets)
+                f.write(fitnesses)
+                if typecode is not None:
+                    f.write(genes)
+                    _pad(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load(path):
+    """ Reads a checkpoint written with "save".
+
+    The file is memory-mapped, so the genes are copied directly from the file
+    to the individuals without any intermediate buffers.
+
+    :param path: The path of the checkpoint file.
+    :return: A Checkpoint instance. The individuals in it have no population
+        nor fitness method, but they have their fitness cached (if it was when
+        the checkpoint was saved).
+    :raises ValueError: If the file is not a checkpoint or it's truncated or
+        corrupt.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < len(MAGIC):
+            raise ValueError('Not a pynetics checkpoint: ' + str(path))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            # The views of the file must be released before closing the map
+            views = [memoryview(m)]
+            try:
+                header, sequences = _parse(views, path)
+            except (
+                    EOFError,
+                    IndexError,
+                    KeyError,
+                    TypeError,
+                    pickle.UnpicklingError,
+                    struct.error,
+            ) as e:
+                raise ValueError('Corrupt checkpoint: ' + str(path)) from e
+            finally:
+                for view in reversed(views):
+                    view.release()
+
+    population, best_individuals = sequences
+    return Checkpoint(
+        generation=header['generation'],
+        population=population,
+        best_individuals=best_individuals,
+        random_state=header['random_state'],
+        evaluations=header.get('evaluations', 0),
+    )
+
+
+def _parse(views, path):
+    """ Reads the header and the individuals of a mapped checkpoint.
+
+    :param views: A list with a memoryview of the whole file. The views taken
+        from it are appended to the list.
+    :param path: The path of the file (for the error messages).
+    :return: A tuple with the header and the list of the two sequences of
+        individuals (population and best individuals).
+    """
+    view = views[0]
+    if view[:len(MAGIC)] != MAGIC:
+        raise ValueError('Not a pynetics checkpoint: ' + str(path))
+    position = len(MAGIC)
+    header_size, = _SIZE.unpack_from(view, position)
+    position += _SIZE.size
+    if position + header_size > len(view):
+        raise ValueError('Truncated checkpoint: ' + str(path))
+    header = pickle.loads(view[position:position + header_size])
+    position = _aligned(position + header_size)
+
+    typecode = header['typecode']
+    prototype = header['prototype']
+    sequences = []
+    for n, genes in header['blocks']:
+        offsets, position = _read(views, position, 'Q', n + 1)
+        fitnesses, position = _read(views, position, 'd', n)
+        if offsets[0] != 0 or any(
+                offsets[i] > offsets[i + 1] for i in range(n)
+        ):
+            raise ValueError('Corrupt checkpoint: ' + str(path))
+        if typecode is not None:
+            genes, position = _read(views, position, typecode, offsets[n])
+            position = _aligned(position)
+        elif len(genes) != n or offsets[n] != sum(map(len, genes)):
+            raise ValueError('Corrupt checkpoint: ' + str(path))
+        sequences.append(_unpack(prototype, offsets, fitnesses, genes))
+    return header, sequences
+
+
+def _typecode(individual):
+    """ The array typecode to pack the genes of individuals like this one. """
+    genes = getattr(individual, 'genes', None)
+    if isinstance(genes, array):
+        return genes.typecode
+    elif all(type(gene) is int for gene in individual):
+        return 'q'
+    elif all(type(gene) is float for gene in individual):
+        return 'd'
+    else:
+        return None
+
+
+def _pack(individuals, typecode):
+    """ Packs the individuals into offsets, fitnesses and genes.
+
+    If typecode is None, the genes are returned as a list of lists instead of
+    packed in an array.
+    """
+    offsets = array('Q', [0])
+    fitnesses = array('d')
+    genes = array(typecode) if typecode else []
+    for individual in individuals:
+        individual_genes = getattr(individual, 'genes', individual)
+        if typecode:
+            genes.extend(individual_genes)
+        else:
+            genes.append(list(individual_genes))
+        offsets.append(offsets[-1] + len(individual_genes))
+        fitness = individual.fitness_cached
+        fitnesses.append(math.nan if fitness is None else fitness)
+    return offsets, fitnesses, genes
+
+
+def _unpack(prototype, offsets, fitnesses, genes):
+    """ Builds the individuals from the data packed by "_pack". """
+    individuals = []
+    for i in range(len(fitnesses)):
+        individual = prototype.clone()
+        if isinstance(genes, list):
+            individual_genes = genes[i]
+        else:
+            individual_genes = genes[offsets[i]:offsets[i + 1]]
+        if isinstance(getattr(individual, 'genes', None), array):
+            typecode = individual.genes.typecode
+            if isinstance(individual_genes, list):
+                individual.genes = array(typecode, individual_genes)
+            else:
+                individual.genes = array(typecode)
+                individual.genes.frombytes(individual_genes)
+        elif hasattr(individual, 'genes'):
+            individual.genes = list(individual_genes)
+        else:
+            individual.extend(individual_genes)
+        if not math.isnan(fitnesses[i]):
+            individual.fitness_cached = fitnesses[i]
+        individuals.append(individual)
+    return individuals
+
+
+def _read(views, position, typecode, n):
+    """ Returns a typed view of n items in position and the next position.
+
+    The view is taken from the first view in views and appended to them.
+
+    :raises ValueError: If the file ends before the n items.
+    """
+    end = position + n * array(typecode).itemsize
+    if end > len(views[0]):
+        raise ValueError('Truncated checkpoint')
+    views.append(views[0][position:end].cast(typecode))
+    return views[-1], end
+
+
+def _aligned(position):
+    return -(-position // _ALIGNMENT) * _ALIGNMENT
+
+
+def _pad(f):
+    f.write(b'\0' * (_aligned(f.tell()) - f.tell()))
@@ -63,3 +63,8 @@ class NotAProbabilityError(WrongValueForInterval):
         :param value: The value.
         """
         super().__init__(var_name, 0, 1, value, inc_lower=True, inc_upper=True)
+
+
+class EvaluationError(PyneticsError):
+    """ Raised when the fitness of some individuals couldn't be computed. """
+    pass
@@ -1,20 +1,111 @@
+import functools
 from array import array
 
-import random
 from collections import abc
 
-from pynetics import Individual, SpawningPool, Mutation, take_chances, Diversity
+from pynetics import Individual, SpawningPool, Mutation, Diversity
+from pynetics.exceptions import InvalidSize
 from pynetics.ga_list import ListRecombination
+from pynetics.utils import sparse_positions, zobrist_key, fingerprint
+
+_LOWEST_BIT = bytes(b & 1 for b in range(256))
+
+
+@functools.lru_cache(maxsize=16)
+def _packing_steps(size):
+    """ The shifts and masks to pack size bytes (one bit each) into bits.
+
+    The bytes are read as a big integer with a bit every 8. Each step doubles
+    the width of the lanes of bits and joins the bits of the two halves of
+    each lane, so after log2(size) steps all the bits are together.
+
+    :return: A list of (shift, mask) tuples, starting with (0, mask of the
+        lowest bit of each byte).
+    """
+    total = 8 * size
+
+    def mask(lane, bits):
+        # The lowest bits of each lane (lanes are whole bytes)
+        lane_mask = ((1 << bits) - 1).to_bytes(lane // 8, 'big')
+        return int.from_bytes(lane_mask * -(-size * 8 // lane), 'big')
+
+    steps = [(0, mask(8, 1))]
+    lane, bits = 8, 1
+    while lane < total:
+        shift = lane - bits
+        lane, bits = 2 * lane, 2 * bits
+        steps.append((shift, mask(lane, bits)))
+    return steps
+
+
+def pack_bits(genes):
+    """ The integer whose binary digits are the genes (first the highest).
+
+    The genes are packed with a few operations over big integers instead of
+    a loop over each gene.
+
+    :param genes: A sequence of genes with values 0 or 1 (e.g. the genes of
+        a BinaryIndividual).
+    :return: A non negative integer lower than 2 ** len(genes).
+    """
+    data = bytes(genes)
+    value = int.from_bytes(data, 'big')
+    for shift, mask in _packing_steps(len(data))[1:]:
+        value = (value | value >> shift) & mask
+    return value
+
+
+def unpack_bits(value, size):
+    """ The genes whose binary digits are those of value (first the highest).
+
+    It's the inverse of pack_bits.
+
+    :param value: A non negative integer lower than 2 ** size.
+    :param size: The number of genes.
+    :return: A bytes object with size values 0 or 1.
+    """
+    steps = _packing_steps(size)
+    for i in range(len(steps) - 1, 0, -1):
+        value = (value | value << steps[i][0]) & steps[i - 1][1]
+    return value.to_bytes(size, 'big')
+
+
+def binary_to_gray(value):
+    """ The Gray code of a non negative integer.
+
+    :param value: A non negative integer.
+    :return: The integer whose binary digits are the Gray code of value.
+    """
+    return value ^ value >> 1
+
+
+def gray_to_binary(value):
+    """ The non negative integer whose Gray code is value.
+
+    It's the inverse of binary_to_gray, computed with a prefix XOR of
+    log2(bits) steps instead of a loop over each bit.
+
+    :param value: The integer whose binary digits are a Gray code.
+    :return: A non negative integer.
+    """
+    shift = 1
+    while value >> shift:
+        value ^= value >> shift
+        shift <<= 1
+    return value
 
 
 class BinaryIndividualSpawningPool(SpawningPool):
     """ Defines the methods for creating binary individuals. """
 
-    def __init__(self, size):
+    def __init__(self, size, max_size=None):
         """ Initializes this spawning pool for generating binary individuals.
 
         :param size: The size of the individuals to be created from
             this spawning pool.
+        :param max_size: If given, the individuals are created with a random
+            size between size and max_size (both included). Defaults to None
+            (all the individuals have the same size).
         :param fitness: The method to evaluate individuals. It's expected to be
             a callable that returns a float value where the higher the value,
             the better the individual. Instances of subclasses of class Fitness
@@ -27,14 +118,36 @@ class BinaryIndividualSpawningPool(SpawningPool):
         """
         super().__init__()
         self.individual_size = size
+        self.max_size = max_size
 
     def create(self):
-        individual = BinaryIndividual()
-        individual.genes = array('B', [
-            random.getrandbits(1)
-            for _ in range(self.individual_size)
-            ])
-        return individual
+        return self.create_many(1)[0]
+
+    def create_many(self, n):
+        """ Creates n new individuals randomly.
+
+        The bits of all the individuals are taken from a single block of random
+        bytes (the lowest bit of each one).
+
+        :param n: The number of individuals to create.
+        :return: A list of n new BinaryIndividual objects.
+        """
+        size = self.individual_size
+        if self.max_size is None:
+            sizes = [size] * n
+        else:
+            sizes = [self.rng.randint(size, self.max_size) for _ in range(n)]
+        total = sum(sizes)
+        bits = self.rng.getrandbits(8 * total).to_bytes(total, 'little') \
+            .translate(_LOWEST_BIT)
+        individuals = []
+        start = 0
+        for size in sizes:
+            individual = BinaryIndividual()
+            individual.genes = array('B', bits[start:start + size])
+            individuals.append(individual)
+            start += size
+        return individuals
 
 
 class MomentOfInertia(Diversity):
@@ -88,33 +201,116 @@ class AverageHamming(Diversity):
 
 
 class BinaryIndividual(Individual, abc.MutableSequence):
-    """ An individual represented by a binary chromosome. """
+    """ An individual represented by a binary chromosome.
+
+    As list individuals, it keeps a Zobrist fingerprint of its genes which is
+    updated in O(1) when a single gene is set, and which is also its hash. The
+    fingerprint is discarded when the attribute "genes" is replaced, but not
+    when it's modified in place (the individual should be modified instead).
+    Modifying the individual also discards its cached fitness.
+
+    The genes of a clone are shared with the cloned individual (copy on
+    write): they are copied by the first of them to be modified, so clones
+    that are never modified, or whose genes are replaced, don't copy them.
+    """
+    __fingerprint = None
+    __shared = None
 
     def __init__(self):
         super().__init__()
         self.genes = []
 
+    def __eq__(self, individual):
+        """ Two individuals are equal if they have the same genes.
+
+        If both individuals have their fingerprints cached and they differ, the
+        individuals are known to be different without comparing their genes.
+        """
+        if len(self) != len(individual):
+            return False
+        fingerprint = getattr(individual, 'fingerprint_cached', None)
+        if fingerprint is not None and self.fingerprint_cached is not None \
+                and fingerprint != self.fingerprint_cached:
+            return False
+        return all(x == y for (x, y) in zip(self.genes, individual))
+
+    def __hash__(self):
+        return self.fingerprint()
+
     def __getitem__(self, index):
         return self.genes[index]
 
     def __delitem__(self, index):
-        return self.genes.remove(index)
+        self.__own_genes()
+        self.__fingerprint = None
+        self.discard_fitness()
+        del self.genes[index]
 
     def insert(self, index, value):
+        self.__own_genes()
+        self.__fingerprint = None
+        self.discard_fitness()
         self.genes.insert(index, value)
 
     def __setitem__(self, index, value):
-        self.genes[index] = value
+        self.__own_genes()
+        fingerprint = self.fingerprint_cached
+        self.__fingerprint = None
+        self.discard_fitness()
+        if fingerprint is not None and isinstance(index, int):
+            old = self.genes[index]
+            self.genes[index] = value
+            index %= len(self.genes)
+            self.__fingerprint = self.genes, fingerprint ^ \
+                zobrist_key(index, old) ^ zobrist_key(index, value)
+        else:
+            self.genes[index] = value
 
     def __len__(self):
         return len(self.genes)
 
+    def __own_genes(self):
+        # Copies the genes before the first write if they are shared
+        if self.__shared is self.genes:
+            fingerprint = self.fingerprint_cached
+            self.genes = self.genes[:]
+            self.__shared = None
+            if fingerprint is not None:
+                self.__fingerprint = self.genes, fingerprint
+
+    def __getstate__(self):
+        # Fingerprints may change between processes
+        state = dict(self.__dict__)
+        state.pop('_BinaryIndividual__fingerprint', None)
+        return state
+
+    @property
+    def fingerprint_cached(self):
+        """ The fingerprint of the current genes if computed, None if not. """
+        if self.__fingerprint is not None and \
+                self.__fingerprint[0] is self.genes:
+            return self.__fingerprint[1]
+        return None
+
+    def fingerprint(self):
+        """ The Zobrist fingerprint of the genes of this individual.
+
+        :return: An integer of 64 bits (see utils.fingerprint).
+        """
+        value = self.fingerprint_cached
+        if value is None:
+            value = fingerprint(self.genes)
+            self.__fingerprint = self.genes, value
+        return value
+
     def phenotype(self):
         return self.genes
 
     def clone(self):
         clone = super().clone()
-        clone.genes = self.genes[:]
+        clone.genes = self.__shared = clone.__shared = self.genes
+        value = self.fingerprint_cached
+        clone.__fingerprint = None if value is None else (clone.genes, value)
         return clone
 
     def __str__(self):
@@ -138,21 +334,21 @@ class GeneralizedRecombination(ListRecombination):
         """
         child1, child2 = super().__call__(parent1, parent2)
         # Obtain the crossover range (as integer values)
-        a = int(''.join([str(b1 & b2) for (b1, b2) in zip(child1, child2)]), 2)
-        b = int(''.join([str(b1 | b2) for (b1, b2) in zip(child1, child2)]), 2)
+        x = pack_bits(getattr(parent1, 'genes', parent1))
+        y = pack_bits(getattr(parent2, 'genes', parent2))
+        a, b = x & y, x | y
 
         # Get the children (as integer values)
-        c = random.randint(a, b)
+        c = self.rng.randint(a, b)
         d = b - (c - a)
 
-        # Convert to binary lists again (NOTE: we remove the starting 0b)
-        bin_formatter = '{:#0' + str(len(child1) + 2) + 'b}'
-        bin_c = [int(x) for x in bin_formatter.format(c)[2:]]
-        bin_d = [int(x) for x in bin_formatter.format(d)[2:]]
-
         # Convert to chromosomes and we're finish
-        for i in range(len(bin_c)):
-            child1[i], child2[i] = bin_c[i], bin_d[i]
+        for child, value in ((child1, c), (child2, d)):
+            genes = unpack_bits(value, len(child))
+            if isinstance(getattr(child, 'genes', None), array):
+                child.genes = array(child.genes.typecode, genes)
+            else:
+                child[:] = genes
         return child1, child2
 
 
@@ -164,7 +360,111 @@ class AllGenesCanSwitch(Mutation):
         :param p: The probability for a gene to mutate.
         :return: The same instance maybe mutated).
         """
-        for i, gene_value in enumerate(individual):
-            if take_chances(probability=p):
-                individual[i] = 1 - gene_value
+        positions = sparse_positions(len(individual), p, self.rng)
+        individual.record_changes(individual, positions)
+        for i in positions:
+            individual[i] = 1 - individual[i]
         return individual
+
+
+class BinaryDecoder:
+    """ Decodes the genes of binary individuals into numeric parameters.
+
+    The genes are split in consecutive fields of bits, each one decoded as an
+    unsigned integer or as a real value in an interval (fixed point), and
+    optionally Gray coded. The genes of all the individuals are packed at once
+    into a big integer (see pack_bits) and the fields are taken from it with
+    shifts and masks, so no gene is decoded one by one.
+    """
+
+    def __init__(self, fields, gray=False):
+        """ Initializes this decoder.
+
+        :param fields: A sequence with the description of each field, in the
+            order they appear in the genes. A field is either the number of
+            bits of an unsigned integer, or a tuple (bits, lower, upper) for a
+            real value, where all zeros is lower and all ones is upper.
+        :param gray: If the bits of the fields are Gray coded. Defaults to
+            False.
+        """
+        self.fields = tuple(fields)
+        self.gray = gray
+        self.size = 0
+        self.__layout = []
+        for field in reversed(self.fields):
+            if isinstance(field, int):
+                bits, lower, span = field, None, None
+            else:
+                bits, lower, upper = field
+                span = upper - lower
+            self.__layout.append((self.size, (1 << bits) - 1, lower, span))
+            self.size += bits
+        self.__layout.reverse()
+
+    def __call__(self, individual):
+        """ Decodes the genes of an individual.
+
+        :param individual: A binary individual (or a sequence of genes).
+        :return: A list with the value of each field.
+        :raises InvalidSize: If the number of genes is not the size of the
+            fields.
+        """
+        return self.decode_many([individual])[0]
+
+    def decode_many(self, individuals):
+        """ Decodes the genes of many individuals at once.
+
+        :param individuals: A sequence of binary individuals (or sequences of
+            genes).
+        :return: A list with the list of values of each individual, in order.
+        :raises InvalidSize: If the number of genes of any individual is not
+            the size of the fields.
+        """
+        genomes = [bytes(getattr(i, 'genes', i)) for i in individuals]
+        for genes in genomes:
+            if len(genes) != self.size:
+                raise InvalidSize(self.size, len(genes))
+        # Each genome is padded to whole bytes once packed
+        padding = -self.size % 8
+        width = (self.size + padding) // 8
+        if not width:
+            return [self.__decode(0) for _ in genomes]
+        packed = pack_bits(
+            bytes(padding).join(genomes) + bytes(padding)
+        ).to_bytes(width * len(genomes), 'big')
+        return [
+            self.__decode(
+                int.from_bytes(packed[i:i + width], 'big') >> padding
+            )
+            for i in range(0, len(packed), width)
+        ]
+
+    def __decode(self, value):
+        values = []
+        for shift, mask, lower, span in self.__layout:
+            field = value >> shift & mask
+            if self.gray:
+                field = gray_to_binary(field)
+            if span is not None:
+                field = lower + span * field / mask
+            values.append(field)
+        return values
+
+    def encode(self, values):
+        """ The genes whose decoding are the given values.
+
+        The real values are rounded to the nearest value the field can
+        represent (and clamped to its interval).
+
+        :param values: A sequence with a value for each field.
+        :return: A bytes object with the genes (values 0 or 1).
+        """
+        packed = 0
+        for value, (shift, mask, lower, span) in zip(values, self.__layout):
+            if span is not None:
+                value = round((value - lower) * mask / span) if span else 0
+            value = min(max(int(value), 0), mask)
+            if self.gray:
+                value = binary_to_gray(value)
+            packed |= value << shift
+        return unpack_bits(packed, self.size)
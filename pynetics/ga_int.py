@@ -1,5 +1,3 @@
-import random
-
 from pynetics import ga_list
 from pynetics.ga_list import ListIndividualSpawningPool, ListRecombination
 
@@ -57,7 +55,7 @@ class IntegerRangeRecombination(ListRecombination):
                 diff = abs(min(i1_lower, i2_lower) - max(i1_upper, i2_upper))
 
             child1[i] = max(
-                min(random.randint(a - diff, b + diff), i1_upper),
+                min(self.rng.randint(a - diff, b + diff), i1_upper),
                 i1_lower
             )
             child2[i] = max(
@@ -1,17 +1,51 @@
+import functools
+import itertools
 import random
 from abc import ABCMeta, abstractmethod
+from array import array
 
 from pynetics import SpawningPool, Individual, Recombination, \
-    take_chances, Mutation, Diversity
+    take_chances, Mutation, Diversity, Fitness
+from pynetics.utils import sparse_positions, zobrist_key, fingerprint
+
+
+# Maps a random byte to a full (0xff) or empty (0x00) mask byte
+_MASK = bytes(0xff * (b & 1) for b in range(256))
 
 
 class Alleles(metaclass=ABCMeta):
     """ The alleles are all the possible values a gene can take. """
+    rng = random
 
     @abstractmethod
     def get(self):
         """ Returns a random value of all the possible existent values. """
 
+    def get_many(self, n):
+        """ Returns n random values of all the possible existent values.
+
+        By default it calls "get" n times, but subclasses may override it when
+        drawing many values at once is cheaper.
+
+        :param n: The number of values to return.
+        :return: A list of n values.
+        """
+        return [self.get() for _ in range(n)]
+
+    def get_other(self, value):
+        """ Returns a random value different from the given one.
+
+        By default values are drawn until one is different, so subclasses with
+        few possible values should override it.
+
+        :param value: The value to avoid.
+        :return: A value different from value.
+        """
+        other = self.get()
+        while other == value:
+            other = self.get()
+        return other
+
 
 class FiniteSetAlleles(Alleles):
     """ The possible alleles belong to a finite set of symbols. """
@@ -26,10 +60,67 @@ class FiniteSetAlleles(Alleles):
         :param symbols: The sequence of symbols.
         """
         self.symbols = set(symbols)
+        # Keep the given order (not the one of the set, which depends on the
+        # hashes) so the same random numbers give the same symbols every run
+        self.table = tuple(dict.fromkeys(symbols))
+        self.positions = {symbol: i for i, symbol in enumerate(self.table)}
+        # Tables to turn random bytes into symbols (if there are few of them)
+        n = len(self.table)
+        if 0 < n <= 256:
+            limit = 256 - 256 % n
+            self.__rejected = bytes(range(limit, 256))
+            if all(type(s) is int and 0 <= s < 256 for s in self.table):
+                self.__bytes = bytes(self.table[b % n] for b in range(256))
+                self.__symbols = None
+            else:
+                self.__bytes = bytes(b % n for b in range(256))
+                self.__symbols = self.table
 
     def get(self):
         """ A random value is selected uniformly over the set of values. """
-        return random.choice(tuple(self.symbols))
+        return self.rng.choice(self.table)
+
+    def get_many(self, n):
+        """ Selects n random values uniformly over the set of values.
+
+        When there are no more than 256 symbols, the values are drawn from a
+        single block of random bytes, mapped to the symbols at once (the bytes
+        that would bias the draw are discarded and drawn again).
+
+        :param n: The number of values to return.
+        :return: A list of n values.
+        """
+        if len(self.table) > 256:
+            return self.rng.choices(self.table, k=n)
+        values = bytearray()
+        while len(values) < n:
+            k = n - len(values)
+            values += self.rng.getrandbits(8 * k).to_bytes(k, 'little') \
+                .translate(self.__bytes, self.__rejected)
+        del values[n:]
+        if self.__symbols is None:
+            return list(values)
+        else:
+            return [self.__symbols[i] for i in values]
+
+    def get_other(self, value):
+        """ Selects a random value uniformly over the rest of values.
+
+        The value is drawn among all the symbols but one and, if it falls in
+        or after the position of value, it's shifted one position, so a single
+        random number is needed.
+
+        :param value: The value to avoid.
+        :return: A value different from value or, if there isn't any other
+            symbol, value itself.
+        """
+        i = self.positions.get(value)
+        if i is None:
+            return self.get()
+        elif len(self.table) == 1:
+            return value
+        j = self.rng.randrange(len(self.table) - 1)
+        return self.table[j + 1 if j >= i else j]
 
 
 class ListIndividualsWithFiniteSetAllelesDiversity(Diversity):
@@ -60,41 +151,147 @@ class ListIndividualsWithFiniteSetAllelesDiversity(Diversity):
 class ListIndividualSpawningPool(SpawningPool):
     """ Defines the methods for creating individuals required by population. """
 
-    def __init__(self, size, alleles):
+    def __init__(self, size, alleles, max_size=None):
         """ Initializes this spawning pool for generating list individuals.
 
         :param size: The size of the individuals to be created from this
             spawning pool.
         :param alleles: The alleles to be used as values of the genes.
+        :param max_size: If given, the individuals are created with a random
+            size between size and max_size (both included). Defaults to None
+            (all the individuals have the same size).
         """
         super().__init__()
         self.size = size
         self.alleles = alleles
+        self.max_size = max_size
 
     def create(self):
         """ Creates a new individual randomly.
 
         :return: A new Individual object.
         """
-        individual = ListIndividual()
-        for _ in range(self.size):
-            individual.append(self.alleles.get())
-        return individual
+        return self.create_many(1)[0]
+
+    def create_many(self, n):
+        """ Creates n new individuals randomly.
+
+        The genes of all the individuals are drawn at once from the alleles.
+
+        :param n: The number of individuals to create.
+        :return: A list of n new Individual objects.
+        """
+        if self.max_size is None:
+            sizes = [self.size] * n
+        else:
+            sizes = [
+                self.rng.randint(self.size, self.max_size) for _ in range(n)
+            ]
+        genes = self.alleles.get_many(sum(sizes))
+        individuals = []
+        start = 0
+        for size in sizes:
+            individual = ListIndividual()
+            individual.extend(genes[start:start + size])
+            individuals.append(individual)
+            start += size
+        return individuals
+
+
+def _forgetting_caches(method):
+    """ Wraps a list method so it discards the cached fingerprint and fitness.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.fingerprint_cached = None
+        self.discard_fitness()
+        return method(self, *args, **kwargs)
+
+    return wrapper
 
 
 # Maybe instead inherit from list is better inherit from mutablesequence
 class ListIndividual(Individual, list):
-    """ An individual whose representation is a list of finite values. """
+    """ An individual whose representation is a list of finite values.
+
+    The individual keeps a Zobrist fingerprint of its genes (see the method
+    "fingerprint"), computed the first time it's needed and updated in O(1)
+    when a single gene is set. Any other modification of the list discards it.
+    The fingerprint is also the hash of the individual, so individuals can be
+    stored in sets or used as keys of dicts (as long as they aren't modified
+    while in there).
+
+    Any modification of the genes also discards the cached fitness. Changes
+    to be evaluated incrementally must be recorded before making them (see
+    "record_changes").
+    """
+    fingerprint_cached = None
 
     def __eq__(self, individual):
         """ The equality between two list individuals is True if they:
 
         1. Have the same length
         2. Any two genes in the same position have the same value.
+
+        If both individuals have their fingerprints cached and they differ, the
+        individuals are known to be different without comparing their genes.
         """
-        return len(self) == len(individual) and all(
-            [x == y for (x, y) in zip(self, individual)]
-        )
+        if len(self) != len(individual):
+            return False
+        fingerprint = getattr(individual, 'fingerprint_cached', None)
+        if fingerprint is not None and self.fingerprint_cached is not None \
+                and fingerprint != self.fingerprint_cached:
+            return False
+        return all(x == y for (x, y) in zip(self, individual))
+
+    def __hash__(self):
+        return self.fingerprint()
+
+    def __setitem__(self, index, value):
+        fingerprint = self.fingerprint_cached
+        self.fingerprint_cached = None
+        self.discard_fitness()
+        if fingerprint is not None and isinstance(index, int):
+            old = list.__getitem__(self, index)
+            list.__setitem__(self, index, value)
+            index %= len(self)
+            self.fingerprint_cached = fingerprint ^ \
+                zobrist_key(index, old) ^ zobrist_key(index, value)
+        else:
+            list.__setitem__(self, index, value)
+
+    __delitem__ = _forgetting_caches(list.__delitem__)
+    __iadd__ = _forgetting_caches(list.__iadd__)
+    __imul__ = _forgetting_caches(list.__imul__)
+    append = _forgetting_caches(list.append)
+    clear = _forgetting_caches(list.clear)
+    extend = _forgetting_caches(list.extend)
+    insert = _forgetting_caches(list.insert)
+    pop = _forgetting_caches(list.pop)
+    remove = _forgetting_caches(list.remove)
+    reverse = _forgetting_caches(list.reverse)
+    sort = _forgetting_caches(list.sort)
+
+    def __getstate__(self):
+        # Fingerprints of strings change between processes
+        state = dict(self.__dict__)
+        state.pop('fingerprint_cached', None)
+        return state
+
+    def fingerprint(self):
+        """ The Zobrist fingerprint of the genes of this individual.
+
+        It's the XOR of a pseudo-random 64 bit key for each pair of locus and
+        gene (see utils.zobrist_key), so individuals with the same genes have
+        the same fingerprint and different individuals have different ones
+        with a very high probability.
+
+        :return: An integer of 64 bits.
+        """
+        if self.fingerprint_cached is None:
+            self.fingerprint_cached = fingerprint(self)
+        return self.fingerprint_cached
 
     def phenotype(self):
         """ A default phenotype for this kind of invdividuals.
@@ -107,11 +304,13 @@ class ListIndividual(Individual, list):
     def clone(self):
         """ Clones this ListIndividual.
 
+        The clone keeps the fingerprint of this individual, if computed.
+
         :return: A ListIndividual looking exactly like this.
         """
         individual = super().clone()
-        for gene in self:
-            individual.append(gene)
+        individual.extend(self)
+        individual.fingerprint_cached = self.fingerprint_cached
         return individual
 
 
@@ -150,6 +349,9 @@ class OnePointRecombination(ListRecombination):
         -----------
         children : aaabbbbb, bbbaaaaa
 
+        Each child records the genes changed from the parent it shares the
+        most genes with.
+
         :param parent1: One of the individuals from which generate the progeny.
         :param parent2: The other.
         :return: A list of two individuals, each a child containing some
@@ -157,10 +359,15 @@ class OnePointRecombination(ListRecombination):
         """
         child1, child2 = super().__call__(parent1, parent2)
 
-        p = random.randint(1, len(parent1) - 1)
-        for i in range(len(parent1)):
-            if i >= p:
-                child1[i], child2[i] = parent2[i], parent1[i]
+        n = len(parent1)
+        p = self.rng.randint(1, n - 1)
+        if p < n - p:
+            child1.record_changes(parent2, range(p))
+            child2.record_changes(parent1, range(p))
+        else:
+            child1.record_changes(parent1, range(p, n))
+            child2.record_changes(parent2, range(p, n))
+        child1[p:], child2[p:] = parent2[p:], parent1[p:]
         return child1, child2
 
 
@@ -181,6 +388,9 @@ class TwoPointRecombination(ListRecombination):
         -----------
         children : aaabbaaa, bbbaabbb
 
+        Each child records the genes changed from the parent it shares the
+        most genes with.
+
         :param parent1: One of the individuals from which generate the progeny.
         :param parent2: The other.
         :return: A list of two individuals, each a child containing some
@@ -188,11 +398,18 @@ class TwoPointRecombination(ListRecombination):
         """
         child1, child2 = super().__call__(parent1, parent2)
 
-        pivots = random.sample(range(len(parent1) - 1), 2)
-        p, q = min(pivots[0], pivots[1]), max(pivots[0], pivots[1])
-        for i in range(len(parent1)):
-            if not p < i < q:
-                child1[i], child2[i] = parent2[i], parent1[i]
+        pivots = self.rng.sample(range(len(parent1) - 1), 2)
+        p, q = min(pivots[0], pivots[1]) + 1, max(pivots[0], pivots[1])
+        n = len(parent1)
+        if q - p < n - (q - p):
+            child1.record_changes(parent2, range(p, q))
+            child2.record_changes(parent1, range(p, q))
+        else:
+            outside = [*range(p), *range(q, n)]
+            child1.record_changes(parent1, outside)
+            child2.record_changes(parent2, outside)
+        child1[:p], child2[:p] = parent2[:p], parent1[:p]
+        child1[q:], child2[q:] = parent2[q:], parent1[q:]
         return child1, child2
 
 
@@ -224,12 +441,52 @@ class RandomMaskRecombination(ListRecombination):
         :return: A list of two individuals, each a child containing some
             characteristics from their parents.
         """
-        child1, child2 = super().__call__(parent1, parent2)
+        return self.recombine_many([(parent1, parent2)])[0]
 
-        for i in range(len(parent1)):
-            if take_chances(.5):
-                child1[i], child2[i] = parent2[i], parent1[i]
-        return child1, child2
+    def recombine_many(self, parents_groups):
+        """ Recombines many pairs of parents at once.
+
+        The masks of all the pairs are taken from a single block of random
+        bytes. When the genes of the individuals are arrays of bytes (e.g.
+        binary individuals), the children are obtained with bitwise operations
+        over the whole genomes.
+
+        :param parents_groups: A sequence of pairs of parents.
+        :return: A list with the two children of each pair, in order.
+        """
+        sizes = [len(parent1) for parent1, _ in parents_groups]
+        total = sum(sizes)
+        masks = self.rng.getrandbits(8 * total).to_bytes(total, 'little') \
+            .translate(_MASK)
+
+        progenies = []
+        start = 0
+        for (parent1, parent2), size in zip(parents_groups, sizes):
+            mask = masks[start:start + size]
+            start += size
+            child1, child2 = super().__call__(parent1, parent2)
+            genes1 = getattr(child1, 'genes', None)
+            genes2 = getattr(child2, 'genes', None)
+            if isinstance(genes1, array) and isinstance(genes2, array) and \
+                    genes1.itemsize == genes2.itemsize == 1:
+                a = int.from_bytes(genes1.tobytes(), 'little')
+                b = int.from_bytes(genes2.tobytes(), 'little')
+                swapped = (a ^ b) & int.from_bytes(mask, 'little')
+                child1.genes = array(
+                    genes1.typecode, (a ^ swapped).to_bytes(size, 'little')
+                )
+                child2.genes = array(
+                    genes2.typecode, (b ^ swapped).to_bytes(size, 'little')
+                )
+            else:
+                child1[:] = [y if m else x for x, y, m in zip(
+                    parent1, parent2, mask
+                )]
+                child2[:] = [x if m else y for x, y, m in zip(
+                    parent1, parent2, mask
+                )]
+            progenies.append((child1, child2))
+        return progenies
 
 
 class SwapGenes(Mutation):
@@ -256,14 +513,16 @@ class SwapGenes(Mutation):
             exactly to the one passed as parameter with a probability of 1-p.
         """
         clone = individual.clone()
-        if take_chances(probability=p):
+        if take_chances(probability=p, rng=self.rng):
             # Get two random diferent indexes
             indexes = range(len(individual))
-            i1, i2 = tuple(random.sample(indexes, 2))
+            i1, i2 = tuple(self.rng.sample(indexes, 2))
             # Swap the genes in the cloned individual
+            clone.record_changes(individual, (i1, i2))
             clone[i1], clone[i2] = clone[i2], clone[i1]
             return clone
         else:
+            clone.record_changes(individual, ())
             return clone
 
 
@@ -290,20 +549,20 @@ class SingleGeneRandomValue(Mutation):
         -----------
         mutated    : aabdaabc
 
+        If the alleles have a single symbol, the gene is left unchanged.
+
         :param individual: The individual to be mutated.
         :param p: The probability of mutation.
         """
         clone = individual.clone()
-        if take_chances(probability=p):
+        if take_chances(probability=p, rng=self.rng):
             # Set in a random position a different gene than before
-            i = random.choice(range(len(individual)))
-            new_gene = self.alleles.get()
-            while individual[i] == new_gene:
-                new_gene = self.alleles.get()
-            # Set this gene in the cloned individual
-            clone[i] = new_gene
+            i = self.rng.randrange(len(individual))
+            clone.record_changes(individual, (i,))
+            clone[i] = self.alleles.get_other(individual[i])
             return clone
         else:
+            clone.record_changes(individual, ())
             return clone
 
 
@@ -334,18 +593,282 @@ class NGeneRandomValue(Mutation):
         -----------
         mutated    : aabdaabc
 
+        If the alleles have a single symbol, the genes are left unchanged.
+
         :param individual: The individual to be mutated.
         :param p: The probability of mutation.
         """
-        indexes = random.sample(
-            range(len(individual)),
-            min(self.n or len(individual), len(individual)),
+        n = min(self.n or len(individual), len(individual))
+        if n == len(individual):
+            indexes = sparse_positions(n, p, self.rng)
+        else:
+            prone = self.rng.sample(range(len(individual)), n)
+            indexes = [prone[i] for i in sparse_positions(n, p, self.rng)]
+        clone = individual.clone()
+        clone.record_changes(individual, indexes)
+        # Drawing the old value again and replacing it by any other value is
+        # the same as drawing directly among the other values
+        for i, new_gene in zip(indexes, self.alleles.get_many(len(indexes))):
+            if individual[i] == new_gene:
+                new_gene = self.alleles.get_other(new_gene)
+            clone[i] = new_gene
+        return clone
+
+
+# Operators for individuals whose length may change
+
+
+def _child(prototype, pieces):
+    """ A clone of prototype whose genes are those of the pieces, in order.
+
+    The pieces may be slices of genes of different types (e.g. arrays and
+    lists), so they are joined into genes of the type of the prototype's.
+    """
+    child = prototype.clone()
+    genes = itertools.chain.from_iterable(pieces)
+    current = getattr(child, 'genes', None)
+    if isinstance(current, array):
+        child.genes = array(current.typecode, genes)
+    elif current is not None:
+        child.genes = type(current)(genes)
+    else:
+        child[:] = list(genes)
+    return child
+
+
+class CutAndSpliceRecombination(Recombination):
+    """ Offspring is created by swapping the tails of the parents.
+
+    Unlike OnePointRecombination, each parent is cut at its own random point,
+    so the parents may have different lengths and the children lengths may
+    differ from theirs.
+
+    Goldberg, D. E., Korb, B. and Deb, K. (1989) Messy genetic algorithms:
+    Motivation, analysis, and first results. Complex Systems, 3(5), 493-530.
+    """
+
+    def __call__(self, parent1, parent2):
+        """ Offspring is obtained by splicing the head of each parent with the
+        tail of the other.
+
+        One example:
+
+        parents  : aaaaaaaa, bbbbb
+        cuts     : 3, 1
+        -----------
+        children : aaabbbb, baaaaa
+
+        :param parent1: One of the individuals from which generate the progeny.
+        :param parent2: The other.
+        :return: A tuple with the two children for this parents.
+        """
+        p = self.rng.randint(0, len(parent1))
+        q = self.rng.randint(0, len(parent2))
+        return (
+            _child(parent1, (parent1[:p], parent2[q:])),
+            _child(parent2, (parent2[:q], parent1[p:])),
         )
+
+
+class MessyRecombination(Recombination):
+    """ Offspring is created with the cut and splice operators of messy GAs.
+
+    Each parent is cut in two pieces at a random point with a probability
+    proportional to its length. Then, the pieces of all the parents are
+    spliced in order, each one with the previous with a probability, so the
+    number of children may vary.
+
+    Goldberg, D. E., Korb, B. and Deb, K. (1989) Messy genetic algorithms:
+    Motivation, analysis, and first results. Complex Systems, 3(5), 493-530.
+    """
+
+    def __init__(self, p_cut=0.02, p_splice=1.0):
+        """ Initializes this recombination.
+
+        :param p_cut: The probability of cutting per gene. A parent of length L
+            is cut with a probability of p_cut * (L - 1). Defaults to 0.02.
+        :param p_splice: The probability of splicing two consecutive pieces.
+            Defaults to 1.0.
+        """
+        self.p_cut = p_cut
+        self.p_splice = p_splice
+
+    def __call__(self, *args):
+        """ Cuts and splices the parents.
+
+        One example:
+
+        parents  : aaaaaaaa, bbbbb
+        cuts     : 3, none
+        splices  : no, yes
+        -----------
+        children : aaa, aaaaabbbbb
+
+        :param args: The individuals to use as parents.
+        :return: A list with the children, whose number may differ from the
+            number of parents.
+        """
+        pieces = []
+        for parent in args:
+            p_cut = self.p_cut * (len(parent) - 1)
+            if len(parent) > 1 and take_chances(p_cut, self.rng):
+                p = self.rng.randint(1, len(parent) - 1)
+                pieces.extend(((parent, parent[:p]), (parent, parent[p:])))
+            else:
+                pieces.append((parent, parent[:]))
+
+        children = []
+        prototype, spliced = pieces[0][0], [pieces[0][1]]
+        for parent, piece in pieces[1:]:
+            if take_chances(self.p_splice, self.rng):
+                spliced.append(piece)
+            else:
+                children.append(_child(prototype, spliced))
+                prototype, spliced = parent, [piece]
+        children.append(_child(prototype, spliced))
+        return children
+
+
+class GeneInsertion(Mutation):
+    """ Mutates the individual by inserting a random gene. """
+
+    def __init__(self, alleles, max_size=None):
+        """ Initializes this object.
+
+        :param alleles: The set of values to choose from.
+        :param max_size: The individuals of this size or longer are not mutated.
+            Defaults to None (no limit).
+        """
+        super().__init__()
+        self.alleles = alleles
+        self.max_size = max_size
+
+    def __call__(self, individual, p):
+        """ Inserts a random gene in a random position.
+
+        individual : aabbaaba
+        alleles    : (a, b, c, d)
+        insert pos : 3
+        -----------
+        mutated    : aabcbaaba
+
+        :param individual: The individual to be mutated.
+        :param p: The probability of mutation.
+        :return: A new individual mutated with a probabiity of p or looking
+            exactly to the one passed as parameter with a probability of 1-p.
+        """
+        clone = individual.clone()
+        too_long = self.max_size is not None and len(clone) >= self.max_size
+        if not too_long and take_chances(p, self.rng):
+            i = self.rng.randint(0, len(clone))
+            clone.insert(i, self.alleles.get())
+        return clone
+
+
+class GeneDeletion(Mutation):
+    """ Mutates the individual by deleting a random gene. """
+
+    def __init__(self, min_size=1):
+        """ Initializes this object.
+
+        :param min_size: The individuals of this size or shorter are not
+            mutated. Defaults to 1.
+        """
+        super().__init__()
+        self.min_size = min_size
+
+    def __call__(self, individual, p):
+        """ Deletes the gene in a random position.
+
+        individual : aabbaaba
+        delete pos : 3
+        -----------
+        mutated    : aabaaba
+
+        :param individual: The individual to be mutated.
+        :param p: The probability of mutation.
+        :return: A new individual mutated with a probabiity of p or looking
+            exactly to the one passed as parameter with a probability of 1-p.
+        """
         clone = individual.clone()
-        for i in indexes:
-            if take_chances(probability=p):
-                new_gene = self.alleles.get()
-                while individual[i] == new_gene:
-                    new_gene = self.alleles.get()
-                clone[i] = new_gene
+        if len(clone) > self.min_size and take_chances(p, self.rng):
+            del clone[self.rng.randrange(len(clone))]
         return clone
+
+
+class VariableLengthHamming(Diversity):
+    """ The average distance between pairs of individuals of any length.
+
+    The distance of two individuals is the number of positions in which their
+    genes differ, counting the positions of the longer beyond the shorter as
+    different, divided by the length of the longer. So it's 0 for equal
+    individuals and 1 for individuals with nothing in common.
+    """
+
+    def __call__(self, individuals):
+        """ Returns the average distance of all the pairs of individuals.
+
+        :param individuals: A sequence of individuals from which obtain the
+            diversity.
+        :return: A float value between 0 and 1, or 0 if there are less than two
+            individuals.
+        """
+        total, pairs = 0.0, 0
+        for i, i1 in enumerate(individuals):
+            for i2 in individuals[i + 1:]:
+                length = max(len(i1), len(i2))
+                if length:
+                    differences = sum(g1 != g2 for g1, g2 in zip(i1, i2))
+                    total += (differences + abs(len(i1) - len(i2))) / length
+                pairs += 1
+        return total / pairs if pairs else 0.0
+
+
+class LengthPenalty(Fitness):
+    """ Fitness of individuals penalized by their length.
+
+    Useful when the length of the individuals is free to change (e.g. subsets
+    of features or lists of rules) to prefer the shortest solutions.
+    """
+
+    def __init__(self, fitness, penalty):
+        """ Initializes this fitness.
+
+        :param fitness: The fitness to penalize.
+        :param penalty: A function that returns the penalty to subtract from the
+            fitness given the length of an individual (e.g. lambda n: 0.01 * n).
+        """
+        self.fitness = fitness
+        self.penalty = penalty
+        # The delta exists only when the penalized fitness has one, so
+        # otherwise the individuals are evaluated in batches (evaluate_many)
+        if hasattr(fitness, 'delta'):
+            self.delta = self._delta
+
+    def __call__(self, individual):
+        return self.fitness(individual) - self.penalty(len(individual))
+
+    def evaluate_many(self, individuals):
+        """ Evaluates the individuals with the penalized fitness at once. """
+        evaluate_many = getattr(self.fitness, 'evaluate_many', None)
+        if evaluate_many is None:
+            return [self(individual) for individual in individuals]
+        values = evaluate_many(individuals)
+        return [
+            value - self.penalty(len(individual))
+            for value, individual in zip(values, individuals)
+        ]
+
+    def _delta(self, parent_fitness, individual, changed_loci):
+        """ The delta of the penalized fitness, penalized too (see Fitness).
+
+        Only works when the length of the individual didn't change, which is
+        the case when its changes were recorded.
+        """
+        penalty = self.penalty(len(individual))
+        value = self.fitness.delta(
+            parent_fitness + penalty,
+            individual,
+            changed_loci,
+        )
+        return None if value is None else value - penalty
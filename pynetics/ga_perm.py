@@ -0,0 +1,287 @@
+""" Individuals and operators for problems whose solutions are permutations.
+
+The genes of a PermutationIndividual are the integers from 0 to L - 1, each
+one appearing exactly once (e.g. the order in which to visit the cities of a
+TSP instance). The recombinations use arrays of positions indexed by gene, so
+they create each child in O(L).
+"""
+from pynetics import Mutation, SpawningPool, take_chances
+from pynetics.ga_list import ListIndividual, ListRecombination
+
+
+class PermutationIndividual(ListIndividual):
+    """ An individual whose genes are a permutation of 0, ..., L - 1. """
+
+
+class PermutationSpawningPool(SpawningPool):
+    """ Creates random permutations of a given size. """
+
+    def __init__(self, size):
+        """ Initializes this spawning pool.
+
+        :param size: The number of genes of the individuals.
+        """
+        super().__init__()
+        self.size = size
+
+    def create(self):
+        """ Creates a new individual with a random permutation.
+
+        :return: A new PermutationIndividual object.
+        """
+        genes = list(range(self.size))
+        self.rng.shuffle(genes)
+        individual = PermutationIndividual()
+        individual.extend(genes)
+        return individual
+
+
+def pmx(parent1, parent2, a, b):
+    """ Partially mapped crossover of two permutations.
+
+    The child takes the genes between a and b from parent1 and the rest from
+    parent2. Each gene of the segment is swapped into its place in a copy of
+    parent2, which keeps the rest of the genes of parent2 in the same places
+    when possible.
+
+    :param parent1: The permutation the segment is taken from.
+    :param parent2: The permutation the rest of the genes are taken from.
+    :param a: The start of the segment (included).
+    :param b: The end of the segment (excluded).
+    :return: The list of genes of the child.
+    """
+    child = list(parent2)
+    positions = [0] * len(child)
+    for i, gene in enumerate(child):
+        positions[gene] = i
+    for i in range(a, b):
+        gene, replaced = parent1[i], child[i]
+        j = positions[gene]
+        child[i], child[j] = gene, replaced
+        positions[gene], positions[replaced] = i, j
+    return child
+
+
+def order_crossover(parent1, parent2, a, b):
+    """ Order crossover (OX) of two permutations.
+
+    The child takes the genes between a and b from parent1. The rest of the
+    positions, starting at b and wrapping around, are filled with the genes
+    not in the segment in the order they appear in parent2 (also starting at b
+    and wrapping around).
+
+    :param parent1: The permutation the segment is taken from.
+    :param parent2: The permutation that gives the order of the rest of genes.
+    :param a: The start of the segment (included).
+    :param b: The end of the segment (excluded).
+    :return: The list of genes of the child.
+    """
+    size = len(parent1)
+    child = list(parent1)
+    in_segment = [False] * size
+    for i in range(a, b):
+        in_segment[parent1[i]] = True
+    position = b % size
+    for i in range(b, b + size):
+        gene = parent2[i % size]
+        if not in_segment[gene]:
+            child[position] = gene
+            position = (position + 1) % size
+    return child
+
+
+def cycle_crossover(parent1, parent2):
+    """ Cycle crossover (CX) of two permutations.
+
+    The positions are split in cycles (following the position in parent1 of
+    the gene of parent2 in each position), and the child takes the genes of the
+    cycles from parent1 and parent2 alternatively. Every gene of the child is in
+    the same position as in one of the parents.
+
+    :param parent1: The permutation of the first, third... cycles.
+    :param parent2: The permutation of the second, fourth... cycles.
+    :return: The list of genes of the child.
+    """
+    size = len(parent1)
+    positions = [0] * size
+    for i, gene in enumerate(parent1):
+        positions[gene] = i
+    child = [None] * size
+    parents = (parent1, parent2)
+    cycle = 0
+    for start in range(size):
+        if child[start] is None:
+            parent = parents[cycle % 2]
+            i = start
+            while child[i] is None:
+                child[i] = parent[i]
+                i = positions[parent2[i]]
+            cycle += 1
+    return child
+
+
+class PermutationRecombination(ListRecombination):
+    """ Base class of the recombinations of permutations. """
+
+    def children(self, parent1, parent2, genes1, genes2):
+        """ Clones the parents and gives them the genes of the children. """
+        child1, child2 = super().__call__(parent1, parent2)
+        child1[:] = genes1
+        child2[:] = genes2
+        return child1, child2
+
+    def segment(self, size):
+        """ A random non empty segment (a, b) of a genome of the given size. """
+        return sorted(self.rng.sample(range(size + 1), 2))
+
+
+class PMXRecombination(PermutationRecombination):
+    """ Offspring is created with the partially mapped crossover (see pmx).
+
+    Goldberg, D. E. and Lingle, R. (1985) Alleles, loci, and the traveling
+    salesman problem. Proceedings of the First International Conference on
+    Genetic Algorithms and Their Applications, 154-159.
+    """
+
+    def __call__(self, parent1, parent2):
+        """ Applies the crossover operator with a random segment.
+
+        :param parent1: One of the individuals from which generate the progeny.
+        :param parent2: The other.
+        :return: A tuple with the two children for this parents.
+        """
+        a, b = self.segment(len(parent1))
+        return self.children(
+            parent1,
+            parent2,
+            pmx(parent1, parent2, a, b),
+            pmx(parent2, parent1, a, b),
+        )
+
+
+class OrderRecombination(PermutationRecombination):
+    """ Offspring is created with the order crossover (see order_crossover).
+
+    Davis, L. (1985) Applying adaptive algorithms to epistatic domains.
+    Proceedings of the International Joint Conference on Artificial
+    Intelligence, 162-164.
+    """
+
+    def __call__(self, parent1, parent2):
+        """ Applies the crossover operator with a random segment.
+
+        :param parent1: One of the individuals from which generate the progeny.
+        :param parent2: The other.
+        :return: A tuple with the two children for this parents.
+        """
+        a, b = self.segment(len(parent1))
+        return self.children(
+            parent1,
+            parent2,
+            order_crossover(parent1, parent2, a, b),
+            order_crossover(parent2, parent1, a, b),
+        )
+
+
+class CycleRecombination(PermutationRecombination):
+    """ Offspring is created with the cycle crossover (see cycle_crossover).
+
+    Oliver, I. M., Smith, D. J. and Holland, J. R. C. (1987) A study of
+    permutation crossover operators on the traveling salesman problem.
+    Proceedings of the Second International Conference on Genetic Algorithms,
+    224-230.
+    """
+
+    def __call__(self, parent1, parent2):
+        """ Applies the crossover operator.
+
+        :param parent1: One of the individuals from which generate the progeny.
+        :param parent2: The other.
+        :return: A tuple with the two children for this parents.
+        """
+        return self.children(
+            parent1,
+            parent2,
+            cycle_crossover(parent1, parent2),
+            cycle_crossover(parent2, parent1),
+        )
+
+
+class InsertionMutation(Mutation):
+    """ Mutates the individual by moving a random gene to other position. """
+
+    def __call__(self, individual, p):
+        """ Moves a random gene to a random position.
+
+        individual : 12345678
+        gene, to   : 2, 6
+        -----------
+        mutated    : 13456728
+
+        :param individual: The individual to be mutated.
+        :param p: The probability of mutation.
+        :return: A new individual mutated with a probabiity of p or looking
+            exactly to the one passed as parameter with a probability of 1-p.
+        """
+        clone = individual.clone()
+        if len(clone) > 1 and take_chances(p, self.rng):
+            i, j = self.rng.sample(range(len(clone)), 2)
+            clone.record_changes(individual, range(min(i, j), max(i, j) + 1))
+            clone.insert(j, clone.pop(i))
+        else:
+            clone.record_changes(individual, ())
+        return clone
+
+
+class InversionMutation(Mutation):
+    """ Mutates the individual by reversing a random segment. """
+
+    def __call__(self, individual, p):
+        """ Reverses the order of the genes of a random segment.
+
+        individual : 12345678
+        segment    : 2, 6
+        -----------
+        mutated    : 12654378
+
+        :param individual: The individual to be mutated.
+        :param p: The probability of mutation.
+        :return: A new individual mutated with a probabiity of p or looking
+            exactly to the one passed as parameter with a probability of 1-p.
+        """
+        clone = individual.clone()
+        if len(clone) > 1 and take_chances(p, self.rng):
+            a, b = sorted(self.rng.sample(range(len(clone) + 1), 2))
+            clone.record_changes(individual, range(a, b))
+            clone[a:b] = clone[a:b][::-1]
+        else:
+            clone.record_changes(individual, ())
+        return clone
+
+
+class ScrambleMutation(Mutation):
+    """ Mutates the individual by shuffling a random segment. """
+
+    def __call__(self, individual, p):
+        """ Shuffles the genes of a random segment.
+
+        individual : 12345678
+        segment    : 2, 6
+        -----------
+        mutated    : 12564378
+
+        :param individual: The individual to be mutated.
+        :param p: The probability of mutation.
+        :return: A new individual mutated with a probabiity of p or looking
+            exactly to the one passed as parameter with a probability of 1-p.
+        """
+        clone = individual.clone()
+        if len(clone) > 1 and take_chances(p, self.rng):
+            a, b = sorted(self.rng.sample(range(len(clone) + 1), 2))
+            clone.record_changes(individual, range(a, b))
+            segment = clone[a:b]
+            self.rng.shuffle(segment)
+            clone[a:b] = segment
+        else:
+            clone.record_changes(individual, ())
+        return clone
@@ -1,5 +1,3 @@
-import random
-
 from pynetics.ga_list import Alleles, ListRecombination
 
 
@@ -20,7 +18,16 @@ class RealIntervalAlleles(Alleles):
 
     def get(self):
         """ A random value is selected uniformly over the interval. """
-        return random.uniform(self.a, self.b)
+        return self.rng.uniform(self.a, self.b)
+
+    def get_many(self, n):
+        """ n random values are selected uniformly over the interval.
+
+        :param n: The number of values to return.
+        :return: A list of n values.
+        """
+        a, width, random = self.a, self.b - self.a, self.rng.random
+        return [a + width * random() for _ in range(n)]
 
 
 class PlainRecombination(ListRecombination):
@@ -37,7 +44,7 @@ class PlainRecombination(ListRecombination):
             lower_bound = min(parent1[g], parent2[g])
             upper_bound = max(parent1[g], parent2[g])
 
-            child1[g] = random.uniform(lower_bound, upper_bound)
+            child1[g] = self.rng.uniform(lower_bound, upper_bound)
             child2[g] = upper_bound - (child1[g] - lower_bound)
         return child1, child2
 
@@ -59,7 +66,7 @@ class FlexibleRecombination(ListRecombination):
             lower_bound = min(parent1[g], parent2[g]) - self.α
             upper_bound = max(parent1[g], parent2[g]) + self.α
 
-            child1[g] = random.uniform(lower_bound, upper_bound)
+            child1[g] = self.rng.uniform(lower_bound, upper_bound)
             child2[g] = upper_bound - (child1[g] - lower_bound)
         return child1, child2
 
@@ -119,7 +126,7 @@ class MorphologicalRecombination(ListRecombination):
             lower_bound = min(parent1[g], parent2[g]) + phi
             upper_bound = max(parent1[g], parent2[g]) - phi
 
-            child1[g] = random.uniform(lower_bound, upper_bound)
+            child1[g] = self.rng.uniform(lower_bound, upper_bound)
             child2[g] = upper_bound - (child1[g] - lower_bound)
         return child1, child2
 
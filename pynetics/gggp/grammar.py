@@ -28,7 +28,7 @@ class Term(metaclass=abc.ABCMeta):
         return self.__value
 
     @abc.abstractmethod
-    def random_derivation(self):
+    def random_derivation(self, rng=random):
         """ Generates a random derivation of this term.
 
         The method should give the immediate terms managed under this term. In
@@ -41,6 +41,8 @@ class Term(metaclass=abc.ABCMeta):
         terms; the method "random_tree" of Grammar class will take care of
         generating the tree.
 
+        :param rng: The random number generator to use. Defaults to the random
+            module.
         :return: A tuple of the immediate terms (or strings) managed under this
             term.
         """
@@ -100,7 +102,7 @@ class And(Connector):
     order.
     """
 
-    def random_derivation(self):
+    def random_derivation(self, rng=random):
         """ This term returns all the managed terms. """
         return self.value
 
@@ -175,7 +177,7 @@ class Or(Connector):
         else:
             return False
 
-    def random_derivation(self):
+    def random_derivation(self, rng=random):
         """ This term returns a tuple with one of its managed terms.
 
         The odds for a term to be chosen will be affected by its weight.
@@ -188,7 +190,7 @@ class Or(Connector):
                 ], key=operator.itemgetter(1)
         )
 
-        selected_p = random.random()
+        selected_p = rng.random()
         p = 0
         for element in terms_with_prob:
             p = p + element[1]
@@ -293,7 +295,7 @@ class Multiplier(Term, metaclass=abc.ABCMeta):
         """ Returns the probability of a new appearance of this term. """
         return self.__p
 
-    def random_derivation(self):
+    def random_derivation(self, rng=random):
         """ Returns a tuple with the managed term according to limits and p.
 
         The minimum size of the returned tuple will be the lower limit
@@ -302,7 +304,7 @@ class Multiplier(Term, metaclass=abc.ABCMeta):
         under the probability specified.
         """
         terms = [self.value for _ in range(self.lower)]
-        while len(terms) < self.upper and take_chances(self.p):
+        while len(terms) < self.upper and take_chances(self.p, rng):
             terms.append(self.value)
         return tuple(terms)
 
@@ -339,7 +341,7 @@ class SingleTerm(Term):
         else:
             return self.value == other.value
 
-    def random_derivation(self):
+    def random_derivation(self, rng=random):
         """ Returns a tuple with a number of terms between zero and n. """
         return self.value,
 
@@ -516,10 +518,12 @@ class Grammar:
 
         return self.__terminals
 
-    def random_tree(self, initial_symbol=None):
+    def random_tree(self, initial_symbol=None, rng=random):
         """ Creates a random tree using the specified initial symbol.
 
         :param initial_symbol: The start symbol from which to generate the tree.
+        :param rng: The random number generator to use. Defaults to the random
+            module.
         """
         # I've made this iterative alg. because the recursive one failed a lot
         productions = {p.variable: p.term for p in self.productions}
@@ -535,7 +539,7 @@ class Grammar:
                 if isinstance(node.value, Term):
                     elements = [
                         Node(value=element, parent=node.parent)
-                        for element in node.value.random_derivation()
+                        for element in node.value.random_derivation(rng)
                         ]
                 elif node.value in self.variables:
                     elements = [
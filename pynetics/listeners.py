@@ -0,0 +1,166 @@
+""" Wrappers to control when and where the listeners of an algorithm run.
+
+By default the listeners of a genetic algorithm are called synchronously each
+time the event they listen to happens. These wrappers allow calling them only
+every some generations or seconds, and calling them in a background thread
+with a lightweight snapshot of the algorithm, so slow listeners (e.g. plots or
+writes to disk) don't stall the evolution.
+"""
+import collections
+import queue
+import threading
+import time
+
+from pynetics.utils import detach
+
+Snapshot = collections.namedtuple('Snapshot', (
+    'generation',
+    'best',
+    'evaluations',
+    'evaluations_avoided',
+    'partial_evaluations',
+    'phase_times',
+    'elapsed',
+))
+
+
+def snapshot(genetic_algorithm):
+    """ Takes a lightweight snapshot of the state of an algorithm.
+
+    :param genetic_algorithm: The genetic algorithm.
+    :return: A Snapshot with the generation, a detached clone of the best
+        individual (None if there isn't one yet), the evaluation counters, a
+        copy of the times of each phase of the last step and the seconds
+        elapsed since the algorithm started to evolve.
+    """
+    best = genetic_algorithm.best()
+    start_time = genetic_algorithm.start_time
+    return Snapshot(
+        generation=genetic_algorithm.generation,
+        best=None if best is None else detach(best),
+        evaluations=genetic_algorithm.evaluations,
+        evaluations_avoided=genetic_algorithm.evaluations_avoided,
+        partial_evaluations=genetic_algorithm.partial_evaluations,
+        phase_times=dict(genetic_algorithm.phase_times),
+        elapsed=0. if start_time is None else time.perf_counter() - start_time,
+    )
+
+
+class Listener:
+    """ Base class of the wrappers of listeners.
+
+    The algorithm calls "close" on them when it finishes, so they can release
+    their resources.
+    """
+
+    def __init__(self, f):
+        """ Initializes the listener.
+
+        :param f: The wrapped functor.
+        """
+        self.f = f
+
+    def __call__(self, genetic_algorithm):
+        self.f(genetic_algorithm)
+
+    def close(self):
+        """ Called when the algorithm finishes. """
+        if isinstance(self.f, Listener):
+            self.f.close()
+
+
+class Throttled(Listener):
+    """ Calls a listener only every some generations and/or seconds. """
+
+    def __init__(self, f, every=None, every_seconds=None):
+        """ Initializes the listener.
+
+        When both every and every_seconds are given, both conditions must hold
+        for the listener to be called.
+
+        :param f: The wrapped functor.
+        :param every: If given, the listener is called only in the generations
+            multiple of this value. Defaults to None.
+        :param every_seconds: If given, the listener is called only if at least
+            this number of seconds have passed since the last call. Defaults to
+            None.
+        """
+        super().__init__(f)
+        self.every = every
+        self.every_seconds = every_seconds
+        self.last_call = None
+
+    def __call__(self, genetic_algorithm):
+        if self.every and genetic_algorithm.generation % self.every:
+            return
+        now = time.perf_counter()
+        if self.every_seconds is not None and self.last_call is not None and \
+                now - self.last_call < self.every_seconds:
+            return
+        self.last_call = now
+        self.f(genetic_algorithm)
+
+
+class Background(Listener):
+    """ Calls a listener in a background thread with snapshots.
+
+    The algorithm only takes a snapshot of itself and puts it in a queue, and
+    the listener is called with the snapshot (not with the algorithm) in a
+    thread of its own. If the listener falls behind and the queue is full, new
+    snapshots are dropped (and counted in the attribute "dropped") instead of
+    waiting for it. Exceptions raised by the listener are raised again when
+    the algorithm finishes.
+    """
+
+    def __init__(self, f, take_snapshot=snapshot, queue_size=64):
+        """ Initializes the listener.
+
+        :param f: The wrapped functor. It must accept the object returned by
+            take_snapshot.
+        :param take_snapshot: The function that takes the snapshot of the
+            algorithm. It's called in the thread of the algorithm, so it should
+            be fast. Defaults to the function "snapshot".
+        :param queue_size: The maximum number of snapshots waiting to be
+            processed. Defaults to 64.
+        """
+        super().__init__(f)
+        self.take_snapshot = take_snapshot
+        self.queue_size = queue_size
+        self.dropped = 0
+        self.__queue = None
+        self.__thread = None
+        self.__error = None
+
+    def __call__(self, genetic_algorithm):
+        if self.__thread is None:
+            self.__queue = queue.Queue(self.queue_size)
+            self.__thread = threading.Thread(target=self.__consume, daemon=True)
+            self.__thread.start()
+        try:
+            self.__queue.put_nowait(self.take_snapshot(genetic_algorithm))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        """ Waits for the pending snapshots to be processed.
+
+        :raises Exception: The first exception raised by the listener, if any.
+        """
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise error
+
+    def __consume(self):
+        while True:
+            item = self.__queue.get()
+            if item is None:
+                break
+            elif self.__error is None:
+                try:
+                    self.f(item)
+                except Exception as e:
+                    self.__error = e
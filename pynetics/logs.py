@@ -0,0 +1,186 @@
+""" Columnar logs of the statistics of each generation of a run.
+
+A log file starts with a header with the names of the columns, followed by
+blocks of rows. Each block stores its number of rows and then, column after
+column, the values of all its rows as little-endian doubles. Blocks are only
+appended, so a crash loses (at most) the rows not written yet.
+"""
+import math
+import os
+import struct
+from array import array
+
+MAGIC = b'PYNLOG01'
+
+_HEADER_SIZE = struct.Struct('<I')
+_BLOCK_SIZE = struct.Struct('<Q')
+_LITTLE_ENDIAN = array('d', [1.]).tobytes() == struct.pack('<d', 1.)
+
+STATISTICS = (
+    'generation',
+    'best',
+    'mean',
+    'std',
+    'diversity',
+    'evaluations',
+    'evaluations_avoided',
+    'partial_evaluations',
+    'surrogate_correlation',
+)
+
+
+class RunLogger:
+    """ Appends the statistics of each generation of a run to a log file.
+
+    The statistics are the generation, the best, mean and standard deviation of
+    the fitness of the population, its diversity (NaN if the algorithm has no
+    diversity method), the evaluations made so far, the evaluations avoided and
+    the partial evaluations in the generation (see the lazy evaluation of
+    SimpleGA), the rank correlation of the surrogate (NaN if the algorithm
+    doesn't screen its offspring) and the time spent in each phase of the step
+    (a column "time_<phase>" for each phase). Rows are kept in memory and
+    written in blocks, so logging is almost free.
+    """
+
+    def __init__(self, path, buffer_size=1024, diversity=True):
+        """ Initializes the logger.
+
+        :param path: The path of the log file. If it exists, the new rows are
+            appended to it.
+        :param buffer_size: The number of rows to keep in memory before writing
+            them in the file. Defaults to 1024.
+        :param diversity: Whether to compute the diversity of the population
+            or not, as it may be expensive. Defaults to True.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.diversity = diversity
+        self.columns = None
+        self.__buffers = None
+        self.__rows = 0
+
+    def register(self, genetic_algorithm):
+        """ Registers this logger in the algorithm.
+
+        The logger will be called at the end of each step, and the pending
+        rows will be written at the end of the algorithm.
+
+        :param genetic_algorithm: The genetic algorithm to log.
+        :return: The genetic algorithm.
+        """
+        return genetic_algorithm.on_step_end(self).on_end(
+            lambda ga: self.flush()
+        )
+
+    def __call__(self, genetic_algorithm):
+        """ Adds a row with the statistics of the current generation.
+
+        :param genetic_algorithm: The genetic algorithm to log.
+        """
+        population = genetic_algorithm.population
+        fitnesses = [individual.fitness() for individual in population]
+        mean = math.fsum(fitnesses) / len(fitnesses)
+        variance = math.fsum((f - mean) ** 2 for f in fitnesses)
+        diversity = math.nan
+        if self.diversity and genetic_algorithm.diversity is not None:
+            diversity = genetic_algorithm.diversity(population)
+
+        row = [
+            genetic_algorithm.generation,
+            max(fitnesses),
+            mean,
+            math.sqrt(variance / len(fitnesses)),
+            diversity,
+            genetic_algorithm.evaluations,
+            genetic_algorithm.evaluations_avoided,
+            genetic_algorithm.partial_evaluations,
+            getattr(genetic_algorithm, 'surrogate_correlation', math.nan),
+        ]
+        if self.columns is None:
+            phases = sorted(genetic_algorithm.phase_times)
+            self.__open(STATISTICS + tuple('time_' + p for p in phases))
+        for column in self.columns[len(STATISTICS):]:
+            row.append(genetic_algorithm.phase_times.get(column[5:], 0.))
+
+        for buffer, value in zip(self.__buffers, row):
+            buffer.append(value)
+        self.__rows += 1
+        if self.__rows >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """ Writes the rows kept in memory in the log file. """
+        if self.__rows:
+            with open(self.path, 'ab') as f:
+                f.write(_BLOCK_SIZE.pack(self.__rows))
+                for buffer in self.__buffers:
+                    if not _LITTLE_ENDIAN:
+                        buffer.byteswap()
+                    f.write(buffer)
+            self.__buffers = [array('d') for _ in self.columns]
+            self.__rows = 0
+
+    def __open(self, columns):
+        """ Writes the header or checks the one of the existing file. """
+        if os.path.exists(self.path) and os.path.getsize(self.path):
+            with open(self.path, 'rb') as f:
+                existing = _read_header(f)
+            if existing != columns:
+                raise ValueError(
+                    'The log {} has columns {}'.format(self.path, existing)
+                )
+        else:
+            header = '\n'.join(columns).encode('utf-8')
+            with open(self.path, 'wb') as f:
+                f.write(MAGIC)
+                f.write(_HEADER_SIZE.pack(len(header)))
+                f.write(header)
+        self.columns = columns
+        self.__buffers = [array('d') for _ in columns]
+
+
+def read_log(path, as_numpy=False):
+    """ Reads a log file written by a RunLogger.
+
+    An incomplete block at the end of the file (e.g. because of a crash while
+    writing it) is ignored.
+
+    :param path: The path of the log file.
+    :param as_numpy: If True, the columns are returned as NumPy arrays instead
+        of arrays of doubles. Requires NumPy installed. Defaults to False.
+    :return: A dict with an entry for each column name and all its values.
+    :raises ValueError: If the file is not a log file.
+    """
+    with open(path, 'rb') as f:
+        columns = _read_header(f)
+        data = f.read()
+
+    values = [array('d') for _ in columns]
+    position = 0
+    while position + _BLOCK_SIZE.size <= len(data):
+        rows, = _BLOCK_SIZE.unpack_from(data, position)
+        start = position + _BLOCK_SIZE.size
+        column_size = rows * 8
+        end = start + column_size * len(columns)
+        if end > len(data):
+            break
+        for column in values:
+            column.frombytes(data[start:start + column_size])
+            start += column_size
+        position = end
+
+    if not _LITTLE_ENDIAN:
+        [column.byteswap() for column in values]
+    if as_numpy:
+        import numpy
+        values = [numpy.frombuffer(column, dtype=numpy.float64)
+                  for column in values]
+    return dict(zip(columns, values))
+
+
+def _read_header(f):
+    """ Reads the column names from the start of a log file. """
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError('Not a pynetics log: ' + str(f.name))
+    size, = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+    return tuple(f.read(size).decode('utf-8').split('\n'))
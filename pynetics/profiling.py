@@ -0,0 +1,122 @@
+""" Profiling of the runs of genetic algorithms.
+
+A Profiler collects cProfile statistics for the initialization and each phase
+of the steps of an algorithm (selection, recombination, mutation, the sort to
+find the best individual...) separately, and tracemalloc snapshots of the
+memory at the given generations. At the end of the run it writes a text report
+with all of them.
+"""
+import contextlib
+import cProfile
+import io
+import pstats
+import tracemalloc
+
+DEFAULT_REPORT = 'pynetics-profile.txt'
+
+
+class Profiler:
+    """ Collects the profile of each phase of a genetic algorithm run. """
+
+    def __init__(
+            self,
+            path=DEFAULT_REPORT,
+            memory_generations=(),
+            limit=20,
+            sort='cumulative',
+    ):
+        """ Initializes the profiler.
+
+        :param path: The path of the report file. Defaults to
+            "pynetics-profile.txt".
+        :param memory_generations: The generations at the end of which to take
+            a snapshot of the memory. Defaults to none (no memory tracing).
+        :param limit: The number of entries of each table of the report.
+            Defaults to 20.
+        :param sort: The key to sort the cProfile statistics by (see
+            pstats.Stats.sort_stats). Defaults to "cumulative".
+        """
+        self.path = path
+        self.memory_generations = set(memory_generations)
+        self.limit = limit
+        self.sort = sort
+        self.profiles = {}
+        self.snapshots = {}
+        self.__active = []
+
+    @contextlib.contextmanager
+    def profile(self, genetic_algorithm):
+        """ Profiles the algorithm while inside the context.
+
+        The report is written when leaving the context.
+
+        :param genetic_algorithm: The genetic algorithm to profile.
+        """
+        tracing = self.memory_generations and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        genetic_algorithm.profiler = self
+        genetic_algorithm.on_step_end(self.take_snapshot)
+        try:
+            yield self
+        finally:
+            genetic_algorithm.profiler = None
+            genetic_algorithm.listeners[genetic_algorithm.STEP_END].remove(
+                self.take_snapshot
+            )
+            if tracing:
+                tracemalloc.stop()
+            self.write()
+
+    def enter(self, name):
+        """ Starts profiling a phase, pausing the phase it's nested in.
+
+        :param name: The name of the phase.
+        """
+        if self.__active:
+            self.profiles[self.__active[-1]].disable()
+        self.__active.append(name)
+        self.profiles.setdefault(name, cProfile.Profile()).enable()
+
+    def exit(self, name):
+        """ Stops profiling a phase, resuming the phase it's nested in.
+
+        :param name: The name of the phase.
+        """
+        self.profiles[self.__active.pop()].disable()
+        if self.__active:
+            self.profiles[self.__active[-1]].enable()
+
+    def take_snapshot(self, genetic_algorithm):
+        """ Takes a memory snapshot if the generation is one of those given.
+
+        :param genetic_algorithm: The genetic algorithm being profiled.
+        """
+        generation = genetic_algorithm.generation
+        if generation in self.memory_generations and tracemalloc.is_tracing():
+            self.snapshots[generation] = tracemalloc.take_snapshot()
+
+    def stats(self, name):
+        """ The cProfile statistics of a phase.
+
+        :param name: The name of the phase.
+        :return: A pstats.Stats instance.
+        """
+        return pstats.Stats(self.profiles[name], stream=io.StringIO())
+
+    def write(self):
+        """ Writes the report with the statistics collected so far. """
+        with open(self.path, 'w') as f:
+            for name in sorted(self.profiles):
+                f.write('=== Phase: {} ===\n'.format(name))
+                stats = pstats.Stats(self.profiles[name], stream=f)
+                stats.sort_stats(self.sort).print_stats(self.limit)
+            for generation in sorted(self.snapshots):
+                statistics = self.snapshots[generation].statistics('lineno')
+                f.write('=== Memory: generation {} ({} KiB) ===\n'.format(
+                    generation,
+                    sum(s.size for s in statistics) // 1024,
+                ))
+                for statistic in statistics[:self.limit]:
+                    f.write('{}\n'.format(statistic))
+                f.write('\n')
@@ -1,6 +1,23 @@
 from pynetics import Replacement
 
 
+def _race(population, individuals):
+    """ Replaces the less fit individual by each individual that beats it.
+
+    The individuals race against the less fit individual of the population,
+    so they are evaluated only as much as needed (see CaseBasedFitness).
+
+    :param population: The population where make the replacement.
+    :param individuals: The individuals racing to enter the population.
+    """
+    population.sort()
+    for individual in individuals:
+        if individual.beats(population[-1].fitness()):
+            del population[-1]
+            population.append(individual)
+            population.sort()
+
+
 class LowElitism(Replacement):
     """ Low elitism replacement.
 
@@ -10,13 +27,26 @@ class LowElitism(Replacement):
     replacement (i.e. a generational scheme).
     """
 
+    def __init__(self, racing=False):
+        """ Initializes this replacement.
+
+        :param racing: If True, each individual of the offspring replaces the
+            less fit individual of the population only if it beats it, so the
+            offspring race against the population and are evaluated only as
+            much as needed (see CaseBasedFitness). Defaults to False, i.e. all
+            the offspring replace the less fit individuals.
+        """
+        self.racing = racing
+
     def __call__(self, population, individuals):
         """ Removes less fit individuals and then inserts the offspring.
 
         :param population: The population where make the replacement.
         :param individuals: The new population to use as replacement.
         """
-        if individuals:
+        if individuals and self.racing:
+            _race(population, individuals)
+        elif individuals:
             population.sort()
             del population[-len(individuals):]
             population.extend(individuals)
@@ -27,18 +57,29 @@ class HighElitism(Replacement):
 
     The method will add all the individuals in the offspring to the population,
     removing afterwards those individuals less fit. This makes this operator
-    highly elitist but if length os population and offspring are the same, the
-    process will result in a full replacement, i.e. a generational scheme of
-    replacement.
+    highly elitist, as an individual is only replaced by a fitter one.
     """
 
+    def __init__(self, racing=False):
+        """ Initializes this replacement.
+
+        :param racing: If True, each individual of the offspring races against
+            the less fit individual of the population and replaces it only if
+            it beats it, which keeps the same fittest individuals but evaluates
+            the offspring only as much as needed (see CaseBasedFitness).
+            Defaults to False.
+        """
+        self.racing = racing
+
     def __call__(self, population, indviduals):
         """ Inserts the offspring in the population and removes the less fit.
 
         :param population: The population where make the replacement.
         :param indviduals: The new population to use as replacement.
         """
-        if indviduals:
-            population.sort()
+        if indviduals and self.racing:
+            _race(population, indviduals)
+        elif indviduals:
             population.extend(indviduals)
+            population.sort()
             del population[-len(indviduals):]
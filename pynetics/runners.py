@@ -0,0 +1,146 @@
+import collections
+import multiprocessing
+import queue
+
+from pynetics.stop import FitnessBound
+from pynetics.utils import detach
+
+RunResult = collections.namedtuple(
+    'RunResult',
+    ('seed', 'best', 'generations', 'cancelled'),
+)
+
+
+class MultiRunner:
+    """ Runs the same genetic algorithm many times with different seeds.
+
+    Each run is executed in its own process of a pool, and it's independent of
+    the others except for the cancellation: once a run meets the cancel
+    condition, all the remaining runs are stopped.
+    """
+
+    def __init__(
+            self,
+            factory,
+            runs,
+            seed=0,
+            processes=None,
+            cancel_condition=None,
+            on_progress=None,
+            progress_every=1,
+    ):
+        """ Initializes this runner.
+
+        :param factory: A function that receives a seed and returns the
+            genetic algorithm to run. As it is sent to other processes, it must
+            be pickleable (e.g. a module level function).
+        :param runs: The number of runs.
+        :param seed: The seed of the first run. The ith run will use the seed
+            seed + i, so the runs are reproducible. Defaults to 0.
+        :param processes: The number of processes of the pool. If None, the
+            number of CPUs is used. Defaults to None.
+        :param cancel_condition: A stop condition that, once met in any of the
+            runs, stops all the runs. It must be pickleable. If None and the
+            stop condition of a run is a FitnessBound, that one is used.
+            Defaults to None.
+        :param on_progress: A function to be called in this process each time a
+            run sends its progress. It receives the index of the run, its
+            generation and the fitness of its best individual. Defaults to
+            None (progress is not reported).
+        :param progress_every: The runs report their progress each this number
+            of generations. Defaults to 1.
+        """
+        self.factory = factory
+        self.seeds = [seed + i for i in range(runs)]
+        self.processes = processes
+        self.cancel_condition = cancel_condition
+        self.on_progress = on_progress
+        self.progress_every = progress_every
+
+    def run(self):
+        """ Executes all the runs and waits for them to finish.
+
+        :return: A list of RunResult instances, one for each run and in the
+            same order of the seeds. Each result contains the seed, the best
+            individual found (without population nor fitness method but with its
+            fitness cached), the number of generations and whether the run was
+            cancelled or not. Runs cancelled before starting have no best
+            individual.
+        """
+        with multiprocessing.Manager() as manager, \
+                multiprocessing.Pool(self.processes) as pool:
+            progress = manager.Queue()
+            cancel = manager.Event()
+            results = [
+                pool.apply_async(_run, (
+                    self.factory,
+                    i,
+                    seed,
+                    self.cancel_condition,
+                    cancel,
+                    progress if self.on_progress else None,
+                    self.progress_every,
+                ))
+                for i, seed in enumerate(self.seeds)
+            ]
+            if self.on_progress is None:
+                [result.wait() for result in results]
+            else:
+                while not all(result.ready() for result in results):
+                    self.__report(progress, block=True)
+                while self.__report(progress, block=False):
+                    pass
+            return [result.get() for result in results]
+
+    def __report(self, progress, block):
+        """ Sends the next progress message to the callback.
+
+        :param progress: The queue where the runs put their progress.
+        :param block: Whether to wait a little for a message or not.
+        :return: True if a message was reported, False otherwise.
+        """
+        try:
+            if block:
+                message = progress.get(timeout=0.05)
+            else:
+                message = progress.get_nowait()
+        except queue.Empty:
+            return False
+        self.on_progress(*message)
+        return True
+
+
+def _run(factory, index, seed, cancel_condition, cancel, progress, every):
+    """ Executes a single run of a MultiRunner in a process of the pool. """
+    if cancel.is_set():
+        return RunResult(seed, None, 0, True)
+
+    genetic_algorithm = factory(seed)
+    genetic_algorithm.rng.seed(seed)
+    stop_condition = genetic_algorithm.stop_condition
+    if cancel_condition is None and isinstance(stop_condition, FitnessBound):
+        cancel_condition = stop_condition
+    cancelled = []
+
+    def stop(ga):
+        if cancel.is_set():
+            cancelled.append(True)
+            return True
+        elif cancel_condition is not None and cancel_condition(ga):
+            cancel.set()
+        return stop_condition(ga)
+
+    def report(ga):
+        if ga.generation % every == 0:
+            progress.put((index, ga.generation, ga.best().fitness()))
+
+    genetic_algorithm.stop_condition = stop
+    if progress is not None:
+        genetic_algorithm.on_step_end(report)
+    genetic_algorithm.run()
+    return RunResult(
+        seed,
+        detach(genetic_algorithm.best()),
+        genetic_algorithm.generation,
+        bool(cancelled),
+    )
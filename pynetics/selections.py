@@ -1,6 +1,3 @@
-import operator
-import random
-
 from pynetics import Selection
 
 
@@ -67,16 +64,24 @@ class Tournament(Selection):
 
         If "rep" is activated, the returned individuals may be repeated.
 
+        The individuals of the sample not evaluated yet race against the best
+        one so far, so they are evaluated only as much as needed to know if
+        they beat it (see CaseBasedFitness).
+
         :param n: The number of individuals to return.
         :param population: The population from which select the individuals.
         :return: A list of n individuals.
         """
         individuals = []
         for _ in range(n):
-            sample = random.sample(population, self.sample_size)
-            individuals.append(
-                max(sample, key=operator.methodcaller('fitness'))
-            )
+            sample = self.rng.sample(population, self.sample_size)
+            # Those already evaluated first, so they set the threshold
+            sample.sort(key=lambda i: i.fitness_cached is None)
+            best = sample[0]
+            for individual in sample[1:]:
+                if individual.beats(best.fitness()):
+                    best = individual
+            individuals.append(best)
         return individuals
 
 
@@ -93,4 +98,4 @@ class Uniform(Selection):
         :param n: The number of individuals to return.
         :return: A list of n individuals.
         """
-        random.sample(population, n)
+        return self.rng.sample(population, n)
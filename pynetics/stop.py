@@ -1,3 +1,5 @@
+import time
+
 from pynetics import StopCondition
 
 
@@ -50,3 +52,137 @@ class FitnessBound(StopCondition):
         :return: True if criteria is met, false otherwise.
         """
         return genetic_algorithm.best().fitness() >= self.fitness_bound
+
+
+class Stagnation(StopCondition):
+    """ If the best fitness hasn't improved for a number of generations. """
+
+    def __init__(self, n_generations, epsilon=0.):
+        """ Initializes this function with the allowed stagnation.
+
+        :param n_generations: The number of generations without improvement
+            after which the criteria is met.
+        :param epsilon: The minimum increase of the best fitness considered an
+            improvement. Defaults to 0 (any increase).
+        """
+        self.n_generations = n_generations
+        self.epsilon = epsilon
+        self.__reference = None
+        self.__improved_at = 0
+        self.__generation = None
+
+    def __call__(self, genetic_algorithm):
+        """ Checks if this stop criteria is met.
+
+        It compares the fitness of the best individual of the current
+        generation against the best fitness of the last improvement, so the
+        population is never read. A generation lower than the one of the
+        previous call means a new run, so the tracking starts again.
+
+        :param genetic_algorithm: The genetic algorithm where this stop
+            condition belongs.
+        :return: True if criteria is met, false otherwise.
+        """
+        generation = genetic_algorithm.generation
+        fitness = genetic_algorithm.best().fitness()
+        if self.__generation is None or generation < self.__generation:
+            self.__reference = fitness
+            self.__improved_at = generation
+        elif fitness > self.__reference + self.epsilon:
+            self.__reference = fitness
+            self.__improved_at = generation
+        self.__generation = generation
+        return generation - self.__improved_at >= self.n_generations
+
+
+class TimeBudget(StopCondition):
+    """ If the genetic algorithm has been running for too long. """
+
+    def __init__(self, seconds):
+        """ Initializes this function with the time budget.
+
+        :param seconds: The seconds the algorithm is allowed to run.
+        """
+        self.seconds = seconds
+
+    def __call__(self, genetic_algorithm):
+        """ Checks if this stop criteria is met.
+
+        The time is measured since the algorithm started to evolve (i.e. since
+        the call to "run" or "resume"). The criteria is checked between steps,
+        so the last step may exceed the budget.
+
+        :param genetic_algorithm: The genetic algorithm where this stop
+            condition belongs.
+        :return: True if criteria is met, false otherwise.
+        """
+        elapsed = time.perf_counter() - genetic_algorithm.start_time
+        return elapsed >= self.seconds
+
+
+class EvaluationBudget(StopCondition):
+    """ If the genetic algorithm has made enough fitness evaluations. """
+
+    def __init__(self, max_evals):
+        """ Initializes this function with the evaluation budget.
+
+        :param max_evals: The number of evaluations to make before stop.
+        """
+        self.max_evals = max_evals
+
+    def __call__(self, genetic_algorithm):
+        """ Checks if this stop criteria is met.
+
+        :param genetic_algorithm: The genetic algorithm where this stop
+            condition belongs.
+        :return: True if criteria is met, false otherwise.
+        """
+        return genetic_algorithm.evaluations >= self.max_evals
+
+
+class Any(StopCondition):
+    """ If any of a set of stop conditions is met. """
+
+    def __init__(self, *stop_conditions):
+        """ Initializes this function with the conditions to check.
+
+        :param stop_conditions: The stop conditions.
+        """
+        self.stop_conditions = stop_conditions
+
+    def __call__(self, genetic_algorithm):
+        """ Checks if this stop criteria is met.
+
+        All the conditions are checked (there's no short-circuit) so those
+        tracking the progress of the algorithm (e.g. Stagnation) see every
+        generation.
+
+        :param genetic_algorithm: The genetic algorithm where this stop
+            condition belongs.
+        :return: True if criteria is met, false otherwise.
+        """
+        return any([c(genetic_algorithm) for c in self.stop_conditions])
+
+
+class All(StopCondition):
+    """ If all of a set of stop conditions are met. """
+
+    def __init__(self, *stop_conditions):
+        """ Initializes this function with the conditions to check.
+
+        :param stop_conditions: The stop conditions.
+        """
+        self.stop_conditions = stop_conditions
+
+    def __call__(self, genetic_algorithm):
+        """ Checks if this stop criteria is met.
+
+        All the conditions are checked (there's no short-circuit) so those
+        tracking the progress of the algorithm (e.g. Stagnation) see every
+        generation.
+
+        :param genetic_algorithm: The genetic algorithm where this stop
+            condition belongs.
+        :return: True if criteria is met, false otherwise.
+        """
+        return all([c(genetic_algorithm) for c in self.stop_conditions])
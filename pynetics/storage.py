@@ -0,0 +1,417 @@
+""" Populations whose genomes are stored in a memory-mapped file.
+
+When a population has millions of individuals, keeping each one as a Python
+object takes much more memory than its genes. A MappedPopulation stores the
+genes of all its individuals as rows of fixed length in a file mapped in
+memory (so the operating system decides which parts stay in RAM), and only
+their fitness in memory. Its individuals are created on access as views of
+their rows.
+
+Only individuals with a fixed number of numeric genes (e.g. binary or integer
+individuals) can be stored.
+"""
+import math
+import mmap
+import tempfile
+from array import array
+from collections import abc
+
+from pynetics import Fitness, Individual, Population
+from pynetics.exceptions import InvalidSize
+from pynetics.utils import detach
+
+
+def _typecode(individual):
+    """ The array typecode to store the genes of individuals like this one. """
+    genes = getattr(individual, 'genes', None)
+    if isinstance(genes, array):
+        return genes.typecode
+    elif all(type(gene) is int for gene in individual):
+        return 'q'
+    elif all(type(gene) is float for gene in individual):
+        return 'd'
+    else:
+        raise TypeError('The genes of the individuals must be numeric')
+
+
+class MappedIndividual(Individual, abc.Sequence):
+    """ A view of the row of an individual in a MappedPopulation.
+
+    Reading or setting its genes and its fitness reads or writes the row of
+    the population. Views are only valid until the population is modified (the
+    rows may move when individuals are inserted, deleted or sorted), so they
+    are meant to be used right away. Cloning a view creates a regular
+    individual with a copy of the genes, like those spawned by the spawning
+    pool of the population.
+    """
+
+    def __init__(self, population, index):
+        """ Initializes the view.
+
+        :param population: The MappedPopulation the individual belongs to.
+        :param index: The row of the individual.
+        """
+        self.population = population
+        self.index = index
+        self.parent_fitness = None
+        self.changed_loci = None
+
+    @property
+    def genes(self):
+        """ A memoryview of the genes in the row of the individual.
+
+        The file of the population can't grow nor be closed while it exists, so
+        it should be released (e.g. in a "with" statement) once used.
+        """
+        return self.population.row(self.index)
+
+    @property
+    def fitness_method(self):
+        return self.population.fitness_method
+
+    @fitness_method.setter
+    def fitness_method(self, fitness_method):
+        self.population.fitness_method = fitness_method
+
+    @property
+    def fitness_cached(self):
+        value = self.population.fitnesses[self.index]
+        return None if math.isnan(value) else value
+
+    @fitness_cached.setter
+    def fitness_cached(self, value):
+        self.population.fitnesses[self.index] = \
+            math.nan if value is None else value
+
+    def __getitem__(self, index):
+        """ The gene in the given position, or a copy of them for slices. """
+        with self.genes as genes:
+            if isinstance(index, slice):
+                return self.population.copy_genes(genes[index])
+            return genes[index]
+
+    def __setitem__(self, index, value):
+        with self.genes as genes:
+            genes[index] = value
+        self.discard_fitness()
+
+    def __iter__(self):
+        with self.genes as genes:
+            return iter(genes.tolist())
+
+    def __len__(self):
+        return self.population.length
+
+    def phenotype(self):
+        with self.genes as genes:
+            return genes.tolist()
+
+    def clone(self):
+        """ Creates a regular individual with a copy of the genes of this view.
+
+        :return: An individual of the same class as those spawned by the
+            spawning pool of the population.
+        """
+        individual = self.population.prototype.clone()
+        individual.population = self.population
+        individual.fitness_method = self.fitness_method
+        with self.genes as genes:
+            if hasattr(individual, 'genes'):
+                individual.genes = self.population.copy_genes(genes)
+            else:
+                individual[:] = genes.tolist()
+        return individual
+
+
+class MappedPopulation(Population):
+    """ A population whose genes are stored in a memory-mapped file.
+
+    It can be used as any other population, but accessing an individual
+    creates a view of its row (see MappedIndividual), and sorting it moves the
+    rows of the file, so it's better to ask for the best individual (which
+    doesn't need a sort) or to evaluate it (in chunks) when possible. A
+    SimpleGA uses it when given as its population factory, evaluating it in
+    chunks. However, the elitist replacements (LowElitism and HighElitism)
+    sort the population in every generation, which moves its rows and builds
+    the sorting order of all of them.
+    """
+
+    def __init__(
+            self,
+            size=None,
+            spawning_pool=None,
+            individuals=None,
+            path=None,
+            chunk_size=4096,
+    ):
+        """ Initializes the population, filling it with individuals.
+
+        The individuals are spawned and written to the file in chunks, so they
+        are never all in memory at the same time.
+
+        :param size: The size this population should have.
+        :param spawning_pool: The object that generates individuals.
+        :param individuals: The list of starting individuals. If none or if its
+            length is lower than the population size, the rest of individuals
+            will be generated randomly. If the length of initial individuals is
+            greater than the population size, a random sample of the individuals
+            is selected as members of population.
+        :param path: The path of the file where to store the genes. If None, an
+            anonymous temporary file is used. Defaults to None.
+        :param chunk_size: The number of individuals to spawn or evaluate at
+            once. Defaults to 4096.
+        :raises InvalidSize: If the provided size for the population is invalid
+            or the individuals don't have all the same number of genes.
+        :raises TypeError: If the genes of the individuals are not numeric.
+        """
+        if size is None or size < 1:
+            raise InvalidSize('> 0', size)
+
+        self.size = size
+        self.spawning_pool = spawning_pool
+        self.spawning_pool.population = self
+        self.chunk_size = chunk_size
+        self.fitness_method = None
+        self.fitnesses = array('d')
+
+        individuals = list(individuals or [])
+        if len(individuals) > size:
+            individuals = self.spawning_pool.rng.sample(individuals, size)
+        if not individuals:
+            individuals = self.spawning_pool.spawn_many(min(size, chunk_size))
+
+        self.prototype = detach(individuals[0])
+        self.prototype.fitness_cached = None
+        self.length = len(individuals[0])
+        self.typecode = _typecode(individuals[0])
+        self.row_size = self.length * array(self.typecode).itemsize
+        self.file = open(path, 'w+b') if path else tempfile.TemporaryFile()
+        self.__capacity = size
+        self.file.truncate(max(1, size * self.row_size))
+        self.mmap = mmap.mmap(self.file.fileno(), 0)
+
+        self.extend(individuals)
+        while len(self) < size:
+            self.extend(self.spawning_pool.spawn_many(
+                min(size - len(self), chunk_size)
+            ))
+
+    def close(self):
+        """ Releases the mapping and the file of this population. """
+        self.mmap.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def copy_genes(self, genes):
+        """ Copies genes of a row as the individuals of the population do.
+
+        :param genes: The genes (e.g. a memoryview of a row or part of it).
+        :return: An array if the genes of the individuals spawned by the
+            spawning pool are arrays, or a list otherwise.
+        """
+        if isinstance(getattr(self.prototype, 'genes', None), array):
+            return array(self.typecode, genes)
+        return genes.tolist()
+
+    def row(self, i):
+        """ A memoryview of the genes in the ith row.
+
+        :param i: The index of the row.
+        :return: A memoryview with the format of the typecode of the genes.
+        """
+        start = i * self.row_size
+        return memoryview(self.mmap)[start:start + self.row_size].cast(
+            self.typecode
+        )
+
+    def evaluate(self, fitness=None, chunk_size=None):
+        """ Computes the fitness of the individuals not evaluated yet.
+
+        The individuals are evaluated in chunks of consecutive rows. If the
+        fitness is a Fitness instance, each chunk is evaluated with a single
+        call to its "evaluate_many" method.
+
+        :param fitness: The fitness to use. If None, the fitness method of the
+            individuals of the population. Defaults to None.
+        :param chunk_size: The number of individuals to evaluate at once. If
+            None, the chunk size of the population. Defaults to None.
+        :return: The number of individuals evaluated.
+        """
+        if fitness is None:
+            fitness = self.fitness_method
+        chunk_size = chunk_size or self.chunk_size
+        evaluated = 0
+        for start in range(0, len(self), chunk_size):
+            pending = [
+                i for i in range(start, min(start + chunk_size, len(self)))
+                if math.isnan(self.fitnesses[i])
+            ]
+            if not pending:
+                continue
+            views = [MappedIndividual(self, i) for i in pending]
+            if isinstance(fitness, Fitness):
+                values = fitness.evaluate_many(views)
+            else:
+                values = [fitness(view) for view in views]
+            for i, value in zip(pending, values):
+                self.fitnesses[i] = value
+            evaluated += len(pending)
+        return evaluated
+
+    def diversity(self):
+        return self.spawning_pool.diversity(self[:])
+
+    def sort(self):
+        """ Sorts this population from best to worst individual.
+
+        The pending individuals are evaluated first (in chunks) and then the
+        rows are moved to their places following the cycles of the sorting
+        permutation, so each row is copied once.
+        """
+        self.evaluate()
+        order = sorted(
+            range(len(self)),
+            key=self.fitnesses.__getitem__,
+            reverse=True,
+        )
+        placed = bytearray(len(self))
+        for start in range(len(self)):
+            if placed[start] or order[start] == start:
+                continue
+            row = self.mmap[self.__slice(start)]
+            i = start
+            while order[i] != start:
+                self.mmap[self.__slice(i)] = self.mmap[self.__slice(order[i])]
+                placed[i] = 1
+                i = order[i]
+            self.mmap[self.__slice(i)] = row
+            placed[i] = 1
+        self.fitnesses = array('d', (self.fitnesses[i] for i in order))
+
+    def best(self):
+        """ Returns the best individual of the population.
+
+        The individuals are evaluated if needed, but the population is not
+        sorted.
+
+        :return: A regular individual (not a view) with the genes and fitness
+            of the best one.
+        """
+        self.evaluate()
+        index = max(range(len(self)), key=self.fitnesses.__getitem__)
+        individual = MappedIndividual(self, index).clone()
+        individual.fitness_cached = self.fitnesses[index]
+        return individual
+
+    def __len__(self):
+        return len(self.fitnesses)
+
+    def __getitem__(self, i):
+        """ Returns a view of the individual in the ith position.
+
+        :param i: The index (or slice) of the individuals to retrieve.
+        :return: A MappedIndividual, or a list of them if i is a slice.
+        """
+        if isinstance(i, slice):
+            return [
+                MappedIndividual(self, j)
+                for j in range(*i.indices(len(self)))
+            ]
+        return MappedIndividual(self, range(len(self))[i])
+
+    def __setitem__(self, i, individual):
+        """ Writes the genes and fitness of the individual in the ith row.
+
+        :param i: The position where to put the individual.
+        :param individual: The individual to be stored.
+        """
+        if isinstance(i, slice):
+            for j, item in zip(range(*i.indices(len(self))), individual):
+                self[j] = item
+            return
+        i = range(len(self))[i]
+        self.mmap[self.__slice(i)] = self.__pack(individual)
+        self.fitnesses[i] = math.nan if individual.fitness_cached is None \
+            else individual.fitness_cached
+        if individual.fitness_method is not None:
+            self.fitness_method = individual.fitness_method
+
+    def __delitem__(self, i):
+        """ Removes the individual (or individuals) from the population.
+
+        The rows after them are moved to fill the gap.
+
+        :param i: The index (or slice) of the individuals to delete.
+        """
+        indices = range(len(self))[i]
+        if isinstance(indices, int):
+            indices = range(indices, indices + 1)
+        elif indices.step != 1:
+            for j in sorted(indices, reverse=True):
+                del self[j]
+            return
+        if not indices:
+            return
+        start, stop = indices.start, indices.stop
+        tail = (len(self) - stop) * self.row_size
+        if tail:
+            self.mmap.move(
+                start * self.row_size,
+                stop * self.row_size,
+                tail,
+            )
+        del self.fitnesses[start:stop]
+
+    def insert(self, i, individual):
+        """ Adds a new individual in the ith position of the population.
+
+        The rows from i on are moved to make room for it, and the file grows
+        (doubling its capacity) if needed.
+
+        :param i: The position where insert the individual.
+        :param individual: The individual to be inserted in the population.
+        """
+        n = len(self)
+        i = min(max(i + n if i < 0 else i, 0), n)
+        if n == self.__capacity:
+            self.__grow(2 * self.__capacity)
+        if i < n:
+            self.mmap.move(
+                (i + 1) * self.row_size,
+                i * self.row_size,
+                (n - i) * self.row_size,
+            )
+        self.fitnesses.insert(i, math.nan)
+        self[i] = individual
+
+    def __grow(self, capacity):
+        """ Makes room in the file for the given number of rows. """
+        self.__capacity = capacity
+        size = max(1, capacity * self.row_size)
+        try:
+            self.mmap.resize(size)
+        except SystemError:
+            # Maps can't be resized in some platforms (e.g. without mremap)
+            self.mmap.close()
+            self.file.truncate(size)
+            self.mmap = mmap.mmap(self.file.fileno(), 0)
+
+    def __slice(self, i):
+        return slice(i * self.row_size, (i + 1) * self.row_size)
+
+    def __pack(self, individual):
+        """ The bytes of the genes of the individual, as stored in a row. """
+        if len(individual) != self.length:
+            raise InvalidSize(self.length, len(individual))
+        genes = getattr(individual, 'genes', individual)
+        if isinstance(genes, memoryview):
+            with genes:
+                return self.__pack(genes.tolist())
+        elif isinstance(genes, array) and genes.typecode == self.typecode:
+            return genes.tobytes()
+        return array(self.typecode, genes).tobytes()
@@ -0,0 +1,135 @@
+""" Cheap models to predict the fitness of individuals before evaluating them.
+
+When the fitness is expensive, a genetic algorithm may breed more offspring
+than it needs and evaluate only the most promising ones according to a
+surrogate, a model trained with the individuals already evaluated.
+"""
+import collections
+import heapq
+import math
+from abc import ABCMeta, abstractmethod
+
+
+class Surrogate(metaclass=ABCMeta):
+    """ A model of the fitness function trained from evaluated individuals. """
+
+    @abstractmethod
+    def update(self, individuals):
+        """ Trains the model with more evaluated individuals.
+
+        :param individuals: A sequence of individuals with their fitness
+            cached.
+        """
+
+    @abstractmethod
+    def predict(self, individual):
+        """ Predicts the fitness of an individual.
+
+        :param individual: The individual whose fitness to predict.
+        :return: A float value, the higher the better.
+        """
+
+
+class NearestNeighbours(Surrogate):
+    """ Predicts the fitness as the weighted mean of the nearest neighbours.
+
+    The model keeps an archive with the features and fitness of the last
+    individuals it was trained with. The prediction for an individual is the
+    mean of the fitness of its k nearest individuals in the archive (by
+    euclidean distance), weighted by the inverse of their distance.
+    """
+
+    def __init__(self, k=5, archive_size=500, features=tuple):
+        """ Initializes this surrogate.
+
+        :param k: The number of neighbours to use in each prediction. Defaults
+            to 5.
+        :param archive_size: The maximum number of individuals to remember.
+            When exceeded, the oldest ones are forgotten. Defaults to 500.
+        :param features: A function that returns the numeric vector of features
+            of an individual. Defaults to tuple, i.e. the genes of list
+            individuals.
+        """
+        self.k = k
+        self.archive_size = archive_size
+        self.features = features
+        self.archive = collections.deque(maxlen=archive_size)
+
+    def update(self, individuals):
+        """ Adds the individuals to the archive.
+
+        :param individuals: A sequence of individuals with their fitness
+            cached.
+        """
+        self.archive.extend(
+            (self.features(individual), individual.fitness_cached)
+            for individual in individuals
+            if individual.fitness_cached is not None
+        )
+
+    def predict(self, individual):
+        """ Predicts the fitness of an individual.
+
+        :param individual: The individual whose fitness to predict.
+        :return: The predicted fitness, or NaN if the archive is empty.
+        """
+        features = self.features(individual)
+        neighbours = heapq.nsmallest(
+            self.k,
+            (
+                (
+                    math.fsum((a - b) ** 2 for a, b in zip(features, other)),
+                    fitness,
+                )
+                for other, fitness in self.archive
+            ),
+            key=lambda neighbour: neighbour[0],
+        )
+        if not neighbours:
+            return math.nan
+        elif neighbours[0][0] == 0:
+            return neighbours[0][1]
+        else:
+            weights = [1 / math.sqrt(distance) for distance, _ in neighbours]
+            return math.fsum(
+                w * fitness for w, (_, fitness) in zip(weights, neighbours)
+            ) / math.fsum(weights)
+
+
+def rank_correlation(xs, ys):
+    """ Spearman's rank correlation coefficient of two sequences of values.
+
+    Tied values get the mean of the ranks they span.
+
+    :param xs: A sequence of values.
+    :param ys: A sequence of values of the same length.
+    :return: A value between -1 and 1, or NaN if there are less than two values
+        or any of the sequences is constant.
+    """
+    rx, ry = _ranks(xs), _ranks(ys)
+    n = len(rx)
+    if n < 2:
+        return math.nan
+    mean = (n + 1) / 2
+    covariance = math.fsum((a - mean) * (b - mean) for a, b in zip(rx, ry))
+    deviation = math.sqrt(
+        math.fsum((a - mean) ** 2 for a in rx) *
+        math.fsum((b - mean) ** 2 for b in ry)
+    )
+    return covariance / deviation if deviation else math.nan
+
+
+def _ranks(values):
+    """ The ranks (starting at 1) of the values, averaging the ties. """
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and \
+                values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
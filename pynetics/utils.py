@@ -1,15 +1,155 @@
+import functools
+import math
+import operator
 import random
 
+_MASK64 = (1 << 64) - 1
 
-def take_chances(probability=0.5):
+
+class RandomGenerator(random.Random):
+    """ A random number generator able to spawn independent streams.
+
+    It can be used anywhere a random.Random instance is expected. Each genetic
+    algorithm owns one, so runs in the same process don't share the global
+    generator and are reproducible given their seed.
+    """
+
+    def __init__(self, seed=None):
+        """ Initializes the generator.
+
+        :param seed: The seed of the generator. If None, the current time or an
+            operating system source of randomness is used. Defaults to None.
+        """
+        super().__init__(seed)
+        self.__numpy = None
+
+    def spawn(self, n):
+        """ Creates independent child generators.
+
+        The children are seeded from this generator, so they are reproducible
+        given the seed of this one. They are useful to give each worker or
+        island of a run its own stream.
+
+        :param n: The number of generators to create.
+        :return: A list of n RandomGenerator instances.
+        """
+        return [RandomGenerator(self.getrandbits(128)) for _ in range(n)]
+
+    @property
+    def numpy(self):
+        """ A NumPy Generator seeded from this generator.
+
+        It's created the first time is accessed, and requires NumPy installed.
+        Its state is part of the state of this generator (see "getstate"), so
+        it's saved and restored with it (e.g. in checkpoints).
+        """
+        if self.__numpy is None:
+            import numpy
+            self.__numpy = numpy.random.default_rng(self.getrandbits(128))
+        return self.__numpy
+
+    def getstate(self):
+        """ The state of this generator and of its NumPy Generator, if any.
+
+        :return: An object to restore the state with "setstate".
+        """
+        numpy_state = None
+        if self.__numpy is not None:
+            numpy_state = self.__numpy.bit_generator.state
+        return super().getstate(), numpy_state
+
+    def setstate(self, state):
+        """ Restores the state returned by "getstate".
+
+        :param state: The state of this generator and of its NumPy Generator.
+        """
+        state, numpy_state = state
+        super().setstate(state)
+        self.__numpy = None
+        if numpy_state is not None:
+            import numpy
+            self.__numpy = numpy.random.default_rng()
+            self.__numpy.bit_generator.state = numpy_state
+
+
+def take_chances(probability=0.5, rng=random):
     """ Given a probability, the method generates a random value to see if is
         lower or not than that probability.
 
     :param probability: The value of the probability to beat. Default is 0.5.
+    :param rng: The random number generator to use. Defaults to the random
+        module.
     :return: A value of True if the value geneated is bellow the probability
         specified, and false otherwise.
     """
-    return random.random() < probability
+    return rng.random() < probability
+
+
+def sparse_positions(length, probability, rng=random):
+    """ Selects each position of a sequence with the given probability.
+
+    It gives the same result as calling "take_chances" for each position, but
+    the positions are sampled directly by jumping over the gaps between them,
+    which follow a geometric distribution. This way the cost is proportional to
+    the number of positions selected instead of to the length (e.g. 10^5 genes
+    mutated with probability 10^-5 need a single random number on average).
+
+    :param length: The length of the sequence.
+    :param probability: The probability of each position to be selected.
+    :param rng: The random number generator to use. Defaults to the random
+        module.
+    :return: A list with the selected positions in increasing order.
+    """
+    if probability <= 0:
+        return []
+    elif probability >= 1:
+        return list(range(length))
+    log_q = math.log1p(-probability)
+    positions = []
+    position = -1
+    while True:
+        position += 1 + int(math.log(1. - rng.random()) / log_q)
+        if position >= length:
+            return positions
+        positions.append(position)
+
+
+def bind_rng(operator, rng):
+    """ Makes an operator use the given random number generator.
+
+    The operators are those objects with an attribute "rng" (e.g. instances of
+    Selection, Mutation, SpawningPool, Alleles...). The operators held by the
+    operator (e.g. the alleles of a spawning pool), also in lists, tuples, sets
+    or dicts, are also bound. Objects without the attribute (e.g. plain
+    functions) are left untouched.
+
+    The operator itself is bound, not a copy, so an operator shared between
+    algorithms uses the generator of the last one bound. Algorithms meant to
+    be reproducible must not share operators.
+
+    :param operator: The operator.
+    :param rng: The random number generator.
+    """
+    _bind_rng(operator, rng, set())
+
+
+def _bind_rng(operator, rng, seen):
+    # Objects are visited once, so cycles (e.g. a spawning pool and its
+    # population) don't recurse forever
+    if id(operator) in seen or isinstance(operator, type):
+        return
+    seen.add(id(operator))
+    if type(operator) in (list, tuple, set, frozenset):
+        values = operator
+    elif type(operator) is dict:
+        values = operator.values()
+    elif hasattr(operator, 'rng'):
+        operator.rng = rng
+        values = getattr(operator, '__dict__', {}).values()
+    else:
+        return
+    for value in values:
+        _bind_rng(value, rng, seen)
 
 
 def clone_empty(obj):
@@ -25,3 +165,55 @@ def clone_empty(obj):
     empty = Empty()
     empty.__class__ = obj.__class__
     return empty
+
+
+def detach(individual):
+    """ Clones an individual apart from its population and fitness method.
+
+    The detached clone can be sent to other processes or machines, as neither
+    the population nor the fitness method (e.g. a lambda) are serialized
+    with it. The cached fitness, if any, is kept.
+
+    :param individual: The individual to detach.
+    :return: A clone of the individual without population nor fitness method.
+    """
+    clone = individual.clone()
+    clone.population = None
+    clone.fitness_method = None
+    clone.fitness_cached = individual.fitness_cached
+    return clone
+
+
+def zobrist_key(locus, gene):
+    """ The 64 bit key of a gene in a locus for genome fingerprints.
+
+    The key is the hash of the pair (locus, gene) scrambled with the finalizer
+    of SplitMix64, so keys look random but are computed on the fly without
+    tables (genes may be real values). Equal genes have the same key, but the
+    keys of strings (and so the fingerprints) change between processes.
+
+    :param locus: The position of the gene.
+    :param gene: The gene. It must be hashable.
+    :return: An integer of 64 bits.
+    """
+    h = hash((locus, gene)) & _MASK64
+    h = (h ^ (h >> 30)) * 0xbf58476d1ce4e5b9 & _MASK64
+    h = (h ^ (h >> 27)) * 0x94d049bb133111eb & _MASK64
+    return h ^ (h >> 31)
+
+
+def fingerprint(genes):
+    """ Computes the Zobrist fingerprint of a sequence of genes.
+
+    The fingerprint is the XOR of the keys of all the genes, so it can be
+    updated in O(1) when a gene changes by XOR-ing the keys of the old and the
+    new genes in that locus.
+
+    :param genes: A sequence of hashable genes.
+    :return: An integer of 64 bits.
+    """
+    return functools.reduce(
+        operator.xor,
+        map(zobrist_key, range(len(genes)), genes),
+        0,
+    )
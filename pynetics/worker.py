@@ -0,0 +1,325 @@
+""" Remote evaluation of individuals over TCP.
+
+A Coordinator instance is used as the fitness of a genetic algorithm. Instead
+of evaluating the individuals by itself, it splits them in batches and sends
+them to the workers connected to it, which evaluate them with a registered
+fitness function and stream the values back. A worker is started with:
+
+    PYNETICS_AUTHKEY=... python -m pynetics.worker HOST:PORT [--import MODULE]
+
+The fitness functions are looked up by name, either in the registry of the
+worker process (see "register") or, if the name is in the form
+"module:function", importing it.
+
+The connections are made with multiprocessing.connection, so workers must
+authenticate with the key of the coordinator before exchanging any message.
+WARNING: individuals and results are sent pickled and unencrypted, and
+unpickling data can run arbitrary code, so anyone knowing the key can run
+code in the coordinator and in the workers. Keep the key secret and use
+the workers only in trusted networks.
+"""
+import argparse
+import importlib
+import os
+import queue
+import secrets
+import threading
+import time
+import traceback
+from multiprocessing.connection import Client, Listener, answer_challenge, \
+    deliver_challenge
+
+from pynetics import Fitness
+from pynetics.exceptions import EvaluationError
+from pynetics.utils import detach
+
+EVALUATE = 'EVALUATE'
+FITNESS = 'FITNESS'
+ERROR = 'ERROR'
+
+AUTHKEY_VARIABLE = 'PYNETICS_AUTHKEY'
+_registry = {}
+
+
+def register(name, fitness):
+    """ Registers a fitness function to be used by the workers of this process.
+
+    :param name: The name the coordinators will use to refer to the function.
+    :param fitness: The fitness function.
+    """
+    _registry[name] = fitness
+
+
+def resolve(name):
+    """ Returns the fitness function registered under the given name.
+
+    If there is no function with that name in the registry but the name has the
+    form "module:function", the module is imported and the function registered.
+
+    :param name: The name of the fitness function.
+    :return: The fitness function.
+    :raises KeyError: If there is no fitness function with that name.
+    """
+    if name not in _registry:
+        module_name, _, attribute = name.partition(':')
+        if not attribute:
+            raise KeyError(name)
+        register(name, getattr(importlib.import_module(module_name), attribute))
+    return _registry[name]
+
+
+def default_authkey():
+    """ The authentication key in the environment variable PYNETICS_AUTHKEY.
+
+    :return: The key as bytes, or None if the variable is not defined.
+    """
+    authkey = os.environ.get(AUTHKEY_VARIABLE)
+    return None if authkey is None else authkey.encode()
+
+
+class _Job:
+    """ The results of an "evaluate_many" call while it's being computed. """
+
+    def __init__(self, size):
+        self.results = [None] * size
+        self.remaining = size
+        self.error = None
+
+
+class Coordinator(Fitness):
+    """ A fitness that delegates the evaluation on remote workers.
+
+    When a worker disconnects in the middle of a batch, the individuals whose
+    fitness was not received yet are sent again to other worker, so the
+    evaluation continues as long as there is at least one worker connected.
+    """
+
+    def __init__(self, fitness, address=('localhost', 0), batch_size=16,
+                 timeout=None, worker_timeout=60., authkey=None):
+        """ Initializes the coordinator and starts listening for workers.
+
+        :param fitness: The name of the fitness function the workers will use
+            to evaluate the individuals.
+        :param address: A tuple (host, port) where to listen for workers. If
+            port is 0, a free port is chosen. Defaults to a free port in
+            localhost.
+        :param batch_size: The maximum number of individuals to be sent to a
+            worker at once. Defaults to 16.
+        :param timeout: The maximum number of seconds to wait for an evaluation
+            to be completed. If None, it will wait forever. Defaults to None.
+        :param worker_timeout: The maximum number of seconds an evaluation
+            waits while there are no workers connected. If None, it will wait
+            forever. Defaults to 60.
+        :param authkey: The key (bytes) the workers must authenticate with. If
+            None, the one in the environment variable PYNETICS_AUTHKEY or, if
+            not defined, a random one made of hexadecimal digits (see the
+            attribute "authkey").
+        """
+        self.fitness = fitness
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.worker_timeout = worker_timeout
+        self.authkey = authkey or default_authkey() or \
+            secrets.token_hex(16).encode()
+        self.workers = 0
+
+        self.__closed = False
+        self.__tasks = queue.Queue()
+        self.__condition = threading.Condition()
+        # The workers are authenticated in their own threads (see "__serve")
+        # so a slow peer doesn't keep the others from connecting
+        self.__listener = Listener(address)
+        self.address = self.__listener.address
+        threading.Thread(target=self.__accept, daemon=True).start()
+
+    def __call__(self, individual):
+        """ Evaluates a single individual remotely. """
+        return self.evaluate_many([individual])[0]
+
+    def evaluate_many(self, individuals):
+        """ Evaluates the individuals in the connected workers.
+
+        :param individuals: A sequence of individuals to evaluate.
+        :return: A list with the fitness of each individual, in order.
+        :raises EvaluationError: If a worker failed evaluating an individual,
+            if the evaluation didn't finish in the specified timeout or if
+            there were no workers connected during the worker timeout.
+        """
+        job = _Job(len(individuals))
+        batch = []
+        for index, individual in enumerate(individuals):
+            batch.append((index, detach(individual)))
+            if len(batch) == self.batch_size:
+                self.__tasks.put((job, batch))
+                batch = []
+        if batch:
+            self.__tasks.put((job, batch))
+
+        deadline = None if self.timeout is None else time.time() + self.timeout
+        alone_since = None
+        with self.__condition:
+            while job.remaining and job.error is None:
+                now = time.time()
+                waits = []
+                if deadline is not None:
+                    if now >= deadline:
+                        job.error = 'Evaluation timed out'
+                        break
+                    waits.append(deadline - now)
+                if self.workers:
+                    alone_since = None
+                elif self.worker_timeout is not None:
+                    alone_since = alone_since or now
+                    if now - alone_since >= self.worker_timeout:
+                        job.error = 'No workers connected'
+                        break
+                    waits.append(alone_since + self.worker_timeout - now)
+                self.__condition.wait(min(waits, default=None))
+        if job.error is not None:
+            raise EvaluationError(job.error)
+        return job.results
+
+    def close(self):
+        """ Stops listening and disconnects all the workers. """
+        self.__closed = True
+        self.__listener.close()
+        with self.__condition:
+            workers = self.workers
+        for _ in range(workers):
+            self.__tasks.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __accept(self):
+        while True:
+            try:
+                connection = self.__listener.accept()
+            except Exception:
+                if self.__closed:
+                    return
+                # A failed connection must not stop accepting the next ones
+                continue
+            threading.Thread(
+                target=self.__serve,
+                args=(connection,),
+                daemon=True,
+            ).start()
+
+    def __serve(self, connection):
+        try:
+            deliver_challenge(connection, self.authkey)
+            answer_challenge(connection, self.authkey)
+        except Exception:
+            # A peer with other key or which dropped the connection (e.g. a
+            # port probe or a worker that crashed while connecting)
+            connection.close()
+            return
+        with self.__condition:
+            self.workers += 1
+            self.__condition.notify_all()
+        try:
+            while True:
+                task = self.__tasks.get()
+                if task is None:
+                    return
+                job, batch = task
+                if job.error is not None:
+                    continue
+                pending = dict(batch)
+                try:
+                    connection.send((EVALUATE, self.fitness, batch))
+                    while pending:
+                        kind, index, value = connection.recv()
+                        pending.pop(index)
+                        with self.__condition:
+                            if kind == ERROR:
+                                job.error = value
+                            else:
+                                job.results[index] = value
+                                job.remaining -= 1
+                            self.__condition.notify_all()
+                except (OSError, EOFError):
+                    # The worker is gone; other worker will finish the batch
+                    if pending:
+                        self.__tasks.put((job, list(pending.items())))
+                    return
+        finally:
+            connection.close()
+            with self.__condition:
+                self.workers -= 1
+                self.__condition.notify_all()
+
+
+class Worker:
+    """ Evaluates the individuals sent by a coordinator. """
+
+    def __init__(self, address, authkey=None):
+        """ Initializes the worker.
+
+        :param address: A tuple (host, port) where the coordinator listens.
+        :param authkey: The key (bytes) of the coordinator. If None, the one in
+            the environment variable PYNETICS_AUTHKEY.
+        :raises ValueError: If no key is given nor defined in the environment.
+        """
+        self.address = address
+        self.authkey = authkey or default_authkey()
+        if self.authkey is None:
+            raise ValueError(
+                'No authentication key given nor defined in {}'.format(
+                    AUTHKEY_VARIABLE
+                )
+            )
+
+    def run(self):
+        """ Evaluates batches until the coordinator closes the connection.
+
+        :raises AuthenticationError: If the key is not the coordinator's one.
+        """
+        with Client(self.address, authkey=self.authkey) as connection:
+            while True:
+                try:
+                    _, name, batch = connection.recv()
+                except (OSError, EOFError):
+                    return
+                for index, individual in batch:
+                    try:
+                        message = FITNESS, index, resolve(name)(individual)
+                    except Exception:
+                        message = ERROR, index, traceback.format_exc()
+                    connection.send(message)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pynetics.worker',
+        description='Evaluates individuals sent by a pynetics coordinator. '
+                    'The key of the coordinator must be in the environment '
+                    'variable {}.'.format(AUTHKEY_VARIABLE),
+    )
+    parser.add_argument('address', help='Coordinator address as HOST:PORT')
+    parser.add_argument(
+        '--import',
+        dest='modules',
+        action='append',
+        default=[],
+        help='Module to import before connecting (e.g. one which registers '
+             'fitness functions). May be specified many times.',
+    )
+    args = parser.parse_args(args)
+    if default_authkey() is None:
+        parser.error('{} is not defined'.format(AUTHKEY_VARIABLE))
+
+    for module in args.modules:
+        importlib.import_module(module)
+    host, _, port = args.address.rpartition(':')
+    Worker((host, int(port))).run()
+
+
+if __name__ == '__main__':
+    # Run the main of the imported module so the functions registered by the
+    # imported modules (in its registry, not in the one of __main__) are found
+    importlib.import_module('pynetics.worker').main()
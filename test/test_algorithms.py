@@ -0,0 +1,261 @@
+from unittest import TestCase
+
+from pynetics import CaseBasedFitness
+from pynetics.algorithms import CellularGA, SimpleGA
+from pynetics.ga_bin import BinaryIndividualSpawningPool, AllGenesCanSwitch
+from pynetics.ga_list import OnePointRecombination
+from pynetics.replacements import HighElitism, LowElitism
+from pynetics.selections import Tournament
+from pynetics.exceptions import WrongValueForInterval
+from pynetics.stop import StepsNum
+from pynetics.storage import MappedPopulation
+from pynetics.surrogates import NearestNeighbours
+from pynetics.utils import RandomGenerator
+from test import utils
+
+
+class RacingOnes(CaseBasedFitness):
+    def __init__(self):
+        super().__init__(range(20), confidence=None)
+
+    def score(self, individual, case):
+        return float(individual[case])
+
+
+def simple_ga(fitness, replacement, lazy_evaluation=False, **kwargs):
+    return SimpleGA(
+        stop_condition=StepsNum(5),
+        population_size=10,
+        spawning_pool=BinaryIndividualSpawningPool(size=20),
+        fitness=fitness,
+        selection=Tournament(2),
+        recombination=OnePointRecombination(),
+        replacement=replacement,
+        replacement_rate=0.4,
+        lazy_evaluation=lazy_evaluation,
+        **kwargs
+    )
+
+
+def cellular_ga(
+        neighbourhood=CellularGA.VON_NEUMANN,
+        rows=5,
+        columns=6,
+        **kwargs
+):
+    return CellularGA(
+        stop_condition=StepsNum(10),
+        rows=rows,
+        columns=columns,
+        spawning_pool=BinaryIndividualSpawningPool(size=20),
+        fitness=utils.ones,
+        recombination=OnePointRecombination(),
+        mutation=AllGenesCanSwitch(),
+        neighbourhood=neighbourhood,
+        p_mutation=0.05,
+        **kwargs
+    )
+
+
+class CellularGATestCase(TestCase):
+    """ Tests for the genetic algorithm with a grid structured population. """
+
+    def test_von_neumann_neighbourhood_wraps_around_the_grid(self):
+        ga = cellular_ga(CellularGA.VON_NEUMANN)
+        self.assertEqual((1, 5, 6, 24), ga.neighbours[0])
+        self.assertTrue(all(len(n) == 4 for n in ga.neighbours))
+
+    def test_moore_neighbourhood_has_eight_cells(self):
+        ga = cellular_ga(CellularGA.MOORE)
+        self.assertEqual((1, 5, 6, 7, 11, 24, 25, 29), ga.neighbours[0])
+        self.assertTrue(all(len(n) == 8 for n in ga.neighbours))
+
+    def test_neighbours_are_not_repeated_in_small_grids(self):
+        ga = cellular_ga(CellularGA.MOORE, rows=1, columns=2)
+        self.assertEqual([(1,), (0,)], ga.neighbours)
+
+    def test_unknown_neighbourhood_is_rejected(self):
+        with self.assertRaises(ValueError):
+            cellular_ga('hexagonal')
+
+    def test_best_fitness_never_decreases_with_elitism(self):
+        ga = cellular_ga()
+        fitnesses = []
+        ga.on_step_end(lambda g: fitnesses.append(g.best().fitness()))
+        ga.run()
+        self.assertEqual(10, len(fitnesses))
+        self.assertEqual(sorted(fitnesses), fitnesses)
+        self.assertEqual(30, len(ga.population))
+
+    def test_cells_are_accessed_through_the_population(self):
+        ga = cellular_ga(population_factory=MappedPopulation)
+        fitnesses = []
+        ga.on_step_end(lambda g: fitnesses.append(g.best().fitness()))
+        ga.run()
+        self.assertFalse(hasattr(ga.population, 'individuals'))
+        self.assertEqual(30, len(ga.population))
+        self.assertEqual(sorted(fitnesses), fitnesses)
+        best = max(ga.population, key=lambda i: i.fitness())
+        self.assertEqual(best.fitness(), ga.best().fitness())
+        self.assertEqual(list(best), list(ga.best()))
+        ga.population.close()
+
+
+class LazyEvaluationTestCase(TestCase):
+    """ Tests for the evaluation of individuals only when needed. """
+
+    def test_eager_evaluation_evaluates_all_the_offspring(self):
+        fitness = utils.CountingOnes()
+        ga = simple_ga(fitness, HighElitism(), lazy_evaluation=False)
+        ga.run()
+        self.assertEqual(10 + 5 * 4, fitness.calls)
+        self.assertEqual(fitness.calls, ga.evaluations)
+        self.assertEqual(0, ga.evaluations_avoided)
+
+    def test_offspring_losing_the_race_is_not_evaluated(self):
+        for replacement in LowElitism(racing=True), HighElitism(racing=True):
+            case_evaluations = []
+            for lazy_evaluation in (False, True):
+                fitness = RacingOnes()
+                ga = simple_ga(
+                    fitness,
+                    replacement,
+                    lazy_evaluation=lazy_evaluation,
+                )
+                ga.rng.seed(1)
+                partial = []
+                ga.on_step_end(
+                    lambda g: partial.append(g.partial_evaluations)
+                )
+                ga.run()
+                self.assertEqual(10 + 5 * 4, ga.evaluations + sum(partial))
+                self.assertEqual(0, ga.evaluations_avoided)
+                case_evaluations.append(fitness.case_evaluations)
+            self.assertTrue(sum(partial) > 0)
+            self.assertEqual(20 * (10 + 5 * 4), case_evaluations[0])
+            self.assertTrue(case_evaluations[1] < case_evaluations[0])
+
+    def test_offspring_discarded_without_racing_is_not_evaluated(self):
+        fitness = utils.CountingOnes()
+        ga = simple_ga(fitness, utils.DummyReplacement(), lazy_evaluation=True)
+        avoided = []
+        ga.on_step_end(lambda g: avoided.append(g.evaluations_avoided))
+        ga.run()
+        self.assertEqual(10, fitness.calls)
+        self.assertEqual(fitness.calls, ga.evaluations)
+        self.assertEqual([4] * 5, avoided)
+        self.assertEqual(0, ga.partial_evaluations)
+
+    def test_offspring_needed_by_the_replacement_is_evaluated(self):
+        for replacement in (LowElitism(), HighElitism()):
+            fitness = utils.CountingOnes()
+            ga = simple_ga(fitness, replacement, lazy_evaluation=True)
+            ga.run()
+            self.assertEqual(10 + 5 * 4, fitness.calls)
+            self.assertEqual(fitness.calls, ga.evaluations)
+            self.assertEqual(0, ga.evaluations_avoided)
+
+
+class DeltaEvaluationTestCase(TestCase):
+    """ Tests for the incremental evaluation of the offspring. """
+
+    def test_offspring_is_evaluated_incrementally(self):
+        fitness = utils.DeltaOnes()
+        ga = simple_ga(fitness, LowElitism(), mutation=AllGenesCanSwitch())
+        ga.run()
+        self.assertEqual(10, fitness.calls)
+        self.assertEqual(5 * 4, fitness.deltas)
+        self.assertEqual(fitness.calls + fitness.deltas, ga.evaluations)
+        for individual in ga.population:
+            self.assertEqual(utils.ones(individual), individual.fitness())
+
+    def test_delta_may_fall_back_on_full_evaluations(self):
+        fitness = utils.DeltaOnes(max_changes=3)
+        ga = simple_ga(fitness, LowElitism(), mutation=AllGenesCanSwitch())
+        ga.run()
+        self.assertTrue(fitness.calls > 10)
+        self.assertEqual(10 + 5 * 4, fitness.calls + fitness.deltas)
+        for individual in ga.population:
+            self.assertEqual(utils.ones(individual), individual.fitness())
+
+
+class SurrogateScreeningTestCase(TestCase):
+    """ Tests for the screening of the offspring with a surrogate model. """
+
+    def test_only_the_kept_offspring_is_evaluated(self):
+        fitness = utils.CountingOnes()
+        ga = simple_ga(
+            fitness,
+            LowElitism(),
+            mutation=AllGenesCanSwitch(),
+            p_mutation=0.5,
+            surrogate=NearestNeighbours(),
+            screening_ratio=0.25,
+        )
+        ga.rng.seed(1)
+        sizes, correlations = [], []
+        ga.on_step_end(lambda g: sizes.append(len(g.population)))
+        ga.on_step_end(lambda g: correlations.append(g.surrogate_correlation))
+        ga.run()
+        self.assertEqual(10 + 5 * 4, fitness.calls)
+        self.assertEqual([10] * 5, sizes)
+        self.assertTrue(all(-1 <= c <= 1 for c in correlations))
+
+    def test_lazily_screened_offspring_is_counted_once(self):
+        fitness = utils.CountingOnes()
+        ga = simple_ga(
+            fitness,
+            LowElitism(),
+            lazy_evaluation=True,
+            surrogate=NearestNeighbours(),
+        )
+        ga.run()
+        self.assertEqual(10 + 5 * 4, fitness.calls)
+        self.assertEqual(fitness.calls, ga.evaluations)
+        self.assertEqual(0, ga.evaluations_avoided)
+
+    def test_surrogate_is_retrained_when_due(self):
+        surrogate = NearestNeighbours()
+        ga = simple_ga(
+            utils.ones,
+            LowElitism(),
+            surrogate=surrogate,
+            retrain_every=2,
+        )
+        ga.run()
+        self.assertEqual(10 + 2 * 2 * 4, len(surrogate.archive))
+
+    def test_screening_ratio_must_be_in_the_interval(self):
+        for ratio in (0, 1.5):
+            with self.assertRaises(WrongValueForInterval):
+                simple_ga(utils.ones, LowElitism(), screening_ratio=ratio)
+
+
+class RandomGeneratorTestCase(TestCase):
+    """ Tests for the random generator owned by each algorithm. """
+
+    def test_runs_with_the_same_seed_are_identical(self):
+        histories = []
+        for _ in range(2):
+            ga = cellular_ga()
+            ga.rng = RandomGenerator(42)
+            ga.run()
+            histories.append([i.genes for i in ga.population])
+        self.assertEqual(histories[0], histories[1])
+
+    def test_interleaved_runs_do_not_share_the_generator(self):
+        ga1, ga2, ga3 = cellular_ga(), cellular_ga(), cellular_ga()
+        for ga in (ga1, ga2, ga3):
+            ga.rng = RandomGenerator(42)
+        ga1.run()
+        # Other algorithms consuming random numbers don't affect ga2
+        ga2.share_rng()
+        ga2.initialize()
+        ga3.run()
+        while not ga2.stop_condition(ga2):
+            ga2.step()
+            ga2.generation += 1
+        self.assertEqual(
+            [i.genes for i in ga1.population],
+            [i.genes for i in ga2.population],
+        )
@@ -34,6 +34,13 @@ class SpawningPoolTestCase(unittest.TestCase):
         with TemporaryFile() as f:
             pickle.dump(utils.DummySpawningPool(), f)
 
+    def test_spawned_individuals_belong_to_its_population(self):
+        spawning_pool = utils.DummySpawningPool()
+        spawning_pool.population = population = object()
+        individuals = spawning_pool.spawn_many(5)
+        self.assertEqual(5, len(individuals))
+        self.assertTrue(all(i.population is population for i in individuals))
+
 
 class TestPopulation(unittest.TestCase):
     """ Test for populations. """
@@ -156,3 +163,48 @@ class CatastropheTestCase(unittest.TestCase):
         """ Checks is pickeable by writing it into a temporary file. """
         with TemporaryFile() as f:
             pickle.dump(utils.DummyCatastrophe(), f)
+
+
+class CaseBasedFitnessTestCase(unittest.TestCase):
+    """ Tests for the fitness computed over a set of cases. """
+
+    def test_fitness_is_the_mean_score(self):
+        fitness = utils.DummyCaseBasedFitness(cases=100)
+        individual, = utils.valued_individuals([.25], fitness)
+        self.assertEqual(.25, individual.fitness())
+        self.assertEqual(100, fitness.case_evaluations)
+
+    def test_beaten_individuals_are_discarded_early(self):
+        fitness = utils.DummyCaseBasedFitness(cases=100)
+        individual, = utils.valued_individuals([.25], fitness)
+        self.assertFalse(individual.beats(.9))
+        self.assertIsNone(individual.fitness_cached)
+        self.assertLess(fitness.case_evaluations, 100)
+
+    def test_winner_individuals_are_completely_evaluated(self):
+        fitness = utils.DummyCaseBasedFitness(cases=100)
+        individual, = utils.valued_individuals([.75], fitness)
+        self.assertTrue(individual.beats(.5))
+        self.assertEqual(.75, individual.fitness_cached)
+        self.assertEqual(100, fitness.case_evaluations)
+
+    def test_certain_races_match_complete_evaluations(self):
+        fitness = utils.DummyCaseBasedFitness(cases=50)
+        values = [i / 10 for i in range(11)]
+        for threshold in values:
+            for individual in utils.valued_individuals(values, fitness):
+                self.assertEqual(
+                    individual.value > threshold,
+                    individual.beats(threshold),
+                )
+
+    def test_confidence_discards_individuals_sooner(self):
+        certain = utils.DummyCaseBasedFitness(cases=1000)
+        confident = utils.DummyCaseBasedFitness(cases=1000, confidence=.99)
+        for fitness in (certain, confident):
+            for individual in utils.valued_individuals([.1] * 10, fitness):
+                self.assertFalse(individual.beats(.5))
+        self.assertLess(
+            confident.case_evaluations * 3,
+            certain.case_evaluations,
+        )
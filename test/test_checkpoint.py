@@ -0,0 +1,126 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from pynetics import checkpoint
+from pynetics.ga_bin import BinaryIndividual
+from pynetics.ga_list import ListIndividual
+from pynetics.surrogates import NearestNeighbours
+from test import utils
+
+
+def list_individuals(genes):
+    individuals = []
+    for i, individual_genes in enumerate(genes):
+        individual = ListIndividual()
+        individual.extend(individual_genes)
+        individual.fitness_cached = None if i % 2 else float(i)
+        individuals.append(individual)
+    return individuals
+
+
+class CheckpointTestCase(TestCase):
+    """ Tests for the save and load of checkpoints. """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.ckpt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assert_roundtrip(self, genes):
+        population = list_individuals(genes)
+        checkpoint.save(self.path, 7, population, population[:1], 'state')
+        state = checkpoint.load(self.path)
+
+        self.assertEqual(7, state.generation)
+        self.assertEqual('state', state.random_state)
+        self.assertEqual(population, state.population)
+        self.assertEqual(
+            [i.fitness_cached for i in population],
+            [i.fitness_cached for i in state.population],
+        )
+        self.assertEqual(population[:1], state.best_individuals)
+        for individual in state.population:
+            self.assertIs(ListIndividual, type(individual))
+
+    def test_integer_genes_are_restored(self):
+        self.assert_roundtrip([[1, -2, 3], [2 ** 40, 5, 6], [7, 8, 9]])
+
+    def test_real_genes_are_restored(self):
+        self.assert_roundtrip([[.5, 1.5], [-2.25, 3.]])
+
+    def test_variable_length_genomes_are_restored(self):
+        self.assert_roundtrip([[1, 2, 3], [], [4]])
+
+    def test_non_numeric_genes_are_restored(self):
+        self.assert_roundtrip([['a', 'b'], ['c', 'd']])
+
+    def test_non_checkpoint_files_are_rejected(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'Definitely not a checkpoint')
+        with self.assertRaises(ValueError):
+            checkpoint.load(self.path)
+
+    def test_truncated_checkpoints_are_rejected(self):
+        population = list_individuals([[1, 2, 3], [4, 5, 6]])
+        checkpoint.save(self.path, 0, population, population[:1], None)
+        size = os.path.getsize(self.path)
+        for length in (4, 20, size // 2, size - 8):
+            with open(self.path, 'rb+') as f:
+                f.truncate(length)
+            with self.assertRaises(ValueError):
+                checkpoint.load(self.path)
+
+    def test_binary_individuals_with_list_genes_are_restored(self):
+        individual = BinaryIndividual()
+        individual.extend([1, 0, 1])
+        self.assertIsInstance(individual.genes, list)
+        checkpoint.save(self.path, 0, [individual], [], None)
+        state = checkpoint.load(self.path)
+        self.assertEqual([[1, 0, 1]], [i.genes for i in state.population])
+
+    def test_no_temporary_files_are_left(self):
+        population = list_individuals([[1, 2], [3, 4]])
+        for _ in range(3):
+            checkpoint.save(self.path, 0, population, [], None)
+        self.assertEqual(['run.ckpt'], os.listdir(self.directory.name))
+
+    def test_resumed_run_continues_like_the_original_one(self):
+        original = utils.genetic_algorithm(steps=8)
+        original.on_step_end(
+            lambda ga: ga.generation == 5 and ga.checkpoint(self.path)
+        )
+        original.run()
+
+        resumed = utils.genetic_algorithm(steps=8)
+        resumed.resume(self.path)
+
+        self.assertEqual(8, resumed.generation)
+        self.assertEqual(original.evaluations, resumed.evaluations)
+        self.assertEqual(
+            [i.fitness() for i in original.best_individuals],
+            [i.fitness() for i in resumed.best_individuals],
+        )
+        self.assertEqual(
+            [i.genes for i in original.population],
+            [i.genes for i in resumed.population],
+        )
+
+    def test_surrogate_is_trained_when_resuming(self):
+        original = utils.genetic_algorithm(5, surrogate=NearestNeighbours())
+        original.on_step_end(
+            lambda ga: ga.generation == 3 and ga.checkpoint(self.path)
+        )
+        original.run()
+
+        resumed = utils.genetic_algorithm(3, surrogate=NearestNeighbours())
+        resumed.resume(self.path)
+
+        self.assertEqual(3, resumed.generation)
+        for individual in resumed.population:
+            self.assertEqual(
+                individual.fitness(),
+                resumed.surrogate.predict(individual),
+            )
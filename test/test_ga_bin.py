@@ -1,9 +1,18 @@
 import pickle
+import random
 from tempfile import TemporaryFile
 from unittest import TestCase
 
-from pynetics.ga_bin import BinaryIndividualSpawningPool
-from pynetics.ga_bin import GeneralizedRecombination
+from array import array
+
+from pynetics.ga_bin import BinaryIndividualSpawningPool, BinaryIndividual
+from pynetics.exceptions import InvalidSize
+from pynetics.ga_bin import GeneralizedRecombination, AllGenesCanSwitch, \
+    pack_bits, unpack_bits, binary_to_gray, gray_to_binary, BinaryDecoder
+from pynetics.ga_list import ListIndividual, CutAndSpliceRecombination, \
+    GeneDeletion, MessyRecombination
+from pynetics.utils import fingerprint
+from test import utils
 
 
 class BinaryIndividualSpawningPoolTestCase(TestCase):
@@ -14,9 +23,280 @@ class BinaryIndividualSpawningPoolTestCase(TestCase):
         with TemporaryFile() as f:
             pickle.dump(BinaryIndividualSpawningPool(10), f)
 
+    def test_many_individuals_are_created_at_once(self):
+        individuals = BinaryIndividualSpawningPool(100).create_many(50)
+        self.assertEqual(50, len(individuals))
+        for individual in individuals:
+            self.assertEqual(100, len(individual))
+            self.assertTrue(set(individual) <= {0, 1})
+        ones = sum(sum(individual) for individual in individuals)
+        self.assertAlmostEqual(0.5, ones / 5000, delta=0.05)
+        self.assertNotEqual(individuals[0].genes, individuals[1].genes)
+
+
+class BinaryIndividualTestCase(TestCase):
+    """ Tests for the fingerprints of binary individuals. """
+
+    def test_fingerprint_is_updated_when_a_gene_is_set(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        individual.fingerprint()
+        clone = individual.clone()
+        for i in range(-30, 30):
+            clone[i] = 1 - clone[i]
+            self.assertIsNotNone(clone.fingerprint_cached)
+            self.assertEqual(fingerprint(clone.genes), clone.fingerprint())
+        self.assertEqual(individual.fingerprint(), clone.fingerprint())
+
+    def test_fingerprint_is_discarded_when_genes_are_replaced(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        individual.fingerprint()
+        individual.genes = array('B', [0] * 30)
+        self.assertIsNone(individual.fingerprint_cached)
+        self.assertEqual(fingerprint([0] * 30), individual.fingerprint())
+
+    def test_individuals_are_equal_when_genes_are_equal(self):
+        spawning_pool = BinaryIndividualSpawningPool(4)
+        individuals = spawning_pool.create_many(100)
+        unique = set(individuals)
+        self.assertEqual(
+            len({tuple(i.genes) for i in individuals}),
+            len(unique),
+        )
+        list_individual = ListIndividual()
+        list_individual.extend(individuals[0].genes)
+        self.assertEqual(individuals[0], list_individual)
+        self.assertEqual(hash(individuals[0]), hash(list_individual))
+
+    def test_fingerprint_is_not_pickled(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        individual.fingerprint()
+        clone = pickle.loads(pickle.dumps(individual))
+        self.assertIsNone(clone.fingerprint_cached)
+        self.assertEqual(individual, clone)
+
+
+class VariableLengthBinaryIndividualsTestCase(TestCase):
+    """ Tests for binary individuals whose length may change. """
+
+    def test_individuals_are_created_with_sizes_in_the_range(self):
+        spawning_pool = BinaryIndividualSpawningPool(5, max_size=8)
+        individuals = spawning_pool.create_many(200)
+        self.assertEqual({5, 6, 7, 8}, {len(i) for i in individuals})
+
+    def test_genes_are_deleted_by_position(self):
+        individual = BinaryIndividualSpawningPool(3).create()
+        individual.genes = array('B', [1, 1, 0])
+        clone = individual.clone()
+        del clone[0]
+        self.assertEqual([1, 0], list(clone.genes))
+        self.assertEqual([1, 1, 0], list(individual.genes))
+        deleted = GeneDeletion()(individual, p=1)
+        self.assertEqual(2, len(deleted))
+
+    def test_cut_and_splice_recombines_binary_individuals(self):
+        spawning_pool = BinaryIndividualSpawningPool(1, max_size=20)
+        recombination = CutAndSpliceRecombination()
+        for _ in range(20):
+            parents = spawning_pool.create_many(2)
+            children = recombination(*parents)
+            self.assertEqual(
+                sorted(parents[0].genes + parents[1].genes),
+                sorted(children[0].genes + children[1].genes),
+            )
+
+    def test_binary_individuals_with_mixed_genes_are_spliced(self):
+        spawning_pool = BinaryIndividualSpawningPool(6, max_size=12)
+        recombinations = (
+            CutAndSpliceRecombination(),
+            MessyRecombination(p_cut=0.5, p_splice=0.5),
+        )
+        for recombination in recombinations:
+            for _ in range(20):
+                parent = spawning_pool.create()
+                other = BinaryIndividual()
+                other.extend([1, 0, 1, 1, 0])
+                parents = [parent, other]
+                children = recombination(*parents)
+                self.assertEqual(
+                    sorted(list(parent.genes) + list(other.genes)),
+                    sorted(g for c in children for g in c.genes),
+                )
+                for child in children:
+                    self.assertIsInstance(child, BinaryIndividual)
+                    self.assertIn(
+                        type(child.genes), {type(p.genes) for p in parents}
+                    )
+
+
+class CopyOnWriteTestCase(TestCase):
+    """ Tests for the genes shared between binary individuals and clones. """
+
+    def test_clones_share_the_genes_until_written(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        clone = individual.clone()
+        self.assertIs(individual.genes, clone.genes)
+        clone[0] = 1 - clone[0]
+        self.assertIsNot(individual.genes, clone.genes)
+        self.assertNotEqual(individual[0], clone[0])
+        self.assertEqual(individual[1:], clone[1:])
+
+    def test_writing_the_cloned_individual_leaves_clones_untouched(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        genes = list(individual.genes)
+        clones = [individual.clone() for _ in range(3)]
+        for i in range(30):
+            individual[i] = 1 - individual[i]
+        for clone in clones:
+            self.assertEqual(genes, list(clone.genes))
+
+    def test_fingerprint_is_kept_when_genes_are_copied(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        individual.fingerprint()
+        clone = individual.clone()
+        clone[5] = 1 - clone[5]
+        self.assertIsNotNone(individual.fingerprint_cached)
+        self.assertIsNotNone(clone.fingerprint_cached)
+        self.assertEqual(fingerprint(clone.genes), clone.fingerprint())
+
+    def test_pickled_clones_keep_sharing_their_genes_safely(self):
+        individual = BinaryIndividualSpawningPool(30).create()
+        individual, clone = pickle.loads(
+            pickle.dumps((individual, individual.clone()))
+        )
+        genes = list(individual.genes)
+        clone[0] = 1 - clone[0]
+        self.assertEqual(genes, list(individual.genes))
+
 
 class GeneralizedRecombinationTestCase(TestCase):
     def test_class_is_pickeable(self):
         """ Checks if it's pickeable by writing it into a temporary file. """
         with TemporaryFile() as f:
             pickle.dump(GeneralizedRecombination(), f)
+
+    def test_children_are_in_the_range_of_the_parents(self):
+        recombination = GeneralizedRecombination()
+        for size in (1, 7, 64, 1000):
+            parents = BinaryIndividualSpawningPool(size).create_many(2)
+            x, y = (pack_bits(parent.genes) for parent in parents)
+            for _ in range(10):
+                child1, child2 = recombination(*parents)
+                c, d = pack_bits(child1.genes), pack_bits(child2.genes)
+                self.assertTrue(x & y <= c <= x | y)
+                self.assertEqual(x + y, c + d)
+                self.assertEqual(size, len(child1))
+                self.assertEqual('B', child1.genes.typecode)
+
+    def test_list_individuals_are_recombined(self):
+        parent1, parent2 = ListIndividual(), ListIndividual()
+        parent1.extend([0, 0, 1, 1])
+        parent2.extend([0, 1, 0, 1])
+        for _ in range(10):
+            child1, child2 = GeneralizedRecombination()(parent1, parent2)
+            self.assertEqual(0, child1[0])
+            self.assertEqual(8, pack_bits(child1) + pack_bits(child2))
+
+
+class PackBitsTestCase(TestCase):
+    """ Tests for the conversions between bits and integers. """
+
+    def test_genes_are_the_binary_digits_of_the_integer(self):
+        self.assertEqual(0b1011, pack_bits([1, 0, 1, 1]))
+        self.assertEqual(0b0011, pack_bits(array('B', [0, 0, 1, 1])))
+        self.assertEqual(bytes([0, 1, 0, 1]), unpack_bits(0b101, 4))
+        self.assertEqual(0, pack_bits([]))
+
+    def test_unpacking_is_the_inverse_of_packing(self):
+        for size in (1, 2, 3, 8, 9, 63, 64, 65, 1000, 1025):
+            genes = bytes(random.getrandbits(1) for _ in range(size))
+            value = pack_bits(genes)
+            self.assertEqual(int(''.join(map(str, genes)), 2), value)
+            self.assertEqual(genes, unpack_bits(value, size))
+
+
+class AllGenesCanSwitchTestCase(TestCase):
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(AllGenesCanSwitch(), f)
+
+    def test_genes_switch_with_the_probability(self):
+        spawning_pool = BinaryIndividualSpawningPool(1000)
+        for p, switched in ((0, 0), (1, 1000)):
+            individual = spawning_pool.create()
+            genes = individual.genes[:]
+            AllGenesCanSwitch()(individual, p)
+            self.assertEqual(
+                switched,
+                sum(a != b for a, b in zip(genes, individual.genes)),
+            )
+
+    def test_mutated_individuals_are_evaluated_again(self):
+        individual = BinaryIndividualSpawningPool(10).create()
+        individual.fitness_method = lambda i: float(sum(i))
+        for j in range(len(individual)):
+            individual[j] = 0
+        self.assertEqual(0., individual.fitness())
+        AllGenesCanSwitch()(individual, 1)
+        self.assertEqual(10., individual.fitness())
+
+
+    def test_unrecorded_changes_are_not_evaluated_incrementally(self):
+        individual = BinaryIndividualSpawningPool(10).create()
+        individual.fitness_method = utils.DeltaOnes()
+        individual.fitness()
+        clone = individual.clone()
+        clone.record_changes(individual, ())
+        mutated = AllGenesCanSwitch()(clone, 0.5)
+        mutated.fitness()
+        mutated[0] = 1 - mutated[0]
+        self.assertEqual(utils.ones(mutated), mutated.fitness())
+        self.assertEqual(1, individual.fitness_method.deltas)
+
+
+class BinaryDecoderTestCase(TestCase):
+    """ Tests for the decoding of binary genes into numeric values. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(BinaryDecoder([3, (4, 0., 1.)], gray=True), f)
+
+    def test_gray_codes_differ_in_one_bit_between_consecutive_values(self):
+        for value in range(1000):
+            gray = binary_to_gray(value)
+            self.assertEqual(value, gray_to_binary(gray))
+            next_gray = binary_to_gray(value + 1)
+            self.assertEqual(1, bin(gray ^ next_gray).count('1'))
+
+    def test_fields_are_decoded_as_integers_and_reals(self):
+        decoder = BinaryDecoder([3, (4, -1., 2.), 1])
+        self.assertEqual(8, decoder.size)
+        self.assertEqual([5, -1., 1], decoder([1, 0, 1, 0, 0, 0, 0, 1]))
+        self.assertEqual([0, 2., 0], decoder([0, 0, 0, 1, 1, 1, 1, 0]))
+        self.assertEqual([7, 0., 0], decoder([1, 1, 1, 0, 1, 0, 1, 0]))
+
+    def test_gray_coded_fields_are_decoded(self):
+        decoder = BinaryDecoder([3, 3], gray=True)
+        self.assertEqual([2, 7], decoder([0, 1, 1, 1, 0, 0]))
+
+    def test_encoding_is_the_inverse_of_decoding(self):
+        for gray in (False, True):
+            decoder = BinaryDecoder([5, (10, -5., 5.), 1, (3, 0., 7.)], gray)
+            for _ in range(20):
+                genes = bytes(random.getrandbits(1) for _ in range(19))
+                self.assertEqual(genes, decoder.encode(decoder(genes)))
+
+    def test_population_is_decoded_at_once(self):
+        decoder = BinaryDecoder([(7, 0., 1.), 6, (2, -1., 1.)], gray=True)
+        individuals = BinaryIndividualSpawningPool(15).create_many(50)
+        self.assertEqual(
+            [decoder(individual) for individual in individuals],
+            decoder.decode_many(individuals),
+        )
+        self.assertEqual([], decoder.decode_many([]))
+
+    def test_individuals_must_have_the_size_of_the_fields(self):
+        decoder = BinaryDecoder([3, 3])
+        with self.assertRaises(InvalidSize):
+            decoder.decode_many(BinaryIndividualSpawningPool(7).create_many(2))
@@ -1,13 +1,22 @@
+import os
 import pickle
+import random
+import subprocess
+import sys
+from array import array
 from unittest import TestCase
 
 from tempfile import TemporaryFile
 
 from pynetics import PyneticsError
+from pynetics.ga_bin import BinaryIndividualSpawningPool
 from pynetics.ga_list import FiniteSetAlleles, ListIndividualSpawningPool, \
     ListIndividual, ListRecombination, OnePointRecombination, \
     TwoPointRecombination, RandomMaskRecombination, SwapGenes, \
-    SingleGeneRandomValue
+    SingleGeneRandomValue, NGeneRandomValue, CutAndSpliceRecombination, \
+    MessyRecombination, GeneInsertion, GeneDeletion, VariableLengthHamming, \
+    LengthPenalty
+from pynetics.utils import fingerprint
 from test import utils
 
 
@@ -44,6 +53,68 @@ class FiniteSetAllelesTestCase(TestCase):
         for i in range(1000):
             self.assertIn(alleles.get(), sequence)
 
+    def test_many_values_belong_to_the_sequence(self):
+        for sequence in ([1, 2, 3], 'ACTG', range(-5, 300), [0.5, 'a', None]):
+            alleles = FiniteSetAlleles(sequence)
+            values = alleles.get_many(1000)
+            self.assertEqual(1000, len(values))
+            self.assertTrue(set(values) <= set(sequence))
+
+    def test_many_values_are_uniformly_distributed(self):
+        alleles = FiniteSetAlleles(range(5))
+        alleles.rng = random.Random(1)
+        values = alleles.get_many(50000)
+        for symbol in range(5):
+            self.assertAlmostEqual(
+                0.2,
+                values.count(symbol) / 50000,
+                delta=0.01,
+            )
+
+    def test_many_values_are_reproducible(self):
+        alleles = FiniteSetAlleles('ACTG')
+        alleles.rng = random.Random(1)
+        values = alleles.get_many(100)
+        alleles.rng = random.Random(1)
+        self.assertEqual(values, alleles.get_many(100))
+
+    def test_symbols_keep_the_given_order(self):
+        alleles = FiniteSetAlleles('ACTGACTGTGCA')
+        self.assertEqual(('A', 'C', 'T', 'G'), alleles.table)
+
+    def test_values_do_not_depend_on_the_hashes_of_the_process(self):
+        script = (
+            'import random\n'
+            'from pynetics.ga_list import FiniteSetAlleles\n'
+            'alleles = FiniteSetAlleles(["ab", "cd", "ef", "gh"])\n'
+            'alleles.rng = random.Random(1)\n'
+            'print(alleles.get_many(20), alleles.get())\n'
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        outputs = {
+            subprocess.check_output(
+                [sys.executable, '-c', script],
+                env=dict(os.environ, PYTHONHASHSEED=seed, PYTHONPATH=root),
+            )
+            for seed in ('1', '2', '3')
+        }
+        self.assertEqual(1, len(outputs))
+
+    def test_other_values_are_uniformly_distributed(self):
+        alleles = FiniteSetAlleles('ACTG')
+        alleles.rng = random.Random(1)
+        values = [alleles.get_other('C') for _ in range(30000)]
+        self.assertNotIn('C', values)
+        for symbol in 'ATG':
+            self.assertAlmostEqual(
+                1 / 3,
+                values.count(symbol) / 30000,
+                delta=0.01,
+            )
+
+    def test_other_value_of_a_single_symbol_is_itself(self):
+        self.assertEqual('A', FiniteSetAlleles('A').get_other('A'))
+
     def test_alleles_maintains_a_list_of_no_duplicated_values(self):
         """ The values in the maintained without duplicated values. """
         values = 'ACTGACTGTGCA'
@@ -87,6 +158,15 @@ class ListIndividualSpawningPoolTestCase(TestCase):
                 for g in individual:
                     self.assertIn(g, symbols)
 
+    def test_many_individuals_are_created_at_once(self):
+        spawning_pool = ListIndividualSpawningPool(10, FiniteSetAlleles('AB'))
+        individuals = spawning_pool.create_many(20)
+        self.assertEqual(20, len(individuals))
+        for individual in individuals:
+            self.assertIsInstance(individual, ListIndividual)
+            self.assertEqual(10, len(individual))
+            self.assertTrue(set(individual) <= {'A', 'B'})
+
 
 # Maybe instead inherit from list is better inherit from mutablesequence
 class ListIndividualTestCase(TestCase):
@@ -126,6 +206,60 @@ class ListIndividualTestCase(TestCase):
         self.assertEquals(i1, i2)
         self.assertIsNot(i1, i2)
 
+    def test_fingerprint_is_updated_when_a_gene_is_set(self):
+        alleles = FiniteSetAlleles('abc')
+        individual = ListIndividualSpawningPool(30, alleles).create()
+        individual.fingerprint()
+        for i in range(-30, 30):
+            individual[i] = alleles.get_other(individual[i])
+            self.assertIsNotNone(individual.fingerprint_cached)
+            self.assertEqual(fingerprint(individual), individual.fingerprint())
+
+    def test_fingerprint_is_discarded_by_other_modifications(self):
+        individual = ListIndividual()
+        individual.extend('abc')
+        for modify in (
+                lambda i: i.__setitem__(slice(1, None), 'xy'),
+                lambda i: i.append('z'),
+                lambda i: i.insert(0, 'z'),
+                lambda i: i.pop(),
+                lambda i: i.reverse(),
+        ):
+            individual.fingerprint()
+            modify(individual)
+            self.assertIsNone(individual.fingerprint_cached)
+            self.assertEqual(fingerprint(individual), individual.fingerprint())
+
+    def test_fitness_is_discarded_by_modifications(self):
+        individual = ListIndividual()
+        individual.fitness_method = len
+        for modify in (
+                lambda i: i.extend('abc'),
+                lambda i: i.__setitem__(0, 'x'),
+                lambda i: i.__setitem__(slice(1, None), 'xyz'),
+                lambda i: i.pop(),
+        ):
+            individual.fitness()
+            modify(individual)
+            self.assertIsNone(individual.fitness_cached)
+            self.assertEqual(len(individual), individual.fitness())
+
+    def test_equal_individuals_are_deduplicated_in_sets(self):
+        alleles = FiniteSetAlleles((0, 1))
+        individuals = ListIndividualSpawningPool(4, alleles).create_many(100)
+        unique = set(individuals)
+        self.assertEqual(len({tuple(i) for i in individuals}), len(unique))
+        for individual in individuals:
+            self.assertIn(individual.clone(), unique)
+
+    def test_fingerprint_is_not_pickled(self):
+        individual = ListIndividual()
+        individual.extend('abc')
+        individual.fingerprint()
+        clone = pickle.loads(pickle.dumps(individual))
+        self.assertIsNone(clone.fingerprint_cached)
+        self.assertEqual(individual, clone)
+
 
 class FixedLengthListRecombinationTestCase(TestCase):
     """ Behavior for recombinations where lengths should be the same. """
@@ -160,6 +294,25 @@ class FixedLengthListRecombinationTestCase(TestCase):
                 self.assertIsNot(parent, child)
 
 
+def list_parents(size=20):
+    parent1, parent2 = ListIndividual(), ListIndividual()
+    parent1.extend('a' * size)
+    parent2.extend('b' * size)
+    return parent1, parent2
+
+
+def binary_parents(size=20):
+    spawning_pool = BinaryIndividualSpawningPool(size)
+    parent1, parent2 = spawning_pool.create(), spawning_pool.create()
+    parent1.genes = array('B', [0] * size)
+    parent2.genes = array('B', [1] * size)
+    return parent1, parent2
+
+
+def chromosome(individual):
+    return ''.join(str(gene) for gene in individual)
+
+
 class OnePointRecombinationTestCase(TestCase):
     def test_class_is_pickeable(self):
         """ Checks if it's pickeable by writing it into a temporary file. """
@@ -180,6 +333,16 @@ class OnePointRecombinationTestCase(TestCase):
         self.assertEquals(len(parents[0]), len(progeny[0]))
         self.assertEquals(len(parents[1]), len(progeny[1]))
 
+    def test_children_swap_the_tails_of_the_parents(self):
+        for parents in (list_parents(), binary_parents()):
+            x, y = (str(parent[0]) for parent in parents)
+            recombination = OnePointRecombination()
+            for child1, child2 in recombination.recombine_many([parents] * 50):
+                p = chromosome(child1).index(y)
+                self.assertTrue(1 <= p < 20)
+                self.assertEqual(x * p + y * (20 - p), chromosome(child1))
+                self.assertEqual(y * p + x * (20 - p), chromosome(child2))
+
 
 class TwoPointRecombinationTestCase(TestCase):
     def test_class_is_pickeable(self):
@@ -201,6 +364,27 @@ class TwoPointRecombinationTestCase(TestCase):
         self.assertEquals(len(parents[0]), len(progeny[0]))
         self.assertEquals(len(parents[1]), len(progeny[1]))
 
+    def test_children_keep_the_middle_of_the_parents(self):
+        for parents in (list_parents(), binary_parents()):
+            x, y = (str(parent[0]) for parent in parents)
+            recombination = TwoPointRecombination()
+            for child1, child2 in recombination.recombine_many([parents] * 50):
+                # Contiguous pivots leave no middle to keep
+                p = chromosome(child1).find(x)
+                q = chromosome(child1).rfind(x) + 1
+                if p == -1:
+                    p = q = 0
+                else:
+                    self.assertTrue(1 <= p < q < 20)
+                self.assertEqual(
+                    y * p + x * (q - p) + y * (20 - q),
+                    chromosome(child1),
+                )
+                self.assertEqual(
+                    x * p + y * (q - p) + x * (20 - q),
+                    chromosome(child2),
+                )
+
 
 class RandomMaskRecombinationTestCase(TestCase):
     def test_class_is_pickeable(self):
@@ -222,6 +406,18 @@ class RandomMaskRecombinationTestCase(TestCase):
         self.assertEquals(len(parents[0]), len(progeny[0]))
         self.assertEquals(len(parents[1]), len(progeny[1]))
 
+    def test_children_are_complementary_and_balanced(self):
+        for parents in (list_parents(), binary_parents()):
+            x, y = (str(parent[0]) for parent in parents)
+            recombination = RandomMaskRecombination()
+            recombination.rng = random.Random(1)
+            swapped = 0
+            for child1, child2 in recombination.recombine_many([parents] * 50):
+                for gene1, gene2 in zip(chromosome(child1), chromosome(child2)):
+                    self.assertEqual({x, y}, {gene1, gene2})
+                swapped += chromosome(child1).count(y)
+            self.assertAlmostEqual(0.5, swapped / (50 * 20), delta=0.05)
+
 
 class SwapGenesTestCase(TestCase):
     """ Mutates the by swapping two random genes.
@@ -291,3 +487,218 @@ class RandomGeneValueTestCase(TestCase):
 
         self.assertEquals(alleles, mutation.alleles)
         self.assertIs(alleles, mutation.alleles)
+
+    def test_single_symbol_alleles_leave_the_individual_unchanged(self):
+        alleles = FiniteSetAlleles('A')
+        individual = ListIndividualSpawningPool(10, alleles).create()
+        mutations = SingleGeneRandomValue(alleles), NGeneRandomValue(alleles)
+        for mutation in mutations:
+            self.assertEqual(individual, mutation(individual, p=1))
+
+
+class NGeneRandomValueTestCase(TestCase):
+    """ Mutates the individual by changing the value of random genes. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(NGeneRandomValue(alleles=utils.DummyAlleles()), f)
+
+    def test_all_prone_genes_are_changed_with_probability_one(self):
+        alleles = FiniteSetAlleles((0, 1, 2))
+        individual = ListIndividualSpawningPool(100, alleles).create()
+        for n, changed in ((None, 100), (10, 10), (1000, 100)):
+            mutated = NGeneRandomValue(alleles, n=n)(individual, p=1)
+            self.assertEqual(
+                changed,
+                sum(a != b for a, b in zip(individual, mutated)),
+            )
+
+
+def restore(individual):
+    """ The genes of the individual the given one records its changes from. """
+    genes = list(individual)
+    for i, gene in individual.changed_loci.items():
+        genes[i] = gene
+    return genes
+
+
+class ChangedLociTestCase(TestCase):
+    """ Tests for the changes recorded by the operators of list individuals. """
+
+    def setUp(self):
+        self.alleles = FiniteSetAlleles((0, 1, 2))
+        spawning_pool = ListIndividualSpawningPool(20, self.alleles)
+        self.parents = spawning_pool.create_many(2)
+        for fitness, parent in enumerate(self.parents):
+            parent.fitness_cached = float(fitness)
+
+    def test_children_record_the_genes_changed_from_a_parent(self):
+        for recombination in OnePointRecombination(), TwoPointRecombination():
+            for _ in range(20):
+                for child in recombination(*self.parents):
+                    parent = self.parents[int(child.parent_fitness)]
+                    self.assertEqual(list(parent), restore(child))
+                    self.assertTrue(len(child.changed_loci) <= 10)
+
+    def test_mutations_record_the_genes_changed(self):
+        parent = self.parents[1]
+        for mutation in (
+                SwapGenes(),
+                SingleGeneRandomValue(self.alleles),
+                NGeneRandomValue(self.alleles),
+        ):
+            for p in (0, .5, 1):
+                mutated = mutation(parent, p=p)
+                self.assertEqual(1., mutated.parent_fitness)
+                self.assertEqual(list(parent), restore(mutated))
+
+    def test_changes_accumulate_until_an_individual_is_evaluated(self):
+        child, _ = OnePointRecombination()(*self.parents)
+        mutated = SwapGenes()(child, p=1)
+        self.assertEqual(child.parent_fitness, mutated.parent_fitness)
+        self.assertEqual(
+            list(self.parents[int(child.parent_fitness)]),
+            restore(mutated),
+        )
+
+    def test_unrecorded_changes_are_not_evaluated_incrementally(self):
+        parent = self.parents[1]
+        parent.fitness_method = utils.DeltaOnes()
+        parent.fitness_cached = parent.fitness_method(parent)
+        for modify in (
+                lambda i: i.__setitem__(0, (i[0] + 1) % 3),
+                lambda i: i.__setitem__(slice(1, 3), [(i[1] + 1) % 3] * 2),
+        ):
+            mutated = SingleGeneRandomValue(self.alleles)(parent, p=1)
+            mutated.fitness()
+            modify(mutated)
+            self.assertEqual(utils.ones(mutated), mutated.fitness())
+
+            # Also when the fitness was computed elsewhere (e.g. in batches)
+            mutated = SingleGeneRandomValue(self.alleles)(parent, p=1)
+            mutated.fitness_cached = utils.ones(mutated)
+            modify(mutated)
+            self.assertEqual(utils.ones(mutated), mutated.fitness())
+        self.assertEqual(2, parent.fitness_method.deltas)
+
+    def test_changes_are_not_recorded_without_a_known_fitness(self):
+        parent = ListIndividualSpawningPool(20, self.alleles).create()
+        mutated = SwapGenes()(parent, p=1)
+        self.assertIsNone(mutated.changed_loci)
+        self.assertIsNone(mutated.parent_fitness)
+
+
+def variable_length_parents(alleles=FiniteSetAlleles('ab')):
+    spawning_pool = ListIndividualSpawningPool(1, alleles, max_size=20)
+    return spawning_pool.create_many(2)
+
+
+class VariableLengthTestCase(TestCase):
+    """ Tests for the operators of individuals whose length may change. """
+
+    def test_classes_are_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        for instance in (
+                CutAndSpliceRecombination(),
+                MessyRecombination(),
+                GeneInsertion(utils.DummyAlleles()),
+                GeneDeletion(),
+                VariableLengthHamming(),
+                LengthPenalty(utils.DummyFitness(), abs),
+        ):
+            with TemporaryFile() as f:
+                pickle.dump(instance, f)
+
+    def test_individuals_are_created_with_sizes_in_the_range(self):
+        alleles = FiniteSetAlleles('ab')
+        spawning_pool = ListIndividualSpawningPool(5, alleles, max_size=8)
+        sizes = {len(i) for i in spawning_pool.create_many(200)}
+        self.assertEqual({5, 6, 7, 8}, sizes)
+        self.assertIn(len(spawning_pool.create()), sizes)
+
+    def test_cut_and_splice_swaps_tails_of_any_length(self):
+        recombination = CutAndSpliceRecombination()
+        for n, m in ((5, 12), (12, 5), (1, 1)):
+            parent1, parent2 = list_parents()
+            del parent1[n:], parent2[m:]
+            for _ in range(20):
+                child1, child2 = recombination(parent1, parent2)
+                self.assertIsInstance(child1, ListIndividual)
+                p, q = child1.count('a'), child2.count('b')
+                self.assertEqual('a' * p + 'b' * (m - q), chromosome(child1))
+                self.assertEqual('b' * q + 'a' * (n - p), chromosome(child2))
+
+    def test_messy_recombination_keeps_the_order_of_the_genes(self):
+        for p_cut, p_splice in ((0, 1), (1, 0), (.5, .5)):
+            recombination = MessyRecombination(p_cut=p_cut, p_splice=p_splice)
+            for _ in range(20):
+                parents = variable_length_parents()
+                children = recombination(*parents)
+                self.assertEqual(
+                    ''.join(chromosome(p) for p in parents),
+                    ''.join(chromosome(c) for c in children),
+                )
+                if p_splice == 1:
+                    self.assertEqual(1, len(children))
+
+    def test_genes_are_inserted_and_deleted(self):
+        alleles = FiniteSetAlleles('c')
+        insertion, deletion = GeneInsertion(alleles), GeneDeletion()
+        for parent in variable_length_parents():
+            inserted = insertion(parent, p=1)
+            self.assertEqual(len(parent) + 1, len(inserted))
+            self.assertEqual(
+                chromosome(parent),
+                chromosome(inserted).replace('c', ''),
+            )
+            deleted = deletion(parent, p=1)
+            self.assertEqual(max(1, len(parent) - 1), len(deleted))
+
+    def test_insertions_and_deletions_respect_the_bounds(self):
+        individual = ListIndividual()
+        individual.extend('ab')
+        insertion = GeneInsertion(utils.DummyAlleles(), max_size=2)
+        self.assertEqual(2, len(insertion(individual, p=1)))
+        self.assertEqual(2, len(GeneDeletion(min_size=2)(individual, p=1)))
+
+    def test_diversity_takes_the_lengths_into_account(self):
+        i1, i2, i3 = ListIndividual(), ListIndividual(), ListIndividual()
+        i1.extend('aaaa')
+        i2.extend('aa')
+        i3.extend('abaa')
+        diversity = VariableLengthHamming()
+        self.assertEqual(0.0, diversity([i1, i1.clone()]))
+        self.assertEqual(0.5, diversity([i1, i2]))
+        self.assertAlmostEqual((.5 + .25 + .75) / 3, diversity([i1, i2, i3]))
+
+    def test_length_penalty_is_subtracted(self):
+        fitness = LengthPenalty(utils.DummyFitness(), lambda n: n / 100)
+        individuals = variable_length_parents()
+        for individual, value in zip(
+                individuals,
+                fitness.evaluate_many(individuals),
+        ):
+            self.assertAlmostEqual(.5 - len(individual) / 100, value)
+            self.assertAlmostEqual(value, fitness(individual))
+
+    def test_length_penalty_has_delta_only_if_the_fitness_has(self):
+        class DeltaFitness(utils.DummyFitness):
+            def delta(self, parent_fitness, individual, changed_loci):
+                return parent_fitness
+
+        fitness = LengthPenalty(utils.DummyFitness(), abs)
+        self.assertFalse(hasattr(fitness, 'delta'))
+        fitness = LengthPenalty(DeltaFitness(), lambda n: n / 100)
+        individual = variable_length_parents()[0]
+        value = fitness(individual)
+        self.assertAlmostEqual(value, fitness.delta(value, individual, {}))
+
+    def test_length_penalty_keeps_its_delta_when_pickled(self):
+        fitness = pickle.loads(
+            pickle.dumps(LengthPenalty(utils.DeltaOnes(), abs))
+        )
+        individual = BinaryIndividualSpawningPool(8).create()
+        value = fitness(individual)
+        self.assertAlmostEqual(value, fitness.delta(value, individual, {}))
+        self.assertEqual(1, fitness.fitness.deltas)
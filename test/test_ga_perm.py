@@ -0,0 +1,141 @@
+import pickle
+from tempfile import TemporaryFile
+from unittest import TestCase
+
+from pynetics.ga_perm import PermutationSpawningPool, PermutationIndividual, \
+    PMXRecombination, OrderRecombination, CycleRecombination, \
+    InsertionMutation, InversionMutation, ScrambleMutation, pmx, \
+    order_crossover, cycle_crossover
+
+
+def genes(chromosome):
+    return [int(c) - 1 for c in chromosome]
+
+
+def chromosome(genes):
+    return ''.join(str(gene + 1) for gene in genes)
+
+
+class PermutationSpawningPoolTestCase(TestCase):
+    """ Tests for the spawning pool of random permutations. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(PermutationSpawningPool(10), f)
+
+    def test_created_individuals_are_permutations(self):
+        for _ in range(10):
+            individual = PermutationSpawningPool(50).create()
+            self.assertIsInstance(individual, PermutationIndividual)
+            self.assertEqual(list(range(50)), sorted(individual))
+
+
+class CrossoversTestCase(TestCase):
+    """ Tests for the crossovers of two permutations. """
+
+    def test_pmx(self):
+        self.assertEqual('182456793', chromosome(
+            pmx(genes('123456789'), genes('452187693'), 3, 7)
+        ))
+
+    def test_order_crossover(self):
+        self.assertEqual('218456793', chromosome(
+            order_crossover(genes('123456789'), genes('452187693'), 3, 7)
+        ))
+
+    def test_cycle_crossover(self):
+        self.assertEqual('15243678', chromosome(
+            cycle_crossover(genes('12345678'), genes('85213647'))
+        ))
+
+
+class PermutationRecombinationsTestCase(TestCase):
+    """ Tests for the recombinations of permutation individuals. """
+
+    def test_classes_are_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        for recombination in (
+                PMXRecombination,
+                OrderRecombination,
+                CycleRecombination,
+        ):
+            with TemporaryFile() as f:
+                pickle.dump(recombination(), f)
+
+    def test_children_are_permutations(self):
+        spawning_pool = PermutationSpawningPool(30)
+        for recombination in (
+                PMXRecombination(),
+                OrderRecombination(),
+                CycleRecombination(),
+        ):
+            for _ in range(20):
+                parents = spawning_pool.create(), spawning_pool.create()
+                for child in recombination(*parents):
+                    self.assertIsInstance(child, PermutationIndividual)
+                    self.assertEqual(list(range(30)), sorted(child))
+
+
+class PermutationMutationsTestCase(TestCase):
+    """ Tests for the mutations of permutation individuals. """
+
+    def test_classes_are_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        for mutation in (
+                InsertionMutation,
+                InversionMutation,
+                ScrambleMutation,
+        ):
+            with TemporaryFile() as f:
+                pickle.dump(mutation(), f)
+
+    def test_mutated_individuals_are_permutations(self):
+        individual = PermutationSpawningPool(30).create()
+        for mutation in (
+                InsertionMutation(),
+                InversionMutation(),
+                ScrambleMutation(),
+        ):
+            for _ in range(20):
+                mutated = mutation(individual, p=1)
+                self.assertEqual(list(range(30)), sorted(mutated))
+                self.assertIsNot(individual, mutated)
+
+    def test_insertion_moves_a_single_gene(self):
+        individual = PermutationIndividual()
+        individual.extend(range(30))
+        mutated = InsertionMutation()(individual, p=1)
+        self.assertNotEqual(individual, mutated)
+        # Removing the moved gene leaves the rest of the genes in order
+        self.assertTrue(any(
+            [g for g in mutated if g != gene] ==
+            [g for g in individual if g != gene]
+            for gene in mutated
+        ))
+
+    def test_inversion_reverses_a_segment(self):
+        individual = PermutationIndividual()
+        individual.extend(range(30))
+        individual.fitness_cached = 0.
+        for _ in range(20):
+            mutated = InversionMutation()(individual, p=1)
+            segment = sorted(mutated.changed_loci)
+            a, b = segment[0], segment[-1] + 1
+            self.assertEqual(list(range(a, b)), segment)
+            self.assertEqual(list(range(a, b))[::-1], mutated[a:b])
+            self.assertEqual(individual[:a], mutated[:a])
+            self.assertEqual(individual[b:], mutated[b:])
+
+    def test_nothing_changes_without_probability(self):
+        individual = PermutationSpawningPool(30).create()
+        individual.fitness_cached = 0.
+        for mutation in (
+                InsertionMutation(),
+                InversionMutation(),
+                ScrambleMutation(),
+        ):
+            mutated = mutation(individual, p=0)
+            self.assertEqual(individual, mutated)
+            self.assertEqual({}, mutated.changed_loci)
+            self.assertEqual(0., mutated.parent_fitness)
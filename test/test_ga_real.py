@@ -22,6 +22,13 @@ class RealIntervalAllelesTestCase(TestCase):
         self.assertEquals(RealIntervalAlleles(*bounds).a, min(bounds))
         self.assertEquals(RealIntervalAlleles(*bounds).b, max(bounds))
 
+    def test_many_values_belong_to_the_interval(self):
+        values = RealIntervalAlleles(-2, 3).get_many(1000)
+        self.assertEqual(1000, len(values))
+        self.assertTrue(all(-2 <= value <= 3 for value in values))
+        self.assertLess(min(values), -1.5)
+        self.assertGreater(max(values), 2.5)
+
 
 class MorphologicalRecombinationTestCase(TestCase):
     """ Tests for instances of the class FiniteSetAlleles. """
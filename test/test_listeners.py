@@ -0,0 +1,102 @@
+import pickle
+import threading
+from tempfile import TemporaryFile
+from unittest import TestCase
+
+from pynetics.listeners import Throttled, Background, Snapshot
+from test import utils
+
+
+class ThrottledTestCase(TestCase):
+    """ Tests for the listeners called every some generations or seconds. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(Throttled(print, every=2), f)
+
+    def test_listener_is_called_every_some_generations(self):
+        generations = []
+        utils.genetic_algorithm().on_step_end(
+            lambda ga: generations.append(ga.generation),
+            every=3,
+        ).run()
+        self.assertEqual([3, 6, 9], generations)
+
+    def test_listener_is_called_every_some_seconds(self):
+        generations = []
+        utils.genetic_algorithm().on_step_end(
+            lambda ga: generations.append(ga.generation),
+            every_seconds=3600,
+        ).run()
+        self.assertEqual([1], generations)
+
+
+class BackgroundTestCase(TestCase):
+    """ Tests for the listeners called in a background thread. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(Background(print), f)
+
+    def test_listener_receives_snapshots_in_another_thread(self):
+        snapshots, threads = [], set()
+
+        def listener(snapshot):
+            snapshots.append(snapshot)
+            threads.add(threading.current_thread())
+
+        ga = utils.genetic_algorithm().on_step_end(listener, background=True)
+        ga.run()
+
+        self.assertEqual(list(range(1, 11)), [s.generation for s in snapshots])
+        self.assertTrue(all(isinstance(s, Snapshot) for s in snapshots))
+        self.assertEqual(
+            [b.fitness() for b in ga.best_individuals],
+            [s.best.fitness_cached for s in snapshots],
+        )
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_snapshots_are_dropped_when_the_listener_falls_behind(self):
+        release = threading.Event()
+        listener = Background(lambda s: release.wait(), queue_size=1)
+        ga = utils.genetic_algorithm().on_step_end(listener)
+        ga.on_end(lambda ga: release.set())
+        ga.run()
+        self.assertGreater(listener.dropped, 0)
+
+    def test_listener_errors_are_raised_when_the_algorithm_ends(self):
+        def listener(snapshot):
+            raise RuntimeError('Oops')
+
+        ga = utils.genetic_algorithm().on_step_end(listener, background=True)
+        with self.assertRaises(RuntimeError):
+            ga.run()
+
+    def test_all_listeners_are_closed_when_one_fails(self):
+        snapshots = []
+
+        def listener(snapshot):
+            raise RuntimeError('Oops')
+
+        ga = utils.genetic_algorithm().on_step_end(listener, background=True)
+        ga.on_step_end(snapshots.append, background=True)
+        with self.assertRaisesRegex(RuntimeError, 'Oops'):
+            ga.run()
+        self.assertEqual(10, len(snapshots))
+
+    def test_errors_of_the_run_prevail_over_those_of_listeners(self):
+        def listener(snapshot):
+            raise RuntimeError('Oops')
+
+        def fitness(individual):
+            if ga.generation == 2:
+                raise ValueError('Broken fitness')
+            return utils.ones(individual)
+
+        ga = utils.genetic_algorithm()
+        ga.fitness = fitness
+        ga.on_step_end(listener, background=True)
+        with self.assertRaisesRegex(ValueError, 'Broken fitness'):
+            ga.run()
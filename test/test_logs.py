@@ -0,0 +1,64 @@
+import math
+import os
+import tempfile
+from unittest import TestCase
+
+from pynetics.ga_bin import AverageHamming
+from pynetics.logs import RunLogger, read_log
+from test import utils
+
+
+class RunLoggerTestCase(TestCase):
+    """ Tests for the columnar log of generation statistics. """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.log')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_one_row_is_logged_per_generation(self):
+        fitness = utils.CountingOnes()
+        ga = RunLogger(self.path, buffer_size=3).register(
+            utils.genetic_algorithm(7, fitness=fitness)
+        )
+        ga.run()
+        log = read_log(self.path)
+
+        self.assertEqual(list(range(1, 8)), list(log['generation']))
+        self.assertEqual(
+            [b.fitness() for b in ga.best_individuals],
+            list(log['best']),
+        )
+        self.assertEqual(fitness.calls, log['evaluations'][-1])
+        self.assertTrue(all(math.isnan(d) for d in log['diversity']))
+        for phase in ('selection', 'recombination', 'mutation', 'evaluation'):
+            self.assertEqual(7, len(log['time_' + phase]))
+
+    def test_diversity_is_logged_when_available(self):
+        ga = utils.genetic_algorithm(2, diversity=AverageHamming())
+        RunLogger(self.path).register(ga).run()
+        log = read_log(self.path)
+        self.assertFalse(any(math.isnan(d) for d in log['diversity']))
+
+    def test_rows_are_appended_to_an_existing_log(self):
+        RunLogger(self.path).register(utils.genetic_algorithm(2)).run()
+        RunLogger(self.path).register(utils.genetic_algorithm(3)).run()
+        self.assertEqual(
+            [1, 2, 1, 2, 3],
+            list(read_log(self.path)['generation']),
+        )
+
+    def test_incomplete_blocks_are_ignored(self):
+        ga = utils.genetic_algorithm(3)
+        RunLogger(self.path, buffer_size=2).register(ga).run()
+        with open(self.path, 'rb+') as f:
+            f.truncate(os.path.getsize(self.path) - 1)
+        self.assertEqual([1, 2], list(read_log(self.path)['generation']))
+
+    def test_non_log_files_are_rejected(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'Definitely not a log')
+        with self.assertRaises(ValueError):
+            read_log(self.path)
@@ -0,0 +1,50 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from pynetics.profiling import Profiler
+from test import utils
+
+
+class ProfilerTestCase(TestCase):
+    """ Tests for the profile of the phases of a run. """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'profile.txt')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_each_phase_is_profiled_apart(self):
+        profiler = Profiler(self.path)
+        ga = utils.genetic_algorithm(5)
+        ga.run(profile=profiler)
+
+        self.assertEqual(
+            {'initialization', 'selection', 'recombination', 'mutation',
+             'evaluation', 'replacement', 'best'},
+            set(profiler.profiles),
+        )
+        best = {f[2] for f in profiler.stats('best').stats}
+        self.assertIn('sort', best)
+        selection = {f[2] for f in profiler.stats('selection').stats}
+        mutation = {f[2] for f in profiler.stats('mutation').stats}
+        self.assertIn('perform', selection)
+        self.assertNotIn('perform', mutation)
+        self.assertIsNone(ga.profiler)
+
+    def test_report_is_written(self):
+        utils.genetic_algorithm(5).run(profile=self.path)
+        with open(self.path) as f:
+            report = f.read()
+        self.assertIn('=== Phase: selection ===', report)
+
+    def test_memory_is_traced_at_the_given_generations(self):
+        profiler = Profiler(self.path, memory_generations=(2, 4))
+        ga = utils.genetic_algorithm(5)
+        with profiler.profile(ga):
+            ga.run()
+        self.assertEqual([2, 4], sorted(profiler.snapshots))
+        with open(self.path) as f:
+            self.assertIn('=== Memory: generation 4', f.read())
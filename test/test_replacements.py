@@ -2,7 +2,8 @@ import pickle
 import unittest
 from tempfile import TemporaryFile
 
-from pynetics.replacements import LowElitism
+from pynetics.replacements import HighElitism, LowElitism
+from test import utils
 
 
 class LowElitismTestCase(unittest.TestCase):
@@ -14,6 +15,30 @@ class LowElitismTestCase(unittest.TestCase):
         with TemporaryFile() as f:
             pickle.dump(LowElitism(), f)
 
+    def test_offspring_replaces_the_less_fit_individuals(self):
+        population = utils.DummyPopulation(
+            size=5,
+            individuals=utils.individuals(5),
+        )
+        LowElitism()(population, utils.individuals(2))
+        self.assertEqual([4, 3, 2, 0, 1], [i.fitness() for i in population])
+
+    def test_racing_offspring_only_replaces_individuals_it_beats(self):
+        fitness = utils.DummyCaseBasedFitness(cases=100)
+        population = utils.DummyPopulation(
+            size=4,
+            individuals=utils.valued_individuals([.2, .4, .6, .8], fitness),
+        )
+        offspring = utils.valued_individuals([.1, .5, .3], fitness)
+
+        LowElitism(racing=True)(population, offspring)
+
+        self.assertEqual(
+            [.8, .6, .5, .4],
+            [i.fitness() for i in population],
+        )
+        self.assertIsNone(offspring[0].fitness_cached)
+
 
 class HighElitismTestCase(unittest.TestCase):
     """ Tests for low elitism replacement method. """
@@ -23,3 +48,29 @@ class HighElitismTestCase(unittest.TestCase):
         """ Checks if it's pickeable by writing it into a temporary file. """
         with TemporaryFile() as f:
             pickle.dump(LowElitism(), f)
+
+    def test_the_fittest_among_population_and_offspring_are_kept(self):
+        population = utils.DummyPopulation(
+            size=4,
+            individuals=utils.individuals(4),
+        )
+        offspring = utils.individuals(6)[4:]
+        HighElitism()(population, offspring)
+        self.assertEqual([5, 4, 3, 2], [i.fitness() for i in population])
+
+    def test_racing_keeps_the_same_fittest_individuals(self):
+        fitness = utils.DummyCaseBasedFitness(cases=100)
+        population = utils.DummyPopulation(
+            size=4,
+            individuals=utils.valued_individuals([.2, .4, .6, .8], fitness),
+        )
+        offspring = utils.valued_individuals([.1, .5, .3, .9], fitness)
+
+        HighElitism(racing=True)(population, offspring)
+
+        self.assertEqual(
+            [.9, .8, .6, .5],
+            [i.fitness() for i in population],
+        )
+        self.assertIsNone(offspring[0].fitness_cached)
+        self.assertTrue(offspring[0].raced)
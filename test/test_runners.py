@@ -0,0 +1,42 @@
+from unittest import TestCase
+
+from pynetics.runners import MultiRunner
+from pynetics.stop import FitnessBound
+from test import utils
+
+
+def steps_factory(seed):
+    return utils.genetic_algorithm(5 + seed)
+
+
+def bound_factory(seed):
+    # Only the first run can reach its bound
+    return utils.genetic_algorithm(
+        stop_condition=FitnessBound(0 if seed == 0 else 1000),
+    )
+
+
+class MultiRunnerTestCase(TestCase):
+    """ Tests for the parallel runner of many seeds. """
+
+    def test_every_run_returns_its_result(self):
+        progress = []
+        results = MultiRunner(
+            steps_factory,
+            runs=4,
+            processes=2,
+            on_progress=lambda *args: progress.append(args),
+        ).run()
+
+        self.assertEqual([0, 1, 2, 3], [r.seed for r in results])
+        self.assertEqual([5, 6, 7, 8], [r.generations for r in results])
+        self.assertFalse(any(r.cancelled for r in results))
+        for result in results:
+            self.assertEqual(utils.ones(result.best), result.best.fitness())
+        self.assertEqual(5 + 6 + 7 + 8, len(progress))
+
+    def test_remaining_runs_are_cancelled_once_a_bound_is_met(self):
+        results = MultiRunner(bound_factory, runs=3, processes=2).run()
+
+        self.assertFalse(results[0].cancelled)
+        self.assertTrue(all(r.cancelled for r in results[1:]))
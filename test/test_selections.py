@@ -59,3 +59,15 @@ class TournamentTestCase(TestCase):
 
         with self.assertRaises(PyneticsError):
             Tournament(sample_size=int(p_size / 2))(population, p_size * 2)
+
+    def test_unevaluated_individuals_race_against_the_best(self):
+        fitness = utils.DummyCaseBasedFitness(cases=100)
+        population = utils.valued_individuals(
+            [.1, .2, .3, .9, .4], fitness
+        )
+        population[3].fitness_cached = .9
+
+        selected = Tournament(sample_size=5)(population, 1)
+
+        self.assertEqual([population[3]], selected)
+        self.assertLess(fitness.case_evaluations, 4 * 100)
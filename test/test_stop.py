@@ -1,10 +1,12 @@
 import pickle
+import time
 from unittest import TestCase
 from unittest.mock import Mock
 
 from tempfile import TemporaryFile
 
-from pynetics.stop import StepsNum, FitnessBound
+from pynetics.stop import StepsNum, FitnessBound, Stagnation, TimeBudget, \
+    EvaluationBudget, Any, All
 
 
 class StepsNumTestCase(TestCase):
@@ -57,3 +59,101 @@ class FitnessBoundTestCase(TestCase):
             genetic_algorithm = Mock()
             genetic_algorithm.best = Mock(return_value=individual)
             self.assertTrue(stop_condition(genetic_algorithm))
+
+
+def genetic_algorithm(generation=0, fitness=0.):
+    individual = Mock()
+    individual.fitness = Mock(return_value=fitness)
+    genetic_algorithm = Mock()
+    genetic_algorithm.generation = generation
+    genetic_algorithm.best = Mock(return_value=individual)
+    return genetic_algorithm
+
+
+class StagnationTestCase(TestCase):
+    """ If the best fitness hasn't improved for a number of generations. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(Stagnation(n_generations=10), f)
+
+    def check(self, stop_condition, fitnesses):
+        return [
+            stop_condition(genetic_algorithm(generation, fitness))
+            for generation, fitness in enumerate(fitnesses, start=1)
+        ]
+
+    def test_criteria_is_met_after_generations_without_improvement(self):
+        self.assertEqual(
+            [False, False, False, False, True],
+            self.check(Stagnation(3), [1., 1., 2., 2., 2., 2.])[1:],
+        )
+
+    def test_improvements_lower_than_epsilon_are_ignored(self):
+        self.assertEqual(
+            [False, False, True, False],
+            self.check(Stagnation(2, epsilon=.5), [1., 1.25, 1.5, 2.25]),
+        )
+
+    def test_a_new_run_restarts_the_tracking(self):
+        stop_condition = Stagnation(2)
+        self.assertTrue(self.check(stop_condition, [1., 1., 1.])[-1])
+        self.assertFalse(self.check(stop_condition, [1.])[-1])
+
+
+class TimeBudgetTestCase(TestCase):
+    """ If the genetic algorithm has been running for too long. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(TimeBudget(seconds=10), f)
+
+    def test_criteria_is_met_when_the_time_is_over(self):
+        ga = genetic_algorithm()
+        ga.start_time = time.perf_counter()
+        self.assertFalse(TimeBudget(60)(ga))
+        ga.start_time -= 61
+        self.assertTrue(TimeBudget(60)(ga))
+
+
+class EvaluationBudgetTestCase(TestCase):
+    """ If the genetic algorithm has made enough fitness evaluations. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(EvaluationBudget(max_evals=10), f)
+
+    def test_criteria_is_met_with_same_or_more_evaluations(self):
+        ga = genetic_algorithm()
+        for evaluations, met in ((0, False), (9, False), (10, True)):
+            ga.evaluations = evaluations
+            self.assertEqual(met, EvaluationBudget(10)(ga))
+
+
+class CombinatorsTestCase(TestCase):
+    """ Tests for the combinations of stop conditions. """
+
+    def test_classes_are_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(Any(StepsNum(1), All(StepsNum(2), Stagnation(3))), f)
+
+    def test_any_is_met_when_one_condition_is(self):
+        ga = genetic_algorithm(generation=5)
+        self.assertTrue(Any(StepsNum(10), StepsNum(5))(ga))
+        self.assertFalse(Any(StepsNum(10), StepsNum(6))(ga))
+
+    def test_all_is_met_when_every_condition_is(self):
+        ga = genetic_algorithm(generation=5)
+        self.assertTrue(All(StepsNum(4), StepsNum(5))(ga))
+        self.assertFalse(All(StepsNum(5), StepsNum(6))(ga))
+
+    def test_every_condition_is_checked(self):
+        stagnation = Stagnation(1)
+        condition = Any(StepsNum(1), stagnation)
+        for generation in (1, 2):
+            condition(genetic_algorithm(generation, 1.))
+        self.assertTrue(stagnation(genetic_algorithm(3, 1.)))
@@ -0,0 +1,214 @@
+import functools
+import mmap
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from pynetics.exceptions import InvalidSize
+from pynetics.ga_bin import BinaryIndividual, BinaryIndividualSpawningPool
+from pynetics.ga_int import IntegerIndividualSpawningPool
+from pynetics.ga_list import ListIndividual
+from pynetics.replacements import HighElitism, LowElitism
+from pynetics.storage import MappedPopulation
+from test import utils
+
+
+class UnresizableMap(mmap.mmap):
+    def resize(self, size):
+        raise SystemError('mmap: resizing not available--no mremap()')
+
+
+def binary_population(size=10, genes=20, chunk_size=4):
+    population = MappedPopulation(
+        size=size,
+        spawning_pool=BinaryIndividualSpawningPool(size=genes),
+        chunk_size=chunk_size,
+    )
+    for individual in population:
+        individual.fitness_method = utils.ones
+    return population
+
+
+class MappedPopulationTestCase(TestCase):
+    """ Tests for the populations stored in memory-mapped files. """
+
+    def test_individuals_are_stored_in_rows(self):
+        individuals = []
+        for i in range(3):
+            individual = BinaryIndividual()
+            individual.extend([i % 2] * 5)
+            individuals.append(individual)
+        population = MappedPopulation(
+            size=5,
+            spawning_pool=BinaryIndividualSpawningPool(size=5),
+            individuals=individuals,
+        )
+        with population:
+            self.assertEqual(5, len(population))
+            for i in range(3):
+                self.assertEqual([i % 2] * 5, list(population[i]))
+
+    def test_views_write_through_and_clones_do_not(self):
+        with binary_population() as population:
+            self.assertEqual('B', population.typecode)
+            view = population[3]
+            view[0] = 1
+            self.assertEqual(1, population[3][0])
+            clone = view.clone()
+            self.assertIsInstance(clone, BinaryIndividual)
+            self.assertEqual(list(view), list(clone))
+            clone[0] = 0
+            self.assertEqual(1, population[3][0])
+
+    def test_individuals_of_other_size_are_rejected(self):
+        with binary_population() as population:
+            individual = BinaryIndividual()
+            individual.extend([1] * 3)
+            with self.assertRaises(InvalidSize):
+                population.append(individual)
+
+    def test_non_numeric_individuals_are_rejected(self):
+        individual = ListIndividual()
+        individual.extend('abc')
+        with self.assertRaises(TypeError):
+            MappedPopulation(
+                size=2,
+                spawning_pool=BinaryIndividualSpawningPool(size=3),
+                individuals=[individual],
+            )
+
+    def test_integer_individuals_are_materialized_as_lists(self):
+        population = MappedPopulation(
+            size=4,
+            spawning_pool=IntegerIndividualSpawningPool(6, -5, 5),
+        )
+        with population:
+            self.assertEqual('q', population.typecode)
+            clone = population[0].clone()
+            self.assertIsInstance(clone, ListIndividual)
+            self.assertEqual(list(population[0]), list(clone))
+
+    def test_evaluation_is_done_in_chunks(self):
+        fitness = utils.CountingOnes()
+        with binary_population(size=10, chunk_size=4) as population:
+            self.assertEqual(10, population.evaluate(fitness))
+            self.assertEqual([4, 4, 2], fitness.chunks)
+            self.assertEqual(0, population.evaluate(fitness))
+            for individual in population:
+                self.assertEqual(utils.ones(individual), individual.fitness())
+
+    def test_sort_moves_the_rows(self):
+        with binary_population(size=50) as population:
+            genes = sorted(
+                (list(individual) for individual in population),
+                key=sum,
+                reverse=True,
+            )
+            population.sort()
+            self.assertEqual(
+                [sum(g) for g in genes],
+                [sum(individual) for individual in population],
+            )
+            self.assertEqual(
+                sorted(map(tuple, genes)),
+                sorted(tuple(individual) for individual in population),
+            )
+            best = population.best()
+            self.assertEqual(utils.ones(best), best.fitness())
+            self.assertEqual(list(population[0]), list(best))
+
+    def test_population_grows_and_shrinks(self):
+        with binary_population(size=3) as population:
+            rows = [list(individual) for individual in population]
+            clones = [individual.clone() for individual in population]
+            population.extend(clones)
+            population.insert(1, clones[2])
+            self.assertEqual(
+                [rows[0], rows[2], rows[1], rows[2]] + rows,
+                [list(individual) for individual in population],
+            )
+            del population[1:5]
+            del population[-1]
+            self.assertEqual(rows[:2], [list(i) for i in population])
+
+    def test_file_grows_when_maps_cannot_be_resized(self):
+        with patch('mmap.mmap', UnresizableMap):
+            population = binary_population(size=3)
+        with population:
+            rows = [list(individual) for individual in population]
+            population.extend(population[i].clone() for i in range(3))
+            population.append(population[0].clone())
+            self.assertEqual(
+                rows + rows + rows[:1],
+                [list(individual) for individual in population],
+            )
+
+    def test_genetic_algorithm_evolves_a_mapped_population(self):
+        fitness = utils.CountingOnes()
+        ga = utils.genetic_algorithm(
+            5,
+            fitness=fitness,
+            replacement_rate=0.4,
+            population_factory=functools.partial(
+                MappedPopulation,
+                chunk_size=4,
+            ),
+        )
+        ga.run()
+        self.assertIsInstance(ga.population, MappedPopulation)
+        # The initial population is evaluated in chunks and then each offspring
+        self.assertEqual([4, 4, 2] + [4] * 5, fitness.chunks)
+        self.assertEqual(10, len(ga.population))
+        self.assertEqual(5, len(ga.best_individuals))
+        self.assertEqual(
+            sorted(b.fitness() for b in ga.best_individuals),
+            [b.fitness() for b in ga.best_individuals],
+        )
+        self.assertEqual(10 + 5 * 4, ga.evaluations)
+        self.assertEqual(fitness.calls, ga.evaluations)
+        for individual in ga.population:
+            self.assertEqual(utils.ones(individual), individual.fitness())
+        ga.population.close()
+
+    def test_replacements_keep_the_size(self):
+        for replacement in (LowElitism(), HighElitism()):
+            with binary_population(size=10) as population:
+                offspring = [population[i].clone() for i in range(4)]
+                for individual in offspring:
+                    for j in range(len(individual)):
+                        individual[j] = 1
+                replacement(population, offspring)
+                self.assertEqual(10, len(population))
+
+    def test_offspring_replaces_the_worst_individuals(self):
+        with binary_population(size=10) as population:
+            offspring = [population[i].clone() for i in range(4)]
+            for individual in offspring:
+                for j in range(len(individual)):
+                    individual[j] = 1
+            LowElitism()(population, offspring)
+            population.sort()
+            self.assertEqual(
+                [20.] * 4,
+                [individual.fitness() for individual in population[:4]],
+            )
+            self.assertEqual(20., population.best().fitness())
+
+    def test_population_can_be_stored_in_a_given_file(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            population = MappedPopulation(
+                size=8,
+                spawning_pool=BinaryIndividualSpawningPool(size=16),
+                path=path,
+            )
+            with population:
+                rows = b''.join(
+                    bytes(individual.genes) for individual in population
+                )
+            with open(path, 'rb') as f:
+                self.assertEqual(rows, f.read()[:len(rows)])
+        finally:
+            os.remove(path)
@@ -0,0 +1,80 @@
+import math
+import pickle
+from tempfile import TemporaryFile
+from unittest import TestCase
+
+from pynetics.surrogates import NearestNeighbours, rank_correlation
+from test import utils
+
+
+def evaluated(*genes_and_fitness):
+    individuals = []
+    for genes, fitness in genes_and_fitness:
+        individual = utils.DummyIndividual()
+        individual.genes = genes
+        individual.fitness_cached = fitness
+        individuals.append(individual)
+    return individuals
+
+
+def genes(individual):
+    return individual.genes
+
+
+class NearestNeighboursTestCase(TestCase):
+    """ Tests for the surrogate based on the nearest evaluated individuals. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(NearestNeighbours(), f)
+
+    def test_prediction_without_data_is_nan(self):
+        individual, = evaluated(((0, 0), None))
+        surrogate = NearestNeighbours(features=genes)
+        self.assertTrue(math.isnan(surrogate.predict(individual)))
+
+    def test_known_individuals_are_predicted_exactly(self):
+        surrogate = NearestNeighbours(k=2, features=genes)
+        surrogate.update(evaluated(((0, 0), 1.), ((3, 4), 2.)))
+        individual, = evaluated(((3, 4), None))
+        self.assertEqual(2., surrogate.predict(individual))
+
+    def test_prediction_is_weighted_by_the_inverse_distance(self):
+        surrogate = NearestNeighbours(k=2, features=genes)
+        surrogate.update(evaluated(((0,), 1.), ((3,), 4.), ((10,), 100.)))
+        individual, = evaluated(((1,), None))
+        self.assertAlmostEqual(
+            (1. + 4. / 2) / 1.5,
+            surrogate.predict(individual),
+        )
+
+    def test_unevaluated_individuals_are_not_learnt(self):
+        surrogate = NearestNeighbours(features=genes)
+        surrogate.update(evaluated(((0,), None), ((1,), 1.)))
+        self.assertEqual(1, len(surrogate.archive))
+
+    def test_oldest_individuals_are_forgotten(self):
+        surrogate = NearestNeighbours(k=1, archive_size=2, features=genes)
+        surrogate.update(evaluated(((0,), 1.), ((5,), 2.), ((9,), 3.)))
+        individual, = evaluated(((0,), None))
+        self.assertEqual(2., surrogate.predict(individual))
+
+
+class RankCorrelationTestCase(TestCase):
+    """ Tests for the Spearman's rank correlation coefficient. """
+
+    def test_monotonic_sequences_are_perfectly_correlated(self):
+        self.assertAlmostEqual(1., rank_correlation([1, 2, 3], [1, 8, 27]))
+        self.assertAlmostEqual(-1., rank_correlation([1, 2, 3], [9, 4, 1]))
+
+    def test_ties_get_the_mean_rank(self):
+        # Ranks are [1, 2.5, 2.5, 4] and [1, 3, 4, 2]
+        self.assertAlmostEqual(
+            1.5 / math.sqrt(4.5 * 5),
+            rank_correlation([1, 2, 2, 3], [1, 3, 4, 2]),
+        )
+
+    def test_undefined_correlations_are_nan(self):
+        self.assertTrue(math.isnan(rank_correlation([1], [2])))
+        self.assertTrue(math.isnan(rank_correlation([1, 1, 1], [1, 2, 3])))
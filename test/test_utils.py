@@ -0,0 +1,159 @@
+import importlib.util
+import pickle
+import random
+from tempfile import TemporaryFile
+from unittest import TestCase, skipUnless
+
+from pynetics.ga_list import FiniteSetAlleles, ListIndividualSpawningPool
+from pynetics.utils import RandomGenerator, bind_rng, take_chances, \
+    sparse_positions, zobrist_key, fingerprint
+
+
+class RandomGeneratorTestCase(TestCase):
+    """ Tests for the random generators owned by the algorithms. """
+
+    def test_class_is_pickeable(self):
+        """ Checks if it's pickeable by writing it into a temporary file. """
+        with TemporaryFile() as f:
+            pickle.dump(RandomGenerator(1), f)
+
+    def test_same_seed_generates_same_values(self):
+        rng1, rng2 = RandomGenerator(7), RandomGenerator(7)
+        self.assertEqual(
+            [rng1.random() for _ in range(10)],
+            [rng2.random() for _ in range(10)],
+        )
+
+    def test_spawned_generators_are_reproducible_and_independent(self):
+        children1 = RandomGenerator(7).spawn(3)
+        children2 = RandomGenerator(7).spawn(3)
+        values1 = [c.getrandbits(64) for c in children1]
+        values2 = [c.getrandbits(64) for c in children2]
+        self.assertEqual(values1, values2)
+        self.assertEqual(3, len(set(values1)))
+
+    def test_take_chances_uses_the_given_generator(self):
+        rng1, rng2 = RandomGenerator(3), RandomGenerator(3)
+        self.assertEqual(
+            [take_chances(.5, rng1) for _ in range(20)],
+            [take_chances(.5, rng2) for _ in range(20)],
+        )
+
+    def test_state_is_restored(self):
+        rng = RandomGenerator(42)
+        state = rng.getstate()
+        numbers = [rng.random() for _ in range(3)]
+        rng.setstate(state)
+        self.assertEqual(numbers, [rng.random() for _ in range(3)])
+
+    @skipUnless(importlib.util.find_spec('numpy'), 'NumPy is not installed')
+    def test_state_of_the_numpy_generator_is_restored(self):
+        rng = RandomGenerator(42)
+        rng.numpy.random()
+        state = rng.getstate()
+        numbers = list(rng.numpy.random(3))
+        rng.setstate(state)
+        self.assertEqual(numbers, list(rng.numpy.random(3)))
+
+
+class BindRngTestCase(TestCase):
+    """ Tests for the binding of random generators to operators. """
+
+    def test_operator_and_nested_operators_are_bound(self):
+        alleles = FiniteSetAlleles((0, 1))
+        spawning_pool = ListIndividualSpawningPool(10, alleles)
+        rng = RandomGenerator()
+        bind_rng(spawning_pool, rng)
+        self.assertIs(rng, spawning_pool.rng)
+        self.assertIs(rng, alleles.rng)
+
+    def test_operators_in_containers_are_bound_every_time(self):
+        class Composite:
+            rng = random
+
+            def __init__(self, *operators):
+                self.operators = list(operators)
+                self.weights = {}
+
+        alleles = [FiniteSetAlleles((0, 1)) for _ in range(3)]
+        composite = Composite(alleles[0])
+        rng = RandomGenerator()
+        bind_rng(composite, rng)
+        composite.operators.append(alleles[1])
+        composite.weights['other'] = (alleles[2],)
+        bind_rng(composite, rng)
+        for operator in alleles:
+            self.assertIs(rng, operator.rng)
+
+    def test_cycles_of_operators_are_bound_once(self):
+        alleles = FiniteSetAlleles((0, 1))
+        spawning_pool = ListIndividualSpawningPool(10, alleles)
+        alleles.spawning_pool = spawning_pool
+        rng = RandomGenerator()
+        bind_rng(spawning_pool, rng)
+        self.assertIs(rng, spawning_pool.rng)
+        self.assertIs(rng, alleles.rng)
+
+    def test_objects_without_rng_are_left_untouched(self):
+        def f():
+            pass
+
+        bind_rng(f, RandomGenerator())
+        self.assertFalse(hasattr(f, 'rng'))
+
+
+class SparsePositionsTestCase(TestCase):
+    """ Tests for the sampling of positions with a probability each. """
+
+    def test_extreme_probabilities(self):
+        self.assertEqual([], sparse_positions(100, 0))
+        self.assertEqual(list(range(100)), sparse_positions(100, 1))
+
+    def test_positions_are_increasing_and_in_range(self):
+        positions = sparse_positions(1000, .3)
+        self.assertEqual(sorted(set(positions)), positions)
+        self.assertTrue(all(0 <= i < 1000 for i in positions))
+
+    def test_each_position_is_selected_with_the_probability(self):
+        rng = random.Random(1)
+        counts = [0] * 20
+        for _ in range(10000):
+            for i in sparse_positions(20, .25, rng):
+                counts[i] += 1
+        for count in counts:
+            self.assertAlmostEqual(.25, count / 10000, delta=.02)
+
+    def test_random_numbers_drawn_are_proportional_to_the_positions(self):
+        class CountingRandom(random.Random):
+            draws = 0
+
+            def random(self):
+                self.draws += 1
+                return super().random()
+
+        rng = CountingRandom(1)
+        positions = sparse_positions(10 ** 6, 10 ** -5, rng)
+        self.assertEqual(len(positions) + 1, rng.draws)
+
+
+class FingerprintTestCase(TestCase):
+    """ Tests for the Zobrist fingerprints of genomes. """
+
+    def test_keys_depend_on_locus_and_gene(self):
+        keys = {zobrist_key(i, g) for i in range(100) for g in (0, 1, 'a')}
+        self.assertEqual(300, len(keys))
+        self.assertTrue(all(0 <= key < 2 ** 64 for key in keys))
+        self.assertEqual(zobrist_key(3, 1), zobrist_key(3, 1.))
+
+    def test_fingerprint_is_updated_by_xoring_keys(self):
+        genes = [random.randint(0, 9) for _ in range(50)]
+        value = fingerprint(genes)
+        for _ in range(100):
+            i, gene = random.randrange(50), random.randint(0, 9)
+            value ^= zobrist_key(i, genes[i]) ^ zobrist_key(i, gene)
+            genes[i] = gene
+            self.assertEqual(fingerprint(genes), value)
+
+    def test_fingerprint_depends_on_the_order_of_genes(self):
+        self.assertNotEqual(fingerprint('ab'), fingerprint('ba'))
+        self.assertEqual(0, fingerprint(''))
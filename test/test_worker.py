@@ -0,0 +1,159 @@
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+from unittest import TestCase
+
+from pynetics import worker
+from pynetics.algorithms import SimpleGA
+from pynetics.ga_list import ListIndividual, FiniteSetAlleles, \
+    ListIndividualSpawningPool, OnePointRecombination
+from pynetics.replacements import LowElitism
+from pynetics.selections import Tournament
+from pynetics.stop import StepsNum
+
+worker.register('test:sum', sum)
+
+
+def individuals(n, size=10):
+    result = []
+    for i in range(n):
+        individual = ListIndividual()
+        individual.extend(i * j for j in range(size))
+        result.append(individual)
+    return result
+
+
+def start_worker(coordinator):
+    thread = threading.Thread(
+        target=worker.Worker(coordinator.address, coordinator.authkey).run,
+        daemon=True,
+    )
+    thread.start()
+    return thread
+
+
+def wait_for_workers(coordinator, n):
+    deadline = time.time() + 5
+    while coordinator.workers != n and time.time() < deadline:
+        time.sleep(0.01)
+
+
+class CoordinatorTestCase(TestCase):
+    """ Tests for the remote evaluation of individuals. """
+
+    def test_individuals_are_evaluated_by_the_workers(self):
+        population = individuals(50)
+        with worker.Coordinator('test:sum', batch_size=4, timeout=10) as c:
+            [start_worker(c) for _ in range(3)]
+            self.assertEqual(
+                [sum(i) for i in population],
+                c.evaluate_many(population),
+            )
+
+    def test_batch_of_a_disconnected_worker_is_evaluated_by_other(self):
+        population = individuals(10)
+        results = []
+        with worker.Coordinator('test:sum', batch_size=4, timeout=10) as c:
+            flaky = Client(c.address, authkey=c.authkey)
+            wait_for_workers(c, 1)
+            evaluation = threading.Thread(
+                target=lambda: results.extend(c.evaluate_many(population)),
+            )
+            evaluation.start()
+
+            # Answer only the first individual of the batch and disconnect
+            _, name, batch = flaky.recv()
+            index, individual = batch[0]
+            flaky.send((worker.FITNESS, index, sum(individual)))
+            flaky.close()
+
+            start_worker(c)
+            evaluation.join(timeout=10)
+        self.assertEqual([sum(i) for i in population], results)
+
+    def test_evaluation_times_out_without_workers(self):
+        with worker.Coordinator('test:sum', timeout=0.1) as c:
+            with self.assertRaises(worker.EvaluationError):
+                c.evaluate_many(individuals(2))
+
+    def test_evaluation_fails_while_there_are_no_workers(self):
+        with worker.Coordinator('test:sum', worker_timeout=0.1) as c:
+            with self.assertRaises(worker.EvaluationError):
+                c.evaluate_many(individuals(2))
+
+    def test_workers_with_other_key_are_rejected(self):
+        with worker.Coordinator('test:sum', authkey=b'secret') as c:
+            with self.assertRaises(AuthenticationError):
+                worker.Worker(c.address, b'guess').run()
+            self.assertEqual(0, c.workers)
+
+    def test_failed_connections_do_not_stop_the_coordinator(self):
+        population = individuals(10)
+        with worker.Coordinator('test:sum', timeout=10) as c:
+            # A probe which closes the connection before authenticating
+            socket.create_connection(c.address).close()
+            # A client which connects but never authenticates
+            with socket.create_connection(c.address):
+                start_worker(c)
+                wait_for_workers(c, 1)
+                self.assertEqual(1, c.workers)
+                self.assertEqual(
+                    [sum(i) for i in population],
+                    c.evaluate_many(population),
+                )
+
+    def test_workers_need_a_key(self):
+        with self.assertRaises(ValueError):
+            worker.Worker(('localhost', 1))
+
+    def test_worker_command_finds_the_registered_functions(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'fitmod.py'), 'w') as f:
+                f.write('from pynetics import worker\n')
+                f.write('worker.register("myfit", sum)\n')
+            with worker.Coordinator('myfit', timeout=30) as c:
+                process = subprocess.Popen(
+                    [
+                        sys.executable, '-m', 'pynetics.worker',
+                        '{}:{}'.format(*c.address), '--import', 'fitmod',
+                    ],
+                    env=dict(
+                        os.environ,
+                        PYTHONPATH=os.pathsep.join((directory, os.getcwd())),
+                        PYNETICS_AUTHKEY=c.authkey.decode(),
+                    ),
+                )
+                try:
+                    population = individuals(5)
+                    self.assertEqual(
+                        [sum(i) for i in population],
+                        c.evaluate_many(population),
+                    )
+                finally:
+                    c.close()
+                    process.wait(timeout=30)
+
+    def test_genetic_algorithm_uses_the_workers(self):
+        with worker.Coordinator('test:sum', timeout=10) as c:
+            [start_worker(c) for _ in range(2)]
+            ga = SimpleGA(
+                stop_condition=StepsNum(3),
+                population_size=10,
+                spawning_pool=ListIndividualSpawningPool(
+                    size=10,
+                    alleles=FiniteSetAlleles((0, 1)),
+                ),
+                fitness=c,
+                selection=Tournament(2),
+                recombination=OnePointRecombination(),
+                replacement=LowElitism(),
+            )
+            ga.run()
+        self.assertEqual(3, ga.generation)
+        self.assertEqual(sum(ga.best()), ga.best().fitness())
@@ -1,8 +1,13 @@
 from random import choice
 
 from pynetics import StopCondition, Individual, SpawningPool, Fitness, Mutation, \
-    Recombination, Replacement, Selection, Population
-from pynetics.ga_list import Alleles
+    Recombination, Replacement, Selection, Population, CaseBasedFitness
+from pynetics.algorithms import SimpleGA
+from pynetics.ga_bin import BinaryIndividualSpawningPool, AllGenesCanSwitch
+from pynetics.ga_list import Alleles, OnePointRecombination
+from pynetics.replacements import LowElitism
+from pynetics.selections import Tournament
+from pynetics.stop import StepsNum
 
 
 class DummyStopCondition(StopCondition):
@@ -30,6 +35,16 @@ class DummyFitness(Fitness):
         return 0.5
 
 
+class DummyCaseBasedFitness(CaseBasedFitness):
+    """ Scores 1 in a fraction of the cases given by the individual's value. """
+
+    def __init__(self, cases=100, confidence=None):
+        super().__init__(range(cases), confidence=confidence)
+
+    def score(self, individual, case):
+        return 1. if case < individual.value * len(self.cases) else 0.
+
+
 class DummyMutation(Mutation):
     def __call__(self, individual, p):
         return individual.clone()
@@ -77,3 +92,79 @@ def individuals(n, fitness_method=DummyFitness()):
         individual.fitness_method = fitness_method
         result.append(individual)
     return result
+
+
+def valued_individuals(values, fitness_method):
+    result = []
+    for value in values:
+        individual = DummyIndividual()
+        individual.value = value
+        individual.fitness_method = fitness_method
+        result.append(individual)
+    return result
+
+
+def ones(individual):
+    return float(sum(individual))
+
+
+class CountingOnes(Fitness):
+    """ Counts the ones of the individuals and how many were evaluated.
+
+    It also records the size of each chunk of individuals evaluated at once.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.chunks = []
+
+    def __call__(self, individual):
+        self.calls += 1
+        return ones(individual)
+
+    def evaluate_many(self, individuals):
+        self.chunks.append(len(individuals))
+        return super().evaluate_many(individuals)
+
+
+class DeltaOnes(Fitness):
+    """ Counts the ones of the individuals, incrementally when possible. """
+
+    def __init__(self, max_changes=None):
+        self.max_changes = max_changes
+        self.calls = 0
+        self.deltas = 0
+
+    def __call__(self, individual):
+        self.calls += 1
+        return ones(individual)
+
+    def delta(self, parent_fitness, individual, changed_loci):
+        if self.max_changes is not None and \
+                len(changed_loci) > self.max_changes:
+            return None
+        self.deltas += 1
+        return parent_fitness + sum(
+            individual[i] - gene for i, gene in changed_loci.items()
+        )
+
+
+def genetic_algorithm(steps=10, **kwargs):
+    """ A SimpleGA maximizing the ones of binary individuals.
+
+    :param steps: The number of generations the algorithm will run.
+    :param kwargs: Arguments of SimpleGA that replace the default ones.
+    """
+    arguments = dict(
+        stop_condition=StepsNum(steps),
+        population_size=10,
+        spawning_pool=BinaryIndividualSpawningPool(size=20),
+        fitness=ones,
+        selection=Tournament(2),
+        recombination=OnePointRecombination(),
+        mutation=AllGenesCanSwitch(),
+        replacement=LowElitism(),
+        p_mutation=0.05,
+    )
+    arguments.update(kwargs)
+    return SimpleGA(**arguments)